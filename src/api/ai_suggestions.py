@@ -3,12 +3,12 @@ AI Suggestions API endpoints
 """
 
 from typing import List, Dict, Any
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Response
 
 from loguru import logger
 
 from src.models.ai_suggestions import (
-    AISuggestionRequest, AISuggestionResponse, AISuggestion
+    AISuggestionRequest, AISuggestionResponse, AISuggestion, DEMO_SUGGESTIONS_JSON
 )
 from src.services.ai_suggestions_service import ai_suggestions_service
 
@@ -73,21 +73,12 @@ async def get_suggestion_history():
 async def get_demo_suggestions(suggestion_type: str):
     """Get demo suggestions for testing"""
     try:
-        from src.models.ai_suggestions import DEMO_SUGGESTIONS, SuggestionType
-        
-        # Validate suggestion type
-        try:
-            suggestion_enum = SuggestionType(suggestion_type)
-        except ValueError:
+        # Validate suggestion type; the demo payloads are keyed by every SuggestionType value
+        content = DEMO_SUGGESTIONS_JSON.get(suggestion_type)
+        if content is None:
             raise HTTPException(status_code=400, detail=f"Invalid suggestion type: {suggestion_type}")
         
-        suggestions = DEMO_SUGGESTIONS.get(suggestion_type, [])
-        
-        return {
-            "suggestion_type": suggestion_type,
-            "suggestions": [s.model_dump() for s in suggestions],
-            "total": len(suggestions)
-        }
+        return Response(content=content, media_type="application/json")
         
     except Exception as e:
         logger.error(f"Error getting demo suggestions: {e}")
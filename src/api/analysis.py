@@ -6,12 +6,16 @@ from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+import asyncio
+import random
 import time
+import zlib
 
 from src.models.analysis import (
     QueryRequest, QueryResult, SampleQueryRequest, SampleQueriesResponse,
     CatalogBrowserResponse, CatalogInfo, SchemaInfo, TableInfo, ColumnInfo, QueryType
 )
+from src.api.common import OrjsonResponse
 from src.services.trino_service import trino_service
 from src.services.catalog_service import catalog_service
 from src.services.activity_log_service import activity_log_service
@@ -22,7 +26,7 @@ from src.services.unified_llm_service import unified_llm_service
 from src.services.nl2sql_service import nl2sql_service
 from src.services.intelligent_nl2sql_service import intelligent_nl2sql_service
 from src.services.visualization_service import visualization_service
-from src.config.llm_config import llm_config, LLMProvider, LLMModelConfig
+from src.config.llm_config import llm_config, LLMProvider
 from src.services.query_execution_service import query_execution_service
 from src.services.schema_context_service import schema_context_service
 
@@ -32,6 +36,45 @@ logger = get_service_logger("analysis_api")
 
 router = APIRouter(prefix="/analysis", tags=["SQL Analysis"])
 
+# Hot-path service methods bound once at import
+_get_schema_ctx = schema_context_service.get_comprehensive_schema_context
+_convert_nl2sql = intelligent_nl2sql_service.convert_natural_language_to_sql
+
+# Chart-type heuristics only need a bounded sample of the result rows
+VISUALIZATION_SAMPLE_SIZE = 200
+
+def _sample_rows(rows: List[List[Any]], seed_text: str, k: int = VISUALIZATION_SAMPLE_SIZE) -> List[List[Any]]:
+    """Pick a representative, order-preserving sample of at most k rows.
+    
+    Seeded from the query text so the same query gets the same sample.
+    """
+    if len(rows) <= k:
+        return rows
+    rng = random.Random(zlib.crc32(seed_text.encode("utf-8")))
+    return [rows[i] for i in sorted(rng.sample(range(len(rows)), k))]
+
+
+# Short-lived Trino liveness cache so chat queries skip schema introspection
+# while Trino is down instead of paying for it on every request
+TRINO_LIVENESS_TTL_SECONDS = 5.0
+_trino_liveness_cache = {"expires": 0.0, "ok": True}
+
+
+async def _is_trino_live() -> bool:
+    """Return cached Trino liveness, re-checking at most every few seconds"""
+    now = time.time()
+    if now < _trino_liveness_cache["expires"]:
+        return _trino_liveness_cache["ok"]
+    
+    try:
+        ok = await trino_service.is_available()
+    except Exception:
+        ok = False
+    
+    _trino_liveness_cache["ok"] = ok
+    _trino_liveness_cache["expires"] = now + TRINO_LIVENESS_TTL_SECONDS
+    return ok
+
 # Updated Pydantic models for visualization and NL2SQL
 class VisualizationRequest(BaseModel):
     data: List[Dict[str, Any]]
@@ -729,7 +772,7 @@ async def convert_natural_language_to_sql(request: NaturalLanguageQueryRequest):
         logger.info(f"Processing intelligent natural language query: {request.query}")
         
         # Use intelligent NL2SQL service for advanced processing with auto-correction
-        result = await intelligent_nl2sql_service.convert_natural_language_to_sql(
+        result = await _convert_nl2sql(
             natural_query=request.query,
             model_key=request.model_key or "gpt-3.5-turbo",
             max_tables=30
@@ -878,6 +921,23 @@ async def convert_natural_language_to_sql(request: NaturalLanguageQueryRequest):
             )
 
 
+def _log_chat_activity(log_payload: Dict[str, Any]):
+    """Log chat query activity in background"""
+    try:
+        log_request = ActivityLogRequest(
+            activity_type=ActivityType.CHAT_QUERY,
+            resource_type="natural_language_query",
+            description=f"Executed chat query: {log_payload['natural_query']}",
+            details=log_payload
+        )
+        activity_log_service.log_activity(log_request, user_id="anonymous")
+    except Exception as e:
+        activity_log_service.log_error(
+            ActivityType.CHAT_QUERY,
+            f"Error logging chat activity: {str(e)}"
+        )
+
+
 @router.post("/chat-query")
 async def execute_chat_query(request: NaturalLanguageQueryRequest, background_tasks: BackgroundTasks):
     """Execute a natural language query end-to-end (convert to SQL and execute) with full schema context"""
@@ -885,8 +945,23 @@ async def execute_chat_query(request: NaturalLanguageQueryRequest, background_ta
         # Step 1: Get comprehensive schema context
         catalog_context = None
         
+        # Memoize get_catalogs() for this request so the error fallback
+        # awaits the same future instead of issuing a second RPC
+        catalogs_task: Optional[asyncio.Future] = None
+        
+        async def catalogs():
+            nonlocal catalogs_task
+            if catalogs_task is None:
+                catalogs_task = asyncio.ensure_future(trino_service.get_catalogs())
+            return await catalogs_task
+        
+        trino_live = await _is_trino_live()
+        
         try:
-            if request.catalog and request.schema:
+            if not trino_live:
+                # Trino is down: skip schema introspection and let the LLM work without context
+                catalog_context = None
+            elif request.catalog and request.schema:
                 # Get specific catalog/schema context (existing logic)
                 tables = await trino_service.get_tables(request.catalog, request.schema)
                 table_details = []
@@ -917,21 +992,26 @@ async def execute_chat_query(request: NaturalLanguageQueryRequest, background_ta
                     catalog_context = schema_context
                 else:
                     # Fallback to basic catalog listing if full context fails
-                    catalogs = await trino_service.get_catalogs()
+                    available_catalogs = await catalogs()
                     catalog_context = {
-                        "available_catalogs": [{"name": cat.name, "description": cat.comment} for cat in catalogs]
+                        "available_catalogs": [{"name": cat.name, "description": cat.comment} for cat in available_catalogs]
                     }
                     
         except Exception as catalog_error:
             # If schema context retrieval fails, continue with minimal context
             try:
-                catalogs = await trino_service.get_catalogs()
+                available_catalogs = await catalogs()
                 catalog_context = {
-                    "available_catalogs": [{"name": cat.name, "description": cat.comment} for cat in catalogs]
+                    "available_catalogs": [{"name": cat.name, "description": cat.comment} for cat in available_catalogs]
                 }
             except:
                 catalog_context = None
         
+        # Summarize the schema context once for notes, logging and the response
+        ctx_type = "full" if catalog_context and "catalogs" in catalog_context else ("basic" if catalog_context else "none")
+        ctx_catalogs = len(catalog_context.get("catalogs", [])) if ctx_type == "full" else 0
+        ctx_tables = catalog_context.get("total_tables", 0) if catalog_context else 0
+        
         # Step 2: Convert natural language to SQL with enhanced context
         nl_response = await nl2sql_service.convert_natural_language_to_sql(
             natural_query=request.query,
@@ -954,11 +1034,14 @@ async def execute_chat_query(request: NaturalLanguageQueryRequest, background_ta
         
         # Step 4: Generate visualization recommendation if there's data
         visualization_recommendation = None
-        if query_result and query_result.data and len(query_result.data) > 0:
+        row_count = len(query_result.data) if query_result and query_result.data else 0
+        if row_count > 0:
             try:
+                columns = query_result.columns
+                data_sample = [dict(zip(columns, row)) for row in _sample_rows(query_result.data, request.query)]
                 visualization_recommendation = await visualization_service.recommend_visualization(
-                    data_sample=query_result.data,
-                    data_summary={"row_count": len(query_result.data)},
+                    data_sample=data_sample,
+                    data_summary={"row_count": row_count},
                     user_intent=request.query,
                     model_key=request.model_key
                 )
@@ -966,35 +1049,22 @@ async def execute_chat_query(request: NaturalLanguageQueryRequest, background_ta
                 # If visualization fails, continue without it
                 visualization_recommendation = None
         
-        def log_chat_activity():
-            """Log chat query activity in background"""
-            try:
-                log_request = ActivityLogRequest(
-                    activity_type=ActivityType.CHAT_QUERY,
-                    resource_type="natural_language_query",
-                    description=f"Executed chat query: {request.query}",
-                    details={
-                        "natural_query": request.query,
-                        "generated_sql": nl_response.sql_query,
-                        "execution_time": query_result.execution_time_ms if query_result else None,
-                        "rows_returned": len(query_result.data) if query_result and query_result.data else 0,
-                        "sql_confidence": nl_response.confidence,
-                        "has_visualization": visualization_recommendation is not None,
-                        "model_key": request.model_key or "default",
-                        "query_executed": query_result is not None,
-                        "schema_context_used": catalog_context is not None,
-                        "schema_context_type": "full" if catalog_context and "catalogs" in catalog_context else "basic" if catalog_context else "none",
-                        "query_error": query_error
-                    }
-                )
-                activity_log_service.log_activity(log_request, user_id="anonymous")
-            except Exception as e:
-                activity_log_service.log_error(
-                    ActivityType.CHAT_QUERY,
-                    f"Error logging chat activity: {str(e)}"
-                )
-        
-        background_tasks.add_task(log_chat_activity)
+        # Capture only primitives so the background task doesn't keep
+        # query_result / nl_response alive after the response is sent
+        log_payload = {
+            "natural_query": request.query,
+            "generated_sql": nl_response.sql_query,
+            "execution_time": query_result.execution_time_ms if query_result else None,
+            "rows_returned": row_count,
+            "sql_confidence": nl_response.confidence,
+            "has_visualization": visualization_recommendation is not None,
+            "model_key": request.model_key or "default",
+            "query_executed": query_result is not None,
+            "schema_context_used": catalog_context is not None,
+            "schema_context_type": ctx_type,
+            "query_error": query_error
+        }
+        background_tasks.add_task(_log_chat_activity, log_payload)
         
         # Prepare response notes
         notes = []
@@ -1004,29 +1074,29 @@ async def execute_chat_query(request: NaturalLanguageQueryRequest, background_ta
             else:
                 notes.append("Query was converted but not executed due to database connection issues")
         
-        if catalog_context:
-            if "catalogs" in catalog_context:
-                notes.append(f"Used full schema context with {len(catalog_context['catalogs'])} catalogs")
-            elif "catalog" in catalog_context:
+        if ctx_type == "full":
+            notes.append(f"Used full schema context with {ctx_catalogs} catalogs")
+        elif ctx_type == "basic":
+            if "catalog" in catalog_context:
                 notes.append(f"Used specific schema context for {catalog_context['catalog']}.{catalog_context['schema']}")
             else:
                 notes.append("Used basic catalog listing")
         else:
             notes.append("No schema context available - generated query may need manual adjustment")
         
-        return {
+        return OrjsonResponse({
             "natural_language_query": request.query,
-            "nl_response": nl_response,
-            "query_result": query_result,
-            "visualization_recommendation": visualization_recommendation,
+            "nl_response": nl_response.model_dump(mode="json"),
+            "query_result": query_result.model_dump(mode="json") if query_result else None,
+            "visualization_recommendation": vars(visualization_recommendation) if visualization_recommendation else None,
             "status": "success",
             "notes": notes,
             "schema_context_summary": {
-                "type": "full" if catalog_context and "catalogs" in catalog_context else "basic" if catalog_context else "none",
-                "catalogs_available": len(catalog_context.get("catalogs", [])) if catalog_context and "catalogs" in catalog_context else 0,
-                "tables_available": catalog_context.get("total_tables", 0) if catalog_context else 0
+                "type": ctx_type,
+                "catalogs_available": ctx_catalogs,
+                "tables_available": ctx_tables
             }
-        }
+        })
         
     except Exception as e:
         activity_log_service.log_error(
@@ -1054,25 +1124,8 @@ async def get_llm_models():
                     fresh_models = [model["name"] for model in data.get("models", [])]
                     print(f"DEBUG: Fresh models from Ollama: {fresh_models}")
                     
-                    # Clear ALL existing Ollama models from config
-                    llm_config.available_models = {
-                        k: v for k, v in llm_config.available_models.items() 
-                        if v.provider != LLMProvider.OLLAMA
-                    }
-                    print(f"DEBUG: Cleared Ollama models, remaining: {len(llm_config.available_models)}")
-                    
-                    # Add fresh Ollama models
-                    for model_name in fresh_models:
-                        clean_name = model_name.split(":")[0]
-                        key = f"ollama-{clean_name}"
-                        
-                        llm_config.available_models[key] = LLMModelConfig(
-                            provider=LLMProvider.OLLAMA,
-                            model_name=model_name,
-                            display_name=f"{clean_name.title()} (Ollama)",
-                            api_base_env_var="OLLAMA_BASE_URL",
-                            max_tokens=4096
-                        )
+                    # Replace ALL existing Ollama models in config with the fresh ones
+                    llm_config.set_ollama_models(fresh_models)
                     
                     print(f"DEBUG: Added {len(fresh_models)} fresh Ollama models")
                     
@@ -1452,13 +1505,13 @@ async def generate_ai_visualization_recommendation(request: QueryResult, model_k
             user_id="anonymous"
         )
         
-        return response
+        return OrjsonResponse(response)
         
     except Exception as e:
         logger.error(f"Error generating AI visualization recommendation: {str(e)}")
         # Return rule-based fallback
         rule_based_rec = visualization_service.analyze_data_and_recommend(request)
-        return {
+        return OrjsonResponse({
             "ai_recommendation": {
                 "chart_type": rule_based_rec.chart_type,
                 "rationale": f"AI service unavailable, using rule-based recommendation: {str(e)}",
@@ -1475,7 +1528,7 @@ async def generate_ai_visualization_recommendation(request: QueryResult, model_k
                 "config": rule_based_rec.config
             },
             "recommended_config": rule_based_rec.config
-        } 
+        })
 
 @router.get("/schema-context-test")
 async def test_schema_context():
@@ -1491,7 +1544,7 @@ async def test_schema_context():
         # Format for LLM
         formatted_context = trino_service.format_schema_context_for_llm(schema_context)
         
-        return {
+        return OrjsonResponse({
             "status": "success",
             "schema_context": schema_context,
             "formatted_for_llm": formatted_context,
@@ -1501,15 +1554,15 @@ async def test_schema_context():
                 "total_tables": schema_context.get("total_tables", 0),
                 "generation_time_ms": schema_context.get("generation_time_ms", 0)
             }
-        }
+        })
         
     except Exception as e:
-        return {
+        return OrjsonResponse({
             "status": "error",
             "error": str(e),
             "schema_context": None,
             "formatted_for_llm": None
-        } 
+        })
 
 @router.post("/intelligent-nl2sql-debug")
 async def debug_intelligent_nl2sql(request: NaturalLanguageQueryRequest):
@@ -1518,14 +1571,16 @@ async def debug_intelligent_nl2sql(request: NaturalLanguageQueryRequest):
         logger.info(f"Debug processing: {request.query}")
         
         # Get detailed result from intelligent service
-        result = await intelligent_nl2sql_service.convert_natural_language_to_sql(
+        result = await _convert_nl2sql(
             natural_query=request.query,
             model_key=request.model_key or "gpt-3.5-turbo",
             max_tables=20
         )
         
+        schema_context = await _get_schema_ctx()
+        
         # Return detailed debug information
-        return {
+        return OrjsonResponse({
             "status": "success",
             "query": request.query,
             "model_key": request.model_key or "gpt-3.5-turbo",
@@ -1552,51 +1607,38 @@ async def debug_intelligent_nl2sql(request: NaturalLanguageQueryRequest):
                 "confidence": result.confidence
             },
             "schema_summary": {
-                "total_tables_analyzed": len((await schema_context_service.get_comprehensive_schema_context()).tables),
-                "business_domains_found": (await schema_context_service.get_comprehensive_schema_context()).business_domains
+                "total_tables_analyzed": len(schema_context.tables),
+                "business_domains_found": schema_context.business_domains
             }
-        }
+        })
         
     except Exception as e:
         logger.error(f"Debug intelligent NL2SQL error: {str(e)}")
-        return {
+        return OrjsonResponse({
             "status": "error",
             "error": str(e),
             "query": request.query,
             "model_key": request.model_key
-        }
+        })
 
 @router.get("/schema-context-summary")
 async def get_schema_context_summary():
     """Get summary of available schema context for debugging"""
     try:
-        schema_context = await schema_context_service.get_comprehensive_schema_context(max_tables=50)
-        
-        # Group tables by business domain
-        domain_groups = {}
-        for table in schema_context.tables:
-            domain = table.business_context or "uncategorized"
-            if domain not in domain_groups:
-                domain_groups[domain] = []
-            domain_groups[domain].append({
-                "name": table.name,
-                "full_name": table.full_name,
-                "column_count": len(table.columns),
-                "relationships": table.potential_relationships
-            })
+        schema_context = await _get_schema_ctx(max_tables=50)
         
-        return {
+        return OrjsonResponse({
             "summary": schema_context.summary,
             "total_tables": len(schema_context.tables),
             "total_relationships": len(schema_context.relationships),
             "business_domains": schema_context.business_domains,
-            "domain_groups": domain_groups,
+            "domain_groups": schema_context.domain_groups,
             "relationships": schema_context.relationships[:10]  # Show first 10 relationships
-        }
+        })
         
     except Exception as e:
         logger.error(f"Error getting schema context summary: {str(e)}")
-        return {
+        return OrjsonResponse({
             "error": str(e),
             "summary": "Schema context unavailable"
-        } 
\ No newline at end of file
+        })
@@ -2,12 +2,18 @@
 Data Catalog API Router
 """
 
-from typing import List, Dict, Any, Optional
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel, Field
+import asyncio
+import uuid
+from collections import OrderedDict
+from typing import List, Dict, Any, Literal, Optional, Tuple
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from datetime import datetime
 
 from src.services.catalog_service import catalog_service
+from src.services.schema_context_service import schema_context_service
+from src.services.trino_service import trino_service
 from src.config.logging_config import get_service_logger
 
 router = APIRouter(prefix="/catalog", tags=["Data Catalog"])
@@ -15,6 +21,8 @@ logger = get_service_logger("catalog_api")
 
 class CatalogStatsResponse(BaseModel):
     """Catalog statistics response model"""
+    model_config = ConfigDict(from_attributes=True)
+    
     total_data_sources: int
     total_databases: int
     total_tables: int
@@ -25,6 +33,8 @@ class CatalogStatsResponse(BaseModel):
 
 class CatalogColumnResponse(BaseModel):
     """Catalog column response model"""
+    model_config = ConfigDict(from_attributes=True)
+    
     name: str
     data_type: str
     nullable: bool
@@ -36,6 +46,8 @@ class CatalogColumnResponse(BaseModel):
 
 class CatalogTableResponse(BaseModel):
     """Catalog table response model"""
+    model_config = ConfigDict(from_attributes=True)
+    
     name: str
     database_name: str
     data_source_id: str
@@ -49,6 +61,8 @@ class CatalogTableResponse(BaseModel):
 
 class CatalogDatabaseResponse(BaseModel):
     """Catalog database response model"""
+    model_config = ConfigDict(from_attributes=True)
+    
     name: str
     data_source_id: str
     tables: List[CatalogTableResponse] = []
@@ -61,6 +75,8 @@ class CatalogDatabaseResponse(BaseModel):
 
 class CatalogDataSourceResponse(BaseModel):
     """Catalog data source response model"""
+    model_config = ConfigDict(from_attributes=True)
+    
     id: str
     name: str
     type: str
@@ -75,6 +91,8 @@ class CatalogDataSourceResponse(BaseModel):
 
 class CatalogTreeResponse(BaseModel):
     """Catalog tree response model"""
+    model_config = ConfigDict(from_attributes=True)
+    
     data_sources: List[CatalogDataSourceResponse] = []
     total_data_sources: int
     total_databases: int
@@ -84,6 +102,8 @@ class CatalogTreeResponse(BaseModel):
 
 class CatalogSearchResultResponse(BaseModel):
     """Catalog search result response model"""
+    model_config = ConfigDict(from_attributes=True)
+    
     item_type: str
     name: str
     full_name: str
@@ -95,6 +115,31 @@ class CatalogSearchResultResponse(BaseModel):
     relevance_score: float = 0.0
     metadata: Dict[str, Any] = {}
 
+class RefreshJobResponse(BaseModel):
+    """Catalog refresh job status response model"""
+    job_id: str
+    status: str  # accepted, running, completed, failed
+    started_at: datetime
+    completed_at: Optional[datetime] = None
+    stats: Optional[Dict[str, int]] = None
+    error: Optional[str] = None
+
+# Built once at import; converting service-layer objects in pydantic-core
+# avoids rebuilding every nested response model by hand per request
+_table_list_adapter = TypeAdapter(List[CatalogTableResponse])
+_search_result_list_adapter = TypeAdapter(List[CatalogSearchResultResponse])
+
+# Recent search responses keyed by (query, types, limit, catalog version);
+# typing in the search box issues many repeated queries
+SEARCH_CACHE_SIZE = 1024
+_search_cache: "OrderedDict[Tuple, List[CatalogSearchResultResponse]]" = OrderedDict()
+
+# Background catalog refresh jobs; only one refresh runs at a time
+MAX_REFRESH_JOBS = 100
+_refresh_jobs: Dict[str, RefreshJobResponse] = {}
+_refresh_lock = asyncio.Lock()
+_active_refresh_job_id: Optional[str] = None
+
 @router.get("/stats", response_model=CatalogStatsResponse)
 async def get_catalog_stats():
     """Get catalog statistics"""
@@ -113,118 +158,141 @@ async def get_catalog_stats():
             last_scan_time=stats.last_scan_time
         )
         
-        logger.success(f"Retrieved catalog stats: {stats.total_data_sources} sources, {stats.total_tables} tables")
+        logger.success("Retrieved catalog stats: {} sources, {} tables", stats.total_data_sources, stats.total_tables)
         return response
         
     except Exception as e:
-        logger.error(f"Failed to get catalog stats: {str(e)}")
+        logger.error("Failed to get catalog stats: {}", e)
         raise HTTPException(status_code=500, detail=f"Failed to get catalog statistics: {str(e)}")
 
+def _model_fields(obj, model, **overrides) -> Dict[str, Any]:
+    """Read a response model's fields from a service-layer object, replacing child lists"""
+    data = {name: getattr(obj, name) for name in model.model_fields if name not in overrides}
+    data.update(overrides)
+    return data
+
+def _project_catalog_tree(catalog_tree, depth: str, include_columns: bool) -> CatalogTreeResponse:
+    """Convert the catalog tree, skipping levels below the requested depth"""
+    if depth == "columns" and include_columns:
+        return CatalogTreeResponse.model_validate(catalog_tree)
+    
+    def table(t):
+        return _model_fields(t, CatalogTableResponse, columns=[])
+    
+    def database(db):
+        tables = [table(t) for t in db.tables] if depth in ("tables", "columns") else []
+        return _model_fields(db, CatalogDatabaseResponse, tables=tables)
+    
+    def data_source(ds):
+        databases = [database(db) for db in ds.databases] if depth != "sources" else []
+        return _model_fields(ds, CatalogDataSourceResponse, databases=databases)
+    
+    return CatalogTreeResponse.model_validate(_model_fields(
+        catalog_tree, CatalogTreeResponse,
+        data_sources=[data_source(ds) for ds in catalog_tree.data_sources]
+    ))
+
 @router.get("/tree", response_model=CatalogTreeResponse)
-async def get_catalog_tree():
+async def get_catalog_tree(
+    depth: Literal["sources", "databases", "tables", "columns"] = Query("columns", description="Deepest tree level to include"),
+    include_columns: bool = Query(True, description="Include table columns")
+):
     """Get the complete catalog tree"""
     try:
-        logger.info("Getting catalog tree")
+        logger.info("Getting catalog tree (depth: {}, include_columns: {})", depth, include_columns)
         
         catalog_tree = await catalog_service.get_catalog_tree()
         
-        # Convert to response format
-        data_sources = []
-        for ds in catalog_tree.data_sources:
-            databases = []
-            for db in ds.databases:
-                tables = []
-                for table in db.tables:
-                    columns = []
-                    for col in table.columns:
-                        columns.append(CatalogColumnResponse(
-                            name=col.name,
-                            data_type=col.data_type,
-                            nullable=col.nullable,
-                            primary_key=col.primary_key,
-                            foreign_key=col.foreign_key,
-                            default_value=col.default_value,
-                            description=col.description,
-                            tags=col.tags
-                        ))
-                    
-                    tables.append(CatalogTableResponse(
-                        name=table.name,
-                        database_name=table.database_name,
-                        data_source_id=table.data_source_id,
-                        full_name=table.full_name,
-                        columns=columns,
-                        description=table.description,
-                        row_count=table.row_count,
-                        column_count=table.column_count,
-                        last_scanned_at=table.last_scanned_at,
-                        tags=table.tags
-                    ))
-                
-                databases.append(CatalogDatabaseResponse(
-                    name=db.name,
-                    data_source_id=db.data_source_id,
-                    tables=tables,
-                    description=db.description,
-                    table_count=db.table_count,
-                    total_row_count=db.total_row_count,
-                    total_column_count=db.total_column_count,
-                    last_scanned_at=db.last_scanned_at,
-                    tags=db.tags
-                ))
-            
-            data_sources.append(CatalogDataSourceResponse(
-                id=ds.id,
-                name=ds.name,
-                type=ds.type,
-                databases=databases,
-                description=ds.description,
-                connection_status=ds.connection_status,
-                database_count=ds.database_count,
-                table_count=ds.table_count,
-                total_row_count=ds.total_row_count,
-                last_scanned_at=ds.last_scanned_at,
-                tags=ds.tags
-            ))
+        response = _project_catalog_tree(catalog_tree, depth, include_columns)
         
-        response = CatalogTreeResponse(
-            data_sources=data_sources,
-            total_data_sources=catalog_tree.total_data_sources,
-            total_databases=catalog_tree.total_databases,
-            total_tables=catalog_tree.total_tables,
-            total_columns=catalog_tree.total_columns,
-            last_updated=catalog_tree.last_updated
-        )
-        
-        logger.success(f"Retrieved catalog tree with {len(data_sources)} data sources")
+        logger.success("Retrieved catalog tree with {} data sources", len(response.data_sources))
         return response
         
     except Exception as e:
-        logger.error(f"Failed to get catalog tree: {str(e)}")
+        logger.error("Failed to get catalog tree: {}", e)
         raise HTTPException(status_code=500, detail=f"Failed to get catalog tree: {str(e)}")
 
-@router.post("/refresh")
-async def refresh_catalog():
-    """Refresh the catalog from data sources"""
+@router.get("/tree/stream")
+async def stream_catalog_tree():
+    """Stream the catalog tree as NDJSON, one data source per line"""
     try:
-        logger.info("Refreshing catalog")
+        logger.info("Streaming catalog tree")
+        
+        catalog_tree = await catalog_service.get_catalog_tree()
         
-        catalog_tree = await catalog_service.refresh_catalog()
+        def generate():
+            for ds in catalog_tree.data_sources:
+                yield CatalogDataSourceResponse.model_validate(ds).model_dump_json().encode() + b"\n"
         
-        logger.success(f"Catalog refreshed successfully: {catalog_tree.total_data_sources} sources")
-        return {
-            "message": "Catalog refreshed successfully",
-            "stats": {
+        return StreamingResponse(generate(), media_type="application/x-ndjson")
+        
+    except Exception as e:
+        logger.error("Failed to stream catalog tree: {}", e)
+        raise HTTPException(status_code=500, detail=f"Failed to stream catalog tree: {str(e)}")
+
+async def _run_catalog_refresh(job_id: str):
+    """Run a catalog refresh job and record its outcome"""
+    global _active_refresh_job_id
+    job = _refresh_jobs[job_id]
+    
+    async with _refresh_lock:
+        try:
+            job.status = "running"
+            logger.info("Refreshing catalog (job {})", job_id)
+            
+            catalog_tree = await catalog_service.refresh_catalog()
+            schema_context_service.invalidate_cache()
+            trino_service.invalidate_schema_context_cache()
+            
+            job.stats = {
                 "data_sources": catalog_tree.total_data_sources,
                 "databases": catalog_tree.total_databases,
                 "tables": catalog_tree.total_tables,
                 "columns": catalog_tree.total_columns
             }
-        }
-        
-    except Exception as e:
-        logger.error(f"Failed to refresh catalog: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to refresh catalog: {str(e)}")
+            job.status = "completed"
+            logger.success("Catalog refreshed successfully: {} sources", catalog_tree.total_data_sources)
+            
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.error("Failed to refresh catalog: {}", e)
+            
+        finally:
+            job.completed_at = datetime.utcnow()
+            _active_refresh_job_id = None
+
+@router.post("/refresh", response_model=RefreshJobResponse, status_code=202)
+async def refresh_catalog(background_tasks: BackgroundTasks):
+    """Start a catalog refresh in the background; poll /refresh/{job_id} for the result"""
+    global _active_refresh_job_id
+    
+    # Join the refresh already in flight instead of starting another one
+    if _active_refresh_job_id is not None:
+        return _refresh_jobs[_active_refresh_job_id]
+    
+    job = RefreshJobResponse(
+        job_id=str(uuid.uuid4()),
+        status="accepted",
+        started_at=datetime.utcnow()
+    )
+    _refresh_jobs[job.job_id] = job
+    _active_refresh_job_id = job.job_id
+    
+    # Forget the oldest finished jobs
+    while len(_refresh_jobs) > MAX_REFRESH_JOBS:
+        del _refresh_jobs[next(iter(_refresh_jobs))]
+    
+    background_tasks.add_task(_run_catalog_refresh, job.job_id)
+    return job
+
+@router.get("/refresh/{job_id}", response_model=RefreshJobResponse)
+async def get_refresh_job(job_id: str):
+    """Get the status of a catalog refresh job"""
+    job = _refresh_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Refresh job not found")
+    return job
 
 @router.get("/search", response_model=List[CatalogSearchResultResponse])
 async def search_catalog(
@@ -234,123 +302,64 @@ async def search_catalog(
 ):
     """Search the catalog"""
     try:
-        logger.info(f"Searching catalog with query: {q}")
-        
-        results = await catalog_service.search_catalog(q, types)
+        logger.info("Searching catalog with query: {}", q)
         
-        # Limit results
-        results = results[:limit]
-        
-        # Convert to response format
-        response = []
-        for result in results:
-            response.append(CatalogSearchResultResponse(
-                item_type=result.item_type,
-                name=result.name,
-                full_name=result.full_name,
-                description=result.description,
-                data_source_name=result.data_source_name,
-                database_name=result.database_name,
-                table_name=result.table_name,
-                tags=result.tags,
-                relevance_score=result.relevance_score,
-                metadata=result.metadata
-            ))
+        # Normalize once so the cache key and the search see the same query
+        q = q.strip()
+        cache_key = (q.lower(), tuple(types or ()), limit, catalog_service.catalog_version)
+        response = _search_cache.get(cache_key)
+        if response is not None:
+            _search_cache.move_to_end(cache_key)
+        else:
+            results = await catalog_service.search_catalog(q, types, limit)
+            response = _search_result_list_adapter.validate_python(results)
+            
+            _search_cache[cache_key] = response
+            if len(_search_cache) > SEARCH_CACHE_SIZE:
+                _search_cache.popitem(last=False)
         
-        logger.success(f"Found {len(response)} search results for query: {q}")
+        logger.success("Found {} search results for query: {}", len(response), q)
         return response
         
     except Exception as e:
-        logger.error(f"Catalog search failed: {str(e)}")
+        logger.error("Catalog search failed: {}", e)
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
 @router.get("/tables/{data_source_id}/{database_name}/{table_name}", response_model=CatalogTableResponse)
 async def get_table_details(data_source_id: str, database_name: str, table_name: str):
     """Get detailed information about a specific table"""
     try:
-        logger.info(f"Getting table details: {data_source_id}.{database_name}.{table_name}")
+        logger.info("Getting table details: {}.{}.{}", data_source_id, database_name, table_name)
         
         table = await catalog_service.get_table_details(data_source_id, database_name, table_name)
         
         if not table:
             raise HTTPException(status_code=404, detail="Table not found")
         
-        # Convert columns
-        columns = []
-        for col in table.columns:
-            columns.append(CatalogColumnResponse(
-                name=col.name,
-                data_type=col.data_type,
-                nullable=col.nullable,
-                primary_key=col.primary_key,
-                foreign_key=col.foreign_key,
-                default_value=col.default_value,
-                description=col.description,
-                tags=col.tags
-            ))
+        response = CatalogTableResponse.model_validate(table)
         
-        response = CatalogTableResponse(
-            name=table.name,
-            database_name=table.database_name,
-            data_source_id=table.data_source_id,
-            full_name=table.full_name,
-            columns=columns,
-            description=table.description,
-            row_count=table.row_count,
-            column_count=table.column_count,
-            last_scanned_at=table.last_scanned_at,
-            tags=table.tags
-        )
-        
-        logger.success(f"Retrieved table details for {table.full_name}")
+        logger.success("Retrieved table details for {}", table.full_name)
         return response
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get table details: {str(e)}")
+        logger.error("Failed to get table details: {}", e)
         raise HTTPException(status_code=500, detail=f"Failed to get table details: {str(e)}")
 
 @router.get("/databases/{data_source_id}/{database_name}/tables", response_model=List[CatalogTableResponse])
 async def get_database_tables(data_source_id: str, database_name: str):
     """Get all tables in a specific database"""
     try:
-        logger.info(f"Getting tables for database: {data_source_id}.{database_name}")
+        logger.info("Getting tables for database: {}.{}", data_source_id, database_name)
         
         tables = await catalog_service.get_database_tables(data_source_id, database_name)
         
-        # Convert to response format
-        response = []
-        for table in tables:
-            columns = []
-            for col in table.columns:
-                columns.append(CatalogColumnResponse(
-                    name=col.name,
-                    data_type=col.data_type,
-                    nullable=col.nullable,
-                    primary_key=col.primary_key,
-                    foreign_key=col.foreign_key,
-                    default_value=col.default_value,
-                    description=col.description,
-                    tags=col.tags
-                ))
-            
-            response.append(CatalogTableResponse(
-                name=table.name,
-                database_name=table.database_name,
-                data_source_id=table.data_source_id,
-                full_name=table.full_name,
-                columns=columns,
-                description=table.description,
-                row_count=table.row_count,
-                column_count=table.column_count,
-                last_scanned_at=table.last_scanned_at,
-                tags=table.tags
-            ))
+        response = _table_list_adapter.validate_python(tables)
         
-        logger.success(f"Retrieved {len(response)} tables for database {database_name}")
+        logger.success("Retrieved {} tables for database {}", len(response), database_name)
         return response
         
     except Exception as e:
-        logger.error(f"Failed to get database tables: {str(e)}")
+        logger.error("Failed to get database tables: {}", e)
         raise HTTPException(status_code=500, detail=f"Failed to get database tables: {str(e)}") 
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Shared helpers for API routers
+"""
+
+from decimal import Decimal
+from functools import wraps
+from typing import Any, Dict, Type
+
+import orjson
+from fastapi import Depends, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from loguru import logger
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+
+def _orjson_default(value: Any) -> Any:
+    """Encode values orjson does not support: Decimals as numbers, like FastAPI, anything else as str()"""
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    return str(value)
+
+
+class OrjsonResponse(JSONResponse):
+    """JSON response rendered with orjson
+
+    Routes that build large payloads (query rows) return it directly, with
+    models already dumped, to skip FastAPI's jsonable_encoder pass.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def route_error_handler(message: str, log=logger):
+    """Turn unexpected errors raised by a route into logged HTTP 500 responses
+
+    HTTPExceptions raised by the route (404, 400, ...) pass through unchanged.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except HTTPException:
+                raise
+            except Exception as e:
+                log.error("{}: {}", message, e)
+                raise HTTPException(status_code=500, detail=f"{message}: {e}")
+        return wrapper
+    return decorator
+
+
+def json_body(model: Type[BaseModel]):
+    """Dependency that validates the raw request body as model in a single pass
+
+    Pydantic parses and validates the JSON bytes together instead of FastAPI
+    decoding to a dict first. Pair with json_body_openapi(model) on the route
+    so the request body stays documented.
+    """
+    adapter = TypeAdapter(model)
+    
+    async def dependency(request: Request):
+        body = await request.body()
+        try:
+            return adapter.validate_json(body)
+        except ValidationError as e:
+            errors = [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+            raise RequestValidationError(errors, body=body)
+    
+    return Depends(dependency)
+
+
+def json_body_openapi(model: Type[BaseModel]) -> Dict[str, Any]:
+    """OpenAPI request body for routes that read model via json_body"""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}}
+        }
+    }
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """Check whether the client already holds the representation for etag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))
@@ -2,9 +2,13 @@
 Data Lineage API endpoints
 """
 
-from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import PlainTextResponse
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any, Tuple
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
 from loguru import logger
 
@@ -12,12 +16,145 @@ from src.models.lineage import (
     LineageQueryRequest, LineageQueryResponse, LineageMetrics,
     ColumnLineage, LineageDataset, LineageJob, LineageRun
 )
+from src.api.common import not_modified, route_error_handler
 from src.services.lineage_service import lineage_service
 
 router = APIRouter(tags=["lineage"])
 
+async def _graph_state() -> Tuple[str, int]:
+    """Get the ETag and version of the lineage graph, syncing with the shared store off the event loop"""
+    tag, version = await asyncio.to_thread(lineage_service.graph_state)
+    return f'W/"{tag}"', version
 
-@router.get("/lineage/query", response_model=LineageQueryResponse)
+
+# Lineage query results keyed by (request fields, graph version); dashboards
+# poll the same queries repeatedly and the graph only changes on POST
+LINEAGE_CACHE_SIZE = 1024
+_lineage_query_cache: "OrderedDict[Tuple, LineageQueryResponse]" = OrderedDict()
+_lineage_query_lock = threading.Lock()  # Queries run in worker threads
+
+
+def _cached_query_lineage(request: LineageQueryRequest) -> LineageQueryResponse:
+    """Run a lineage query, reusing the result while the graph is unchanged"""
+    cache_key = (
+        request.dataset_name, request.job_name, request.direction,
+        request.depth, request.include_schema, lineage_service.graph_version
+    )
+    with _lineage_query_lock:
+        result = _lineage_query_cache.get(cache_key)
+        if result is not None:
+            _lineage_query_cache.move_to_end(cache_key)
+            return result
+    
+    result = lineage_service.query_lineage(request)
+    
+    with _lineage_query_lock:
+        _lineage_query_cache[cache_key] = result
+        if len(_lineage_query_cache) > LINEAGE_CACHE_SIZE:
+            _lineage_query_cache.popitem(last=False)
+    return result
+
+
+# Serialized visualization payloads keyed by (dataset, format, graph version);
+# the lineage page polls this endpoint
+_viz_cache: "OrderedDict[Tuple, bytes]" = OrderedDict()
+
+# Visualization centers on customers unless a dataset is given
+_DEFAULT_VIZ_REQUEST = LineageQueryRequest(
+    dataset_name="customers",
+    direction="both",
+    depth=3,
+    include_schema=False
+)
+_DEFAULT_VIZ_REQUEST_DUMP = _DEFAULT_VIZ_REQUEST.model_dump()
+
+
+def _build_visualization_payload(
+    request: LineageQueryRequest,
+    result: LineageQueryResponse,
+    format: str
+) -> Dict[str, Any]:
+    """Format a lineage query result for the visualization endpoint"""
+    query = _DEFAULT_VIZ_REQUEST_DUMP if request is _DEFAULT_VIZ_REQUEST else request.model_dump()
+    
+    if format == "cytoscape":
+        # Format for Cytoscape.js
+        graph = result.graph
+        
+        # Dataset and job nodes
+        nodes = [
+            {
+                "data": {
+                    "id": name,
+                    "label": dataset.name,
+                    "type": "dataset",
+                    "dataset_type": dataset_type,
+                    "namespace": dataset.namespace
+                },
+                "classes": f"dataset {dataset_type}"
+            }
+            for name, dataset in graph.datasets.items()
+            for dataset_type in (dataset.type.value,)
+        ]
+        nodes += [
+            {
+                "data": {
+                    "id": name,
+                    "label": job.name,
+                    "type": "job",
+                    "job_type": job_type,
+                    "namespace": job.namespace,
+                    "description": job.description
+                },
+                "classes": f"job {job_type}"
+            }
+            for name, job in graph.jobs.items()
+            for job_type in (job.type.value,)
+        ]
+        
+        # Edges
+        edges = [
+            {
+                "data": {
+                    "id": f"{source}-{target}",
+                    "source": source,
+                    "target": target,
+                    "type": edge_type
+                },
+                "classes": edge_type
+            }
+            for source, target, edge_type in (
+                (r["source"], r["target"], r["type"]) for r in graph.relationships
+            )
+        ]
+        
+        return {
+            "nodes": nodes,
+            "edges": edges,
+            "query": query,
+            "stats": {
+                "total_datasets": result.total_datasets,
+                "total_jobs": result.total_jobs,
+                "execution_time_ms": result.execution_time_ms
+            }
+        }
+    
+    else:
+        # Return raw JSON format
+        return {
+            "graph": result.graph.model_dump(),
+            "query": query,
+            "stats": {
+                "total_datasets": result.total_datasets,
+                "total_jobs": result.total_jobs,
+                "execution_time_ms": result.execution_time_ms
+            }
+        }
+    
+
+
+@router.get("/lineage/query", response_model=None, responses={200: {"model": LineageQueryResponse}})
+@route_error_handler("Error querying lineage")
 async def query_lineage(
     dataset_name: Optional[str] = Query(None, description="Dataset name to trace"),
     job_name: Optional[str] = Query(None, description="Job name to trace"),
@@ -26,246 +163,225 @@ async def query_lineage(
     include_schema: bool = Query(True, description="Include schema information")
 ):
     """Query data lineage graph"""
-    try:
-        request = LineageQueryRequest(
-            dataset_name=dataset_name,
-            job_name=job_name,
-            direction=direction,
-            depth=depth,
-            include_schema=include_schema
-        )
-        
-        logger.info(f"Querying lineage: {request}")
-        result = lineage_service.query_lineage(request)
-        
-        logger.info(f"Lineage query completed: {result.total_datasets} datasets, {result.total_jobs} jobs")
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error querying lineage: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    request = LineageQueryRequest(
+        dataset_name=dataset_name,
+        job_name=job_name,
+        direction=direction,
+        depth=depth,
+        include_schema=include_schema
+    )
+    
+    logger.debug("Querying lineage: {}", request)
+    result = await asyncio.to_thread(_cached_query_lineage, request)
+    
+    logger.debug("Lineage query completed: {} datasets, {} jobs", result.total_datasets, result.total_jobs)
+    # Already a validated model; serialize directly instead of re-validating against response_model
+    return Response(content=result.model_dump_json(), media_type="application/json")
 
 
 @router.get("/lineage/datasets", response_model=Dict[str, LineageDataset])
-async def get_all_datasets():
+@route_error_handler("Error getting datasets")
+async def get_all_datasets(http_request: Request):
     """Get all datasets in lineage"""
-    try:
-        return lineage_service.datasets
-    except Exception as e:
-        logger.error(f"Error getting datasets: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    etag, _ = await _graph_state()
+    if not_modified(http_request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    content = await asyncio.to_thread(lineage_service.datasets_blob)
+    return Response(content=content, media_type="application/json", headers={"ETag": etag})
 
 
 @router.get("/lineage/jobs", response_model=Dict[str, LineageJob]) 
-async def get_all_jobs():
+@route_error_handler("Error getting jobs")
+async def get_all_jobs(http_request: Request):
     """Get all jobs in lineage"""
-    try:
-        return lineage_service.jobs
-    except Exception as e:
-        logger.error(f"Error getting jobs: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    etag, _ = await _graph_state()
+    if not_modified(http_request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    content = await asyncio.to_thread(lineage_service.jobs_blob)
+    return Response(content=content, media_type="application/json", headers={"ETag": etag})
 
 
 @router.get("/lineage/runs", response_model=List[LineageRun])
-async def get_all_runs():
+@route_error_handler("Error getting runs")
+async def get_all_runs(http_request: Request):
     """Get all runs in lineage"""
-    try:
-        return lineage_service.runs
-    except Exception as e:
-        logger.error(f"Error getting runs: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    etag, _ = await _graph_state()
+    if not_modified(http_request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    content = await asyncio.to_thread(lineage_service.runs_blob)
+    return Response(content=content, media_type="application/json", headers={"ETag": etag})
 
 
 @router.get("/lineage/column/{dataset_name}", response_model=List[ColumnLineage])
+@route_error_handler("Error getting column lineage")
 async def get_column_lineage(
     dataset_name: str,
     column_name: Optional[str] = Query(None, description="Specific column name")
 ):
     """Get column-level lineage for a dataset"""
-    try:
-        result = lineage_service.get_column_lineage(dataset_name, column_name)
-        logger.info(f"Found {len(result)} column lineage entries for {dataset_name}")
-        return result
-    except Exception as e:
-        logger.error(f"Error getting column lineage: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await asyncio.to_thread(lineage_service.get_column_lineage, dataset_name, column_name)
+    logger.debug("Found {} column lineage entries for {}", len(result), dataset_name)
+    return result
 
 
 @router.get("/lineage/metrics", response_model=LineageMetrics)
+@route_error_handler("Error getting lineage metrics")
 async def get_lineage_metrics():
     """Get lineage metrics and statistics"""
-    try:
-        metrics = lineage_service.get_metrics()
-        logger.info(f"Retrieved lineage metrics: {metrics.total_datasets} datasets, {metrics.total_jobs} jobs")
-        return metrics
-    except Exception as e:
-        logger.error(f"Error getting lineage metrics: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    metrics = await asyncio.to_thread(lineage_service.get_metrics)
+    logger.debug("Retrieved lineage metrics: {} datasets, {} jobs", metrics.total_datasets, metrics.total_jobs)
+    return metrics
 
 
 @router.get("/lineage/impact/{dataset_name}")
+@route_error_handler("Error getting impact analysis")
 async def get_impact_analysis(dataset_name: str):
     """Get impact analysis for a dataset"""
-    try:
-        analysis = lineage_service.get_dataset_impact_analysis(dataset_name)
-        logger.info(f"Impact analysis for {dataset_name}: {analysis}")
-        return analysis
-    except Exception as e:
-        logger.error(f"Error getting impact analysis: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    analysis = await asyncio.to_thread(lineage_service.get_dataset_impact_analysis, dataset_name)
+    logger.opt(lazy=True).debug("Impact analysis for {}: {}", lambda: dataset_name, lambda: analysis)
+    return analysis
 
 
 @router.get("/lineage/export")
+@route_error_handler("Error exporting lineage")
 async def export_lineage(
     format: str = Query("json", description="Export format: json, graphml, or dot")
 ):
     """Export lineage graph in various formats"""
-    try:
-        if format not in ["json", "graphml", "dot"]:
-            raise HTTPException(status_code=400, detail="Invalid format. Use json, graphml, or dot")
-        
-        content = lineage_service.export_lineage_graph(format)
-        
-        # Set appropriate content type
-        content_types = {
-            "json": "application/json",
-            "graphml": "application/xml", 
-            "dot": "text/plain"
-        }
-        
-        return PlainTextResponse(
-            content=content,
-            media_type=content_types[format],
-            headers={
-                "Content-Disposition": f"attachment; filename=lineage.{format}"
-            }
-        )
-        
-    except Exception as e:
-        logger.error(f"Error exporting lineage: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    if format not in ["json", "graphml", "dot"]:
+        raise HTTPException(status_code=400, detail="Invalid format. Use json, graphml, or dot")
+    
+    headers = {"Content-Disposition": f"attachment; filename=lineage.{format}"}
+    
+    if format == "json":
+        data = await asyncio.to_thread(lineage_service.export_lineage_data)
+        return Response(content=orjson.dumps(data), media_type="application/json", headers=headers)
+    
+    # Snapshot the graph off the event loop; chunks are then streamed as they are encoded
+    chunks = await asyncio.to_thread(lineage_service.iter_export, format)
+    
+    # Set appropriate content type
+    content_types = {
+        "graphml": "application/xml", 
+        "dot": "text/plain"
+    }
+    
+    return StreamingResponse(
+        chunks,
+        media_type=content_types[format],
+        headers=headers
+    )
 
 
 @router.post("/lineage/datasets", response_model=dict)
+@route_error_handler("Error adding dataset")
 async def add_dataset(dataset: LineageDataset):
     """Add a new dataset to lineage"""
-    try:
-        lineage_service.add_dataset(dataset)
-        logger.info(f"Added dataset: {dataset.qualified_name}")
-        return {"status": "success", "message": f"Dataset {dataset.qualified_name} added"}
-    except Exception as e:
-        logger.error(f"Error adding dataset: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    await asyncio.to_thread(lineage_service.add_dataset, dataset)
+    logger.info("Added dataset: {}", dataset.qualified_name)
+    return {"status": "success", "message": f"Dataset {dataset.qualified_name} added"}
 
 
 @router.post("/lineage/jobs", response_model=dict)
+@route_error_handler("Error adding job")
 async def add_job(job: LineageJob):
     """Add a new job to lineage"""
-    try:
-        lineage_service.add_job(job)
-        logger.info(f"Added job: {job.qualified_name}")
-        return {"status": "success", "message": f"Job {job.qualified_name} added"}
-    except Exception as e:
-        logger.error(f"Error adding job: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    await asyncio.to_thread(lineage_service.add_job, job)
+    logger.info("Added job: {}", job.qualified_name)
+    return {"status": "success", "message": f"Job {job.qualified_name} added"}
 
 
 @router.post("/lineage/runs", response_model=dict)
+@route_error_handler("Error adding run")
 async def add_run(run: LineageRun):
     """Add a new run to lineage"""
-    try:
-        lineage_service.add_run(run)
-        logger.info(f"Added run: {run.run_id}")
-        return {"status": "success", "message": f"Run {run.run_id} added"}
-    except Exception as e:
-        logger.error(f"Error adding run: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    await asyncio.to_thread(lineage_service.add_run, run)
+    logger.info("Added run: {}", run.run_id)
+    return {"status": "success", "message": f"Run {run.run_id} added"}
+
+
+@router.post("/lineage/datasets:batch", response_model=dict)
+@route_error_handler("Error adding datasets")
+async def add_datasets(datasets: List[LineageDataset]):
+    """Add a batch of datasets to lineage"""
+    await asyncio.to_thread(lineage_service.add_datasets, datasets)
+    logger.info("Added {} datasets", len(datasets))
+    return {"status": "success", "message": f"{len(datasets)} datasets added"}
+
+
+@router.post("/lineage/jobs:batch", response_model=dict)
+@route_error_handler("Error adding jobs")
+async def add_jobs(jobs: List[LineageJob]):
+    """Add a batch of jobs to lineage"""
+    await asyncio.to_thread(lineage_service.add_jobs, jobs)
+    logger.info("Added {} jobs", len(jobs))
+    return {"status": "success", "message": f"{len(jobs)} jobs added"}
+
+
+@router.post("/lineage/runs:batch", response_model=dict)
+@route_error_handler("Error adding runs")
+async def add_runs(runs: List[LineageRun]):
+    """Add a batch of runs to lineage"""
+    await asyncio.to_thread(lineage_service.add_runs, runs)
+    logger.info("Added {} runs", len(runs))
+    return {"status": "success", "message": f"{len(runs)} runs added"}
+
+
+@router.get("/lineage/events")
+async def stream_lineage_events():
+    """Stream lineage changes as Server-Sent Events
+
+    Each event is {"op": "add_dataset" | "add_job" | "add_run" | "resync", "payload": ...};
+    clients load a snapshot from the GET endpoints first and refetch it on "resync".
+    """
+    async def event_stream():
+        async for event in lineage_service.subscribe():
+            if event is None:
+                yield ": keepalive\n\n"
+            else:
+                yield b"data: " + orjson.dumps(event) + b"\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
 
 
 @router.get("/lineage/graph/visualization")
+@route_error_handler("Error getting lineage visualization")
 async def get_lineage_visualization(
+    http_request: Request,
     dataset_name: Optional[str] = Query(None, description="Dataset to center visualization on"),
     format: str = Query("json", description="Visualization format: json or cytoscape")
 ):
     """Get lineage graph data formatted for visualization"""
-    try:
-        # Query lineage data
-        request = LineageQueryRequest(
-            dataset_name=dataset_name if dataset_name else "customers",
-            direction="both",
-            depth=3,
-            include_schema=False
-        )
-        
-        result = lineage_service.query_lineage(request)
-        
-        if format == "cytoscape":
-            # Format for Cytoscape.js
-            nodes = []
-            edges = []
-            
-            # Add dataset nodes
-            for name, dataset in result.graph.datasets.items():
-                nodes.append({
-                    "data": {
-                        "id": name,
-                        "label": dataset.name,
-                        "type": "dataset",
-                        "dataset_type": dataset.type.value,
-                        "namespace": dataset.namespace
-                    },
-                    "classes": f"dataset {dataset.type.value}"
-                })
-            
-            # Add job nodes
-            for name, job in result.graph.jobs.items():
-                nodes.append({
-                    "data": {
-                        "id": name,
-                        "label": job.name,
-                        "type": "job",
-                        "job_type": job.type.value,
-                        "namespace": job.namespace,
-                        "description": job.description
-                    },
-                    "classes": f"job {job.type.value}"
-                })
-            
-            # Add edges
-            for relationship in result.graph.relationships:
-                edges.append({
-                    "data": {
-                        "id": f"{relationship['source']}-{relationship['target']}",
-                        "source": relationship['source'],
-                        "target": relationship['target'],
-                        "type": relationship['type']
-                    },
-                    "classes": relationship['type']
-                })
-            
-            return {
-                "nodes": nodes,
-                "edges": edges,
-                "query": request.model_dump(),
-                "stats": {
-                    "total_datasets": result.total_datasets,
-                    "total_jobs": result.total_jobs,
-                    "execution_time_ms": result.execution_time_ms
-                }
-            }
-        
-        else:
-            # Return raw JSON format
-            return {
-                "graph": result.graph.model_dump(),
-                "query": request.model_dump(),
-                "stats": {
-                    "total_datasets": result.total_datasets,
-                    "total_jobs": result.total_jobs,
-                    "execution_time_ms": result.execution_time_ms
-                }
-            }
-        
-    except Exception as e:
-        logger.error(f"Error getting lineage visualization: {e}")
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+    etag, version = await _graph_state()
+    if not_modified(http_request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    dataset_name = dataset_name or _DEFAULT_VIZ_REQUEST.dataset_name
+    cache_key = (dataset_name, format, version)
+    content = _viz_cache.get(cache_key)
+    if content is not None:
+        _viz_cache.move_to_end(cache_key)
+        return Response(content=content, media_type="application/json", headers={"ETag": etag})
+    
+    # Query lineage data
+    if dataset_name == _DEFAULT_VIZ_REQUEST.dataset_name:
+        request = _DEFAULT_VIZ_REQUEST
+    else:
+        request = _DEFAULT_VIZ_REQUEST.model_copy(update={"dataset_name": dataset_name})
+    
+    result = await asyncio.to_thread(_cached_query_lineage, request)
+    
+    content = orjson.dumps(_build_visualization_payload(request, result, format))
+    
+    _viz_cache[cache_key] = content
+    if len(_viz_cache) > LINEAGE_CACHE_SIZE:
+        _viz_cache.popitem(last=False)
+    
+    return Response(content=content, media_type="application/json", headers={"ETag": etag})
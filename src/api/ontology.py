@@ -2,20 +2,74 @@
 Ontology API Router - Based on catalog metadata
 """
 
-from typing import List, Dict, Any, Optional
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel, Field
-from datetime import datetime
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Dict, Any, Optional, Tuple
+from uuid import uuid4
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+import orjson
 
 from src.models.ontology import (
-    OntologyDomain, OntologyStats, OntologyVisualizationData
+    OntologyDomain, OntologyEntity, OntologyRelationship, OntologyStats, OntologyVisualizationData
 )
+from src.api.common import OrjsonResponse, json_body, json_body_openapi, not_modified, route_error_handler
 from src.services.ontology_service import ontology_service
 from src.config.logging_config import get_service_logger
 
-router = APIRouter(prefix="/ontology", tags=["Ontology"])
+router = APIRouter(prefix="/ontology", tags=["Ontology"], default_response_class=OrjsonResponse)
 logger = get_service_logger("ontology_api")
 
+# Distinguishes ETags across restarts, since the ontology version starts from 0 again
+_ETAG_PREFIX = uuid4().hex[:8]
+
+# Serialized read-only aggregates: name -> (ontology version, body)
+_body_cache: Dict[str, Tuple[int, bytes]] = {}
+
+
+def _ontology_etag() -> str:
+    """ETag for responses derived only from the current ontology domains"""
+    return f'W/"{_ETAG_PREFIX}-{ontology_service.ontology_version}"'
+
+
+async def _cached_body(name: str, build: Callable[[], Awaitable[bytes]]) -> bytes:
+    """Get a serialized aggregate, rebuilding it only after the ontology changed"""
+    version = ontology_service.ontology_version
+    cached = _body_cache.get(name)
+    if cached and cached[0] == version:
+        return cached[1]
+    
+    body = await build()
+    _body_cache[name] = (version, body)
+    return body
+
+def _domain_cache_headers(updated_at: datetime) -> Dict[str, str]:
+    """ETag and Last-Modified for responses derived from a single domain"""
+    return {
+        "ETag": f'W/"{_ETAG_PREFIX}-{updated_at.timestamp()}"',
+        "Last-Modified": format_datetime(updated_at.replace(tzinfo=timezone.utc), usegmt=True)
+    }
+
+
+def _domain_not_modified(http_request: Request, headers: Dict[str, str], updated_at: datetime) -> bool:
+    """Check the client's validators; If-None-Match takes precedence over If-Modified-Since"""
+    if "if-none-match" in http_request.headers:
+        return not_modified(http_request, headers["ETag"])
+    
+    if_modified_since = http_request.headers.get("if-modified-since")
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole-second precision
+    return updated_at.replace(tzinfo=timezone.utc, microsecond=0) <= since
+
 class OntologyDomainResponse(BaseModel):
     """Ontology domain response model"""
     id: str
@@ -30,227 +84,238 @@ class OntologyDomainResponse(BaseModel):
     updated_at: datetime
     last_sync_at: Optional[datetime] = None
 
+@dataclass(slots=True)
+class OntologyDomainRow:
+    """Row of the domain listing; serialized directly by orjson, documented by OntologyDomainResponse"""
+    id: str
+    name: str
+    description: Optional[str]
+    entity_count: int
+    relationship_count: int
+    data_source_id: Optional[str]
+    database_name: Optional[str]
+    tags: List[str]
+    created_at: datetime
+    updated_at: datetime
+    last_sync_at: Optional[datetime]
+
+_ENTITY_LIST_ADAPTER = TypeAdapter(List[OntologyEntity])
+_RELATIONSHIP_LIST_ADAPTER = TypeAdapter(List[OntologyRelationship])
+
 class OntologySyncResponse(BaseModel):
     """Ontology sync response model"""
     success: bool
     message: str
     stats: Dict[str, Any] = {}
 
-@router.get("/stats", response_model=OntologyStats)
-async def get_ontology_stats():
+async def _build_stats() -> bytes:
+    stats = await ontology_service.get_ontology_stats()
+    logger.debug("Retrieved ontology stats: {} domains, {} entities", stats.total_domains, stats.total_entities)
+    return stats.model_dump_json().encode()
+
+@router.get("/stats", response_model=None, responses={200: {"model": OntologyStats}})
+@route_error_handler("Failed to get ontology statistics", log=logger)
+async def get_ontology_stats(http_request: Request):
     """Get ontology statistics"""
-    try:
-        logger.info("Getting ontology statistics")
-        
-        stats = await ontology_service.get_ontology_stats()
-        
-        logger.success(f"Retrieved ontology stats: {stats.total_domains} domains, {stats.total_entities} entities")
-        return stats
-        
-    except Exception as e:
-        logger.error(f"Failed to get ontology stats: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to get ontology statistics: {str(e)}")
-
-@router.get("/domains", response_model=List[OntologyDomainResponse])
-async def get_ontology_domains():
+    logger.debug("Getting ontology statistics")
+    
+    etag = _ontology_etag()
+    if not_modified(http_request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    content = await _cached_body("stats", _build_stats)
+    return Response(content=content, media_type="application/json", headers={"ETag": etag})
+
+async def _build_domain_list() -> bytes:
+    domains = await ontology_service.get_ontology_domains()
+    
+    # Domains come from the service already validated, so plain dataclass rows suffice
+    response = [
+        OntologyDomainRow(
+            id=domain.id,
+            name=domain.name,
+            description=domain.description,
+            entity_count=domain.entity_count,
+            relationship_count=domain.relationship_count,
+            data_source_id=domain.data_source_id,
+            database_name=domain.database_name,
+            tags=domain.tags,
+            created_at=domain.created_at,
+            updated_at=domain.updated_at,
+            last_sync_at=domain.last_sync_at
+        )
+        for domain in domains
+    ]
+    
+    logger.debug("Retrieved {} ontology domains", len(response))
+    # Serialize in one pass; skips FastAPI's response-model revalidation
+    return orjson.dumps(response)
+
+@router.get(
+    "/domains",
+    response_model=None,
+    responses={200: {"model": List[OntologyDomainResponse]}}
+)
+@route_error_handler("Failed to get ontology domains", log=logger)
+async def get_ontology_domains(http_request: Request):
     """Get all ontology domains"""
-    try:
-        logger.info("Getting all ontology domains")
-        
-        domains = await ontology_service.get_ontology_domains()
-        
-        # Convert to response format
-        response = []
-        for domain in domains:
-            response.append(OntologyDomainResponse(
-                id=domain.id,
-                name=domain.name,
-                description=domain.description,
-                entity_count=len(domain.entities),
-                relationship_count=len(domain.relationships),
-                data_source_id=domain.data_source_id,
-                database_name=domain.database_name,
-                tags=domain.tags,
-                created_at=domain.created_at,
-                updated_at=domain.updated_at,
-                last_sync_at=domain.last_sync_at
-            ))
-        
-        logger.success(f"Retrieved {len(response)} ontology domains")
-        return response
-        
-    except Exception as e:
-        logger.error(f"Failed to get ontology domains: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to get ontology domains: {str(e)}")
+    logger.debug("Getting all ontology domains")
+    
+    etag = _ontology_etag()
+    if not_modified(http_request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    content = await _cached_body("domains", _build_domain_list)
+    return Response(content=content, media_type="application/json", headers={"ETag": etag})
 
 @router.get("/domains/{domain_id}", response_model=OntologyDomain)
-async def get_ontology_domain(domain_id: str):
+@route_error_handler("Failed to get ontology domain", log=logger)
+async def get_ontology_domain(domain_id: str, http_request: Request, response: Response):
     """Get specific ontology domain with full details"""
-    try:
-        logger.info(f"Getting ontology domain: {domain_id}")
-        
-        domain = await ontology_service.get_ontology_domain(domain_id)
-        
-        if not domain:
-            raise HTTPException(status_code=404, detail="Ontology domain not found")
-        
-        logger.success(f"Retrieved ontology domain: {domain.name}")
-        return domain
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to get ontology domain {domain_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to get ontology domain: {str(e)}")
-
-@router.get("/domains/{domain_id}/visualization", response_model=OntologyVisualizationData)
-async def get_domain_visualization(domain_id: str):
+    logger.debug("Getting ontology domain: {}", domain_id)
+    
+    domain = await ontology_service.get_ontology_domain(domain_id)
+    
+    if not domain:
+        raise HTTPException(status_code=404, detail="Ontology domain not found")
+    
+    headers = _domain_cache_headers(domain.updated_at)
+    if _domain_not_modified(http_request, headers, domain.updated_at):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    
+    logger.debug("Retrieved ontology domain: {}", domain.name)
+    return domain
+
+@router.get(
+    "/domains/{domain_id}/visualization",
+    response_model=None,
+    responses={200: {"model": OntologyVisualizationData}}
+)
+@route_error_handler("Failed to get visualization data", log=logger)
+async def get_domain_visualization(domain_id: str, http_request: Request):
     """Get visualization data for a specific domain"""
-    try:
-        logger.info(f"Getting visualization data for domain: {domain_id}")
-        
-        viz_data = await ontology_service.get_visualization_data(domain_id)
-        
-        if not viz_data:
-            raise HTTPException(status_code=404, detail="Ontology domain not found or no visualization data available")
-        
-        logger.success(f"Retrieved visualization data: {len(viz_data.nodes)} nodes, {len(viz_data.edges)} edges")
-        return viz_data
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to get visualization data for {domain_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to get visualization data: {str(e)}")
+    logger.debug("Getting visualization data for domain: {}", domain_id)
+    
+    updated_at = await ontology_service.get_domain_updated_at(domain_id)
+    if updated_at is None:
+        raise HTTPException(status_code=404, detail="Ontology domain not found or no visualization data available")
+    
+    headers = _domain_cache_headers(updated_at)
+    if _domain_not_modified(http_request, headers, updated_at):
+        return Response(status_code=304, headers=headers)
+    
+    viz_data = await ontology_service.get_visualization_data(domain_id)
+    
+    if not viz_data:
+        raise HTTPException(status_code=404, detail="Ontology domain not found or no visualization data available")
+    
+    logger.debug("Retrieved visualization data: {} nodes, {} edges", len(viz_data.nodes), len(viz_data.edges))
+    
+    # Stream one node/edge at a time so large graphs start sending before they are fully encoded
+    def generate():
+        for key, items in ((b'{"nodes":[', viz_data.nodes), (b'],"edges":[', viz_data.edges)):
+            yield key
+            for i, item in enumerate(items):
+                yield (b"," if i else b"") + item.model_dump_json().encode()
+        yield b'],"layout":' + orjson.dumps(viz_data.layout) + b',"metadata":' + orjson.dumps(viz_data.metadata) + b"}"
+    
+    return StreamingResponse(generate(), media_type="application/json", headers=headers)
 
 @router.post("/sync", response_model=OntologySyncResponse)
+@route_error_handler("Ontology sync failed", log=logger)
 async def sync_ontology_from_catalog(data_source_id: Optional[str] = Query(None, description="Specific data source to sync")):
     """Sync ontology from catalog metadata"""
-    try:
-        logger.info(f"Starting ontology sync from catalog, data_source_id: {data_source_id}")
-        
-        result = await ontology_service.sync_from_catalog(data_source_id)
-        
-        response = OntologySyncResponse(
-            success=result["success"],
-            message=result["message"],
-            stats=result.get("stats", {})
-        )
-        
-        if result["success"]:
-            logger.success(f"Ontology sync completed: {result['stats']}")
-        else:
-            logger.warning(f"Ontology sync failed: {result['message']}")
-        
-        return response
-        
-    except Exception as e:
-        logger.error(f"Ontology sync error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Ontology sync failed: {str(e)}")
+    logger.info("Starting ontology sync from catalog, data_source_id: {}", data_source_id)
+    
+    result = await ontology_service.sync_from_catalog(data_source_id)
+    
+    response = OntologySyncResponse.model_construct(
+        success=result["success"],
+        message=result["message"],
+        stats=result.get("stats", {})
+    )
+    
+    if result["success"]:
+        logger.success("Ontology sync completed: {}", result['stats'])
+    else:
+        logger.warning("Ontology sync failed: {}", result['message'])
+    
+    return response
 
 @router.get("/domains/{domain_id}/entities")
-async def get_domain_entities(domain_id: str):
+@route_error_handler("Failed to get domain entities", log=logger)
+async def get_domain_entities(domain_id: str, http_request: Request):
     """Get entities for a specific domain"""
-    try:
-        logger.info(f"Getting entities for domain: {domain_id}")
-        
-        domain = await ontology_service.get_ontology_domain(domain_id)
-        
-        if not domain:
-            raise HTTPException(status_code=404, detail="Ontology domain not found")
-        
-        logger.success(f"Retrieved {len(domain.entities)} entities for domain {domain_id}")
-        return domain.entities
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to get entities for domain {domain_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to get domain entities: {str(e)}")
+    logger.debug("Getting entities for domain: {}", domain_id)
+    
+    updated_at = await ontology_service.get_domain_updated_at(domain_id)
+    if updated_at is None:
+        raise HTTPException(status_code=404, detail="Ontology domain not found")
+    
+    headers = _domain_cache_headers(updated_at)
+    if _domain_not_modified(http_request, headers, updated_at):
+        return Response(status_code=304, headers=headers)
+    
+    entities = await ontology_service.get_domain_entities(domain_id)
+    
+    if entities is None:
+        raise HTTPException(status_code=404, detail="Ontology domain not found")
+    
+    logger.debug("Retrieved {} entities for domain {}", len(entities), domain_id)
+    return Response(content=_ENTITY_LIST_ADAPTER.dump_json(entities), media_type="application/json", headers=headers)
 
 @router.get("/domains/{domain_id}/relationships")
-async def get_domain_relationships(domain_id: str):
+@route_error_handler("Failed to get domain relationships", log=logger)
+async def get_domain_relationships(domain_id: str, http_request: Request):
     """Get relationships for a specific domain"""
-    try:
-        logger.info(f"Getting relationships for domain: {domain_id}")
-        
-        domain = await ontology_service.get_ontology_domain(domain_id)
-        
-        if not domain:
-            raise HTTPException(status_code=404, detail="Ontology domain not found")
-        
-        logger.success(f"Retrieved {len(domain.relationships)} relationships for domain {domain_id}")
-        return domain.relationships
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to get relationships for domain {domain_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to get domain relationships: {str(e)}")
+    logger.debug("Getting relationships for domain: {}", domain_id)
+    
+    updated_at = await ontology_service.get_domain_updated_at(domain_id)
+    if updated_at is None:
+        raise HTTPException(status_code=404, detail="Ontology domain not found")
+    
+    headers = _domain_cache_headers(updated_at)
+    if _domain_not_modified(http_request, headers, updated_at):
+        return Response(status_code=304, headers=headers)
+    
+    relationships = await ontology_service.get_domain_relationships(domain_id)
+    
+    if relationships is None:
+        raise HTTPException(status_code=404, detail="Ontology domain not found")
+    
+    logger.debug("Retrieved {} relationships for domain {}", len(relationships), domain_id)
+    return Response(
+        content=_RELATIONSHIP_LIST_ADAPTER.dump_json(relationships),
+        media_type="application/json",
+        headers=headers
+    )
 
 @router.get("/search")
+@route_error_handler("Search failed", log=logger)
 async def search_ontology(
     q: str = Query(..., description="Search query"),
     domain_id: Optional[str] = Query(None, description="Domain to search in"),
-    entity_type: Optional[str] = Query(None, description="Entity type filter")
+    entity_type: Optional[str] = Query(None, description="Entity type filter"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of results"),
+    offset: int = Query(0, ge=0, description="Number of results to skip")
 ):
     """Search ontology entities and relationships"""
-    try:
-        logger.info(f"Searching ontology: query='{q}', domain_id={domain_id}, entity_type={entity_type}")
-        
-        domains = await ontology_service.get_ontology_domains()
-        
-        # Filter by domain if specified
-        if domain_id:
-            domains = [d for d in domains if d.id == domain_id]
-        
-        results = []
-        
-        for domain in domains:
-            # Search entities
-            for entity in domain.entities:
-                if (q.lower() in entity.name.lower() or 
-                    (entity.description and q.lower() in entity.description.lower())):
-                    
-                    if not entity_type or entity.type.value == entity_type:
-                        results.append({
-                            "type": "entity",
-                            "domain_id": domain.id,
-                            "domain_name": domain.name,
-                            "id": entity.id,
-                            "name": entity.name,
-                            "description": entity.description,
-                            "entity_type": entity.type.value,
-                            "source_table": entity.source_table,
-                            "row_count": entity.row_count
-                        })
-            
-            # Search relationships
-            for relationship in domain.relationships:
-                if (q.lower() in relationship.name.lower() or 
-                    (relationship.description and q.lower() in relationship.description.lower())):
-                    
-                    results.append({
-                        "type": "relationship",
-                        "domain_id": domain.id,
-                        "domain_name": domain.name,
-                        "id": relationship.id,
-                        "name": relationship.name,
-                        "description": relationship.description,
-                        "relationship_type": relationship.type.value,
-                        "cardinality": relationship.cardinality
-                    })
-        
-        logger.success(f"Found {len(results)} search results for query '{q}'")
-        return {
-            "query": q,
-            "results": results,
-            "total": len(results)
-        }
-        
-    except Exception as e:
-        logger.error(f"Search failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+    logger.debug("Searching ontology: query='{}', domain_id={}, entity_type={}", q, domain_id, entity_type)
+    
+    results = await ontology_service.search(
+        q, domain_id=domain_id, entity_type=entity_type, limit=limit, offset=offset
+    )
+    
+    logger.debug("Found {} search results for query '{}'", len(results), q)
+    content = orjson.dumps({
+        "query": q,
+        "results": results,
+        "total": len(results),
+        "limit": limit,
+        "offset": offset
+    })
+    return Response(content=content, media_type="application/json")
 
 # === AI SUGGESTIONS API ENDPOINTS ===
 
@@ -277,148 +342,196 @@ class EntityUpdateRequest(BaseModel):
     description: Optional[str] = Field(None, description="Entity description")
     properties: Optional[List[str]] = Field(None, description="Entity properties")
 
-@router.post("/domains/{domain_id}/entities")
-async def add_entity_to_domain(domain_id: str, entity_request: AddEntityRequest):
+class AddEntityBatchRequest(BaseModel):
+    """Request model for adding several entities at once"""
+    entities: List[AddEntityRequest] = Field(..., description="Entities to add")
+
+class AddRelationshipBatchRequest(BaseModel):
+    """Request model for adding several relationships at once"""
+    relationships: List[AddRelationshipRequest] = Field(..., description="Relationships to add")
+
+@router.post("/domains/{domain_id}/entities", openapi_extra=json_body_openapi(AddEntityRequest))
+@route_error_handler("Failed to add entity", log=logger)
+async def add_entity_to_domain(domain_id: str, entity_request: AddEntityRequest = json_body(AddEntityRequest)):
     """Add a new entity to a domain"""
-    try:
-        logger.info(f"Adding entity '{entity_request.name}' to domain {domain_id}")
-        
-        result = await ontology_service.add_entity_to_domain(
-            domain_id=domain_id,
-            entity_name=entity_request.name,
-            entity_description=entity_request.description,
-            entity_properties=entity_request.properties,
-            entity_type=entity_request.entity_type,
-            is_ai_suggested=entity_request.is_ai_suggested
-        )
-        
-        if result["success"]:
-            logger.success(f"Entity '{entity_request.name}' added successfully to domain {domain_id}")
-            return {
-                "success": True,
-                "message": f"Entity '{entity_request.name}' added successfully",
-                "entity_id": result.get("entity_id"),
-                "stats": result.get("stats", {})
-            }
-        else:
-            logger.warning(f"Failed to add entity: {result['message']}")
-            raise HTTPException(status_code=400, detail=result["message"])
-            
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to add entity to domain {domain_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to add entity: {str(e)}")
-
-@router.put("/domains/{domain_id}/entities/{entity_id}")
-async def update_entity(domain_id: str, entity_id: str, update_request: EntityUpdateRequest):
+    logger.info("Adding entity '{}' to domain {}", entity_request.name, domain_id)
+    
+    result = await ontology_service.add_entity_to_domain(
+        domain_id=domain_id,
+        entity_name=entity_request.name,
+        entity_description=entity_request.description,
+        entity_properties=entity_request.properties,
+        entity_type=entity_request.entity_type,
+        is_ai_suggested=entity_request.is_ai_suggested
+    )
+    
+    if result["success"]:
+        logger.success("Entity '{}' added successfully to domain {}", entity_request.name, domain_id)
+        return {
+            "success": True,
+            "message": f"Entity '{entity_request.name}' added successfully",
+            "entity_id": result.get("entity_id"),
+            "stats": result.get("stats", {})
+        }
+    else:
+        logger.warning("Failed to add entity: {}", result['message'])
+        raise HTTPException(status_code=400, detail=result["message"])
+
+@router.post("/domains/{domain_id}/entities:batch", openapi_extra=json_body_openapi(AddEntityBatchRequest))
+@route_error_handler("Failed to add entities", log=logger)
+async def add_entities_to_domain(
+    domain_id: str,
+    batch_request: AddEntityBatchRequest = json_body(AddEntityBatchRequest)
+):
+    """Add several entities to a domain; nothing is added if any entity is rejected"""
+    logger.info("Adding {} entities to domain {}", len(batch_request.entities), domain_id)
+    
+    result = await ontology_service.add_entities_to_domain(domain_id, [
+        {
+            "entity_name": entity.name,
+            "entity_description": entity.description,
+            "entity_properties": entity.properties,
+            "entity_type": entity.entity_type,
+            "is_ai_suggested": entity.is_ai_suggested
+        }
+        for entity in batch_request.entities
+    ])
+    
+    if result["success"]:
+        return {
+            "success": True,
+            "message": result["message"],
+            "entity_ids": result["entity_ids"],
+            "stats": result.get("stats", {})
+        }
+    else:
+        logger.warning("Failed to add entities: {}", result['message'])
+        raise HTTPException(status_code=400, detail=result["message"])
+
+@router.put("/domains/{domain_id}/entities/{entity_id}", openapi_extra=json_body_openapi(EntityUpdateRequest))
+@route_error_handler("Failed to update entity", log=logger)
+async def update_entity(
+    domain_id: str,
+    entity_id: str,
+    update_request: EntityUpdateRequest = json_body(EntityUpdateRequest)
+):
     """Update an existing entity"""
-    try:
-        logger.info(f"Updating entity {entity_id} in domain {domain_id}")
-        
-        result = await ontology_service.update_entity(
-            domain_id=domain_id,
-            entity_id=entity_id,
-            updates=update_request.dict(exclude_none=True)
-        )
-        
-        if result["success"]:
-            logger.success(f"Entity {entity_id} updated successfully")
-            return {
-                "success": True,
-                "message": "Entity updated successfully",
-                "stats": result.get("stats", {})
-            }
-        else:
-            logger.warning(f"Failed to update entity: {result['message']}")
-            raise HTTPException(status_code=400, detail=result["message"])
-            
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to update entity {entity_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to update entity: {str(e)}")
-
-@router.post("/domains/{domain_id}/relationships")
-async def add_relationship_to_domain(domain_id: str, relationship_request: AddRelationshipRequest):
+    logger.info("Updating entity {} in domain {}", entity_id, domain_id)
+    
+    result = await ontology_service.update_entity(
+        domain_id=domain_id,
+        entity_id=entity_id,
+        updates=update_request.dict(exclude_none=True)
+    )
+    
+    if result["success"]:
+        logger.success("Entity {} updated successfully", entity_id)
+        return {
+            "success": True,
+            "message": "Entity updated successfully",
+            "stats": result.get("stats", {})
+        }
+    else:
+        logger.warning("Failed to update entity: {}", result['message'])
+        raise HTTPException(status_code=400, detail=result["message"])
+
+@router.post("/domains/{domain_id}/relationships", openapi_extra=json_body_openapi(AddRelationshipRequest))
+@route_error_handler("Failed to add relationship", log=logger)
+async def add_relationship_to_domain(
+    domain_id: str,
+    relationship_request: AddRelationshipRequest = json_body(AddRelationshipRequest)
+):
     """Add a new relationship to a domain"""
-    try:
-        logger.info(f"Adding relationship '{relationship_request.name}' to domain {domain_id}")
-        
-        result = await ontology_service.add_relationship_to_domain(
-            domain_id=domain_id,
-            relationship_name=relationship_request.name,
-            relationship_description=relationship_request.description,
-            source_entity_id=relationship_request.source_entity_id,
-            target_entity_id=relationship_request.target_entity_id,
-            cardinality=relationship_request.cardinality,
-            is_ai_suggested=relationship_request.is_ai_suggested
-        )
-        
-        if result["success"]:
-            logger.success(f"Relationship '{relationship_request.name}' added successfully to domain {domain_id}")
-            return {
-                "success": True,
-                "message": f"Relationship '{relationship_request.name}' added successfully",
-                "relationship_id": result.get("relationship_id"),
-                "stats": result.get("stats", {})
-            }
-        else:
-            logger.warning(f"Failed to add relationship: {result['message']}")
-            raise HTTPException(status_code=400, detail=result["message"])
-            
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to add relationship to domain {domain_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to add relationship: {str(e)}")
+    logger.info("Adding relationship '{}' to domain {}", relationship_request.name, domain_id)
+    
+    result = await ontology_service.add_relationship_to_domain(
+        domain_id=domain_id,
+        relationship_name=relationship_request.name,
+        relationship_description=relationship_request.description,
+        source_entity_id=relationship_request.source_entity_id,
+        target_entity_id=relationship_request.target_entity_id,
+        cardinality=relationship_request.cardinality,
+        is_ai_suggested=relationship_request.is_ai_suggested
+    )
+    
+    if result["success"]:
+        logger.success("Relationship '{}' added successfully to domain {}", relationship_request.name, domain_id)
+        return {
+            "success": True,
+            "message": f"Relationship '{relationship_request.name}' added successfully",
+            "relationship_id": result.get("relationship_id"),
+            "stats": result.get("stats", {})
+        }
+    else:
+        logger.warning("Failed to add relationship: {}", result['message'])
+        raise HTTPException(status_code=400, detail=result["message"])
+
+@router.post("/domains/{domain_id}/relationships:batch", openapi_extra=json_body_openapi(AddRelationshipBatchRequest))
+@route_error_handler("Failed to add relationships", log=logger)
+async def add_relationships_to_domain(
+    domain_id: str,
+    batch_request: AddRelationshipBatchRequest = json_body(AddRelationshipBatchRequest)
+):
+    """Add several relationships to a domain; nothing is added if any relationship is rejected"""
+    logger.info("Adding {} relationships to domain {}", len(batch_request.relationships), domain_id)
+    
+    result = await ontology_service.add_relationships_to_domain(domain_id, [
+        {
+            "relationship_name": relationship.name,
+            "relationship_description": relationship.description,
+            "source_entity_id": relationship.source_entity_id,
+            "target_entity_id": relationship.target_entity_id,
+            "cardinality": relationship.cardinality,
+            "is_ai_suggested": relationship.is_ai_suggested
+        }
+        for relationship in batch_request.relationships
+    ])
+    
+    if result["success"]:
+        return {
+            "success": True,
+            "message": result["message"],
+            "relationship_ids": result["relationship_ids"],
+            "stats": result.get("stats", {})
+        }
+    else:
+        logger.warning("Failed to add relationships: {}", result['message'])
+        raise HTTPException(status_code=400, detail=result["message"])
 
 @router.delete("/domains/{domain_id}/entities/{entity_id}")
+@route_error_handler("Failed to delete entity", log=logger)
 async def delete_entity(domain_id: str, entity_id: str):
     """Delete an entity from a domain"""
-    try:
-        logger.info(f"Deleting entity {entity_id} from domain {domain_id}")
-        
-        result = await ontology_service.delete_entity(domain_id, entity_id)
-        
-        if result["success"]:
-            logger.success(f"Entity {entity_id} deleted successfully")
-            return {
-                "success": True,
-                "message": "Entity deleted successfully",
-                "stats": result.get("stats", {})
-            }
-        else:
-            logger.warning(f"Failed to delete entity: {result['message']}")
-            raise HTTPException(status_code=400, detail=result["message"])
-            
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to delete entity {entity_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to delete entity: {str(e)}")
+    logger.info("Deleting entity {} from domain {}", entity_id, domain_id)
+    
+    result = await ontology_service.delete_entity(domain_id, entity_id)
+    
+    if result["success"]:
+        logger.success("Entity {} deleted successfully", entity_id)
+        return {
+            "success": True,
+            "message": "Entity deleted successfully",
+            "stats": result.get("stats", {})
+        }
+    else:
+        logger.warning("Failed to delete entity: {}", result['message'])
+        raise HTTPException(status_code=400, detail=result["message"])
 
 @router.delete("/domains/{domain_id}/relationships/{relationship_id}")
+@route_error_handler("Failed to delete relationship", log=logger)
 async def delete_relationship(domain_id: str, relationship_id: str):
     """Delete a relationship from a domain"""
-    try:
-        logger.info(f"Deleting relationship {relationship_id} from domain {domain_id}")
-        
-        result = await ontology_service.delete_relationship(domain_id, relationship_id)
-        
-        if result["success"]:
-            logger.success(f"Relationship {relationship_id} deleted successfully")
-            return {
-                "success": True,
-                "message": "Relationship deleted successfully",
-                "stats": result.get("stats", {})
-            }
-        else:
-            logger.warning(f"Failed to delete relationship: {result['message']}")
-            raise HTTPException(status_code=400, detail=result["message"])
-            
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to delete relationship {relationship_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to delete relationship: {str(e)}") 
\ No newline at end of file
+    logger.info("Deleting relationship {} from domain {}", relationship_id, domain_id)
+    
+    result = await ontology_service.delete_relationship(domain_id, relationship_id)
+    
+    if result["success"]:
+        logger.success("Relationship {} deleted successfully", relationship_id)
+        return {
+            "success": True,
+            "message": "Relationship deleted successfully",
+            "stats": result.get("stats", {})
+        }
+    else:
+        logger.warning("Failed to delete relationship: {}", result['message'])
+        raise HTTPException(status_code=400, detail=result["message"])
\ No newline at end of file
@@ -2,15 +2,60 @@
 System status and health check API endpoints
 """
 
-from fastapi import APIRouter, Depends
+import asyncio
+import hashlib
+import time
+from typing import Awaitable, Callable, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Request, Response
 from loguru import logger
 
+from src.api.common import OrjsonResponse, not_modified
 from src.config import get_settings, Settings
 from src.models.schemas import SystemStatusResponse
 from src.services.minio_service import MinioService
 from src.services.ollama_service import OllamaService
 
-router = APIRouter(prefix="/system", tags=["system"])
+router = APIRouter(prefix="/system", tags=["system"], default_response_class=OrjsonResponse)
+
+# /status probes external services; pollers share one result for a few seconds
+STATUS_CACHE_TTL = 5
+_status_cache: Optional[Tuple[float, bytes, str]] = None  # (expires at, body, ETag)
+
+# Created on first status check and reused, so each probe does not open a new client
+_minio_service: Optional[MinioService] = None
+_ollama_service: Optional[OllamaService] = None
+
+
+def _get_minio_service(settings: Settings) -> MinioService:
+    global _minio_service
+    if _minio_service is None:
+        _minio_service = MinioService(settings)
+    return _minio_service
+
+
+def _get_ollama_service(settings: Settings) -> OllamaService:
+    global _ollama_service
+    if _ollama_service is None:
+        _ollama_service = OllamaService(settings)
+    return _ollama_service
+
+
+async def close_status_clients():
+    """Close the clients held for system status checks"""
+    global _ollama_service
+    if _ollama_service is not None:
+        await _ollama_service.close()
+        _ollama_service = None
+
+
+async def _safe_check(name: str, check: Callable[[], Awaitable[bool]]) -> bool:
+    """Run one health check, treating any error as unhealthy"""
+    try:
+        return await check()
+    except Exception as e:
+        logger.warning("{} health check failed: {}", name, e)
+        return False
 
 
 @router.get("/health")
@@ -19,42 +64,43 @@ async def health_check():
     return {"status": "healthy", "message": "API server is running"}
 
 
-@router.get("/status", response_model=SystemStatusResponse)
-async def get_system_status(settings: Settings = Depends(get_settings)):
+@router.get("/status", response_model=None, responses={200: {"model": SystemStatusResponse}})
+async def get_system_status(http_request: Request, settings: Settings = Depends(get_settings)):
     """Get comprehensive system status"""
-    logger.info("Checking system status")
+    global _status_cache
     
-    status = SystemStatusResponse()
+    now = time.monotonic()
+    if _status_cache is None or _status_cache[0] <= now:
+        body = (await _check_system_status(settings)).model_dump_json().encode()
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        _status_cache = (now + STATUS_CACHE_TTL, body, etag)
     
-    # Check MinIO connection
-    try:
-        minio_service = MinioService(settings)
-        status.minio = await minio_service.health_check()
-    except Exception as e:
-        logger.warning(f"MinIO health check failed: {e}")
-        status.minio = False
+    _, body, etag = _status_cache
+    headers = {"ETag": etag, "Cache-Control": f"max-age={STATUS_CACHE_TTL}"}
+    if not_modified(http_request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def _check_system_status(settings: Settings) -> SystemStatusResponse:
+    """Probe every backend service"""
+    logger.debug("Checking system status")
     
-    # Check Unity Catalog connection
-    try:
-        # This will be implemented when Unity Catalog service is ready
-        status.unity_catalog = False  # await check_unity_catalog_connection(settings)
-    except Exception as e:
-        logger.warning(f"Unity Catalog health check failed: {e}")
-        status.unity_catalog = False
+    status = SystemStatusResponse()
     
-    # Check Ollama connection
-    try:
-        ollama_service = OllamaService(settings)
-        status.ollama = await ollama_service.health_check()
-        await ollama_service.close()
-    except Exception as e:
-        logger.warning(f"Ollama health check failed: {e}")
-        status.ollama = False
+    # Probe backends concurrently so the check takes as long as the slowest one
+    status.minio, status.ollama = await asyncio.gather(
+        _safe_check("MinIO", lambda: _get_minio_service(settings).health_check()),
+        _safe_check("Ollama", lambda: _get_ollama_service(settings).health_check())
+    )
+    
+    # This will be implemented when Unity Catalog service is ready
+    status.unity_catalog = False  # await check_unity_catalog_connection(settings)
     
     # Database is always available for SQLite
     status.database = True
     
-    logger.info(f"System status check completed: {status.model_dump()}")
+    logger.opt(lazy=True).debug("System status check completed: {}", lambda: status.model_dump())
     return status
 
 
@@ -4,14 +4,118 @@ Supports multiple LLM providers including OpenAI, Claude, AWS Bedrock, Ollama, a
 """
 
 import os
+import sys
+import http.client
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, Optional, Any, List
-from pydantic import BaseModel, Field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Set, Tuple, Union
+from urllib.parse import urlsplit
+import orjson
+from pydantic import Field, PrivateAttr
 from pydantic_settings import BaseSettings
-import aiohttp
-import asyncio
 import logging
-import requests
+
+if TYPE_CHECKING:
+    import httpx
+
+
+# Last successful Ollama /api/tags response, reused across process starts
+OLLAMA_TAGS_CACHE = os.path.join("logs", ".ollama_tags.json")
+OLLAMA_TAGS_MAX_AGE = 600  # seconds before the cached tags are refreshed in the background
+
+
+def _ollama_keep_alive() -> Union[int, str]:
+    """keep_alive sent with Ollama requests, from OLLAMA_KEEP_ALIVE (seconds or a duration like "30m")"""
+    value = os.getenv("OLLAMA_KEEP_ALIVE", "-1")
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+# -1 keeps models loaded instead of Ollama's default 5 minute unload
+OLLAMA_KEEP_ALIVE = _ollama_keep_alive()
+
+
+def _ollama_request(
+    base_url: str,
+    method: str,
+    path: str,
+    body: Optional[bytes] = None,
+    timeout: float = 2.0
+) -> Tuple[int, bytes]:
+    """Send one request to Ollama with the standard library, returning (status, body)"""
+    url = urlsplit(base_url)
+    connection_class = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+    conn = connection_class(url.hostname, url.port, timeout=timeout)
+    try:
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        conn.request(method, f"{url.path.rstrip('/')}{path}", body=body, headers=headers)
+        response = conn.getresponse()
+        return response.status, response.read()
+    finally:
+        conn.close()
+
+
+def _get_ollama_tags(base_url: str, timeout: float = 2.0) -> Tuple[int, bytes]:
+    """GET /api/tags, returning (status, body)"""
+    return _ollama_request(base_url, "GET", "/api/tags", timeout=timeout)
+
+
+# Keep-alive async client shared by every Ollama request, created on first use
+_async_client: Optional["httpx.AsyncClient"] = None
+
+
+def _get_async_client() -> "httpx.AsyncClient":
+    global _async_client
+    if _async_client is None:
+        import httpx
+        _async_client = httpx.AsyncClient(timeout=30.0)
+    return _async_client
+
+
+async def close_http_clients():
+    """Close the shared Ollama HTTP client"""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+def _load_cached_tags(path: str, max_age_s: float = OLLAMA_TAGS_MAX_AGE) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """Read cached /api/tags data, returning (data, fresh); data is None when there is no usable cache"""
+    try:
+        age = time.time() - os.path.getmtime(path)
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
+    except (OSError, ValueError):
+        return None, False
+    return data, age < max_age_s
+
+
+def _write_cached_tags(path: str, data: Dict[str, Any]) -> None:
+    """Persist /api/tags data, replacing the previous cache atomically"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(data))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logging.warning(f"Could not write Ollama tags cache: {e}")
+
+
+# Environment variable names shared by every model of a provider
+_OPENAI_ENV = sys.intern("OPENAI_API_KEY")
+_ANTHROPIC_ENV = sys.intern("ANTHROPIC_API_KEY")
+_GOOGLE_ENV = sys.intern("GOOGLE_API_KEY")
+_COHERE_ENV = sys.intern("COHERE_API_KEY")
+_OLLAMA_ENV = sys.intern("OLLAMA_BASE_URL")
+_VLLM_ENV = sys.intern("VLLM_BASE_URL")
 
 
 class LLMProvider(str, Enum):
@@ -26,14 +130,15 @@ class LLMProvider(str, Enum):
     GOOGLE = "google"
 
 
-class LLMModelConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class LLMModelConfig:
     """Configuration for a specific LLM model"""
     provider: LLMProvider
     model_name: str
     display_name: str
     api_key_env_var: Optional[str] = None
     api_base_env_var: Optional[str] = None
-    additional_params: Dict[str, Any] = Field(default_factory=dict)
+    additional_params: Mapping[str, Any] = field(default_factory=dict)
     max_tokens: Optional[int] = None
     temperature: float = 0.1
     supports_streaming: bool = True
@@ -63,230 +168,326 @@ class LLMConfig(BaseSettings):
     # Ollama configuration
     ollama_base_url: str = Field(default="http://localhost:11434", env="OLLAMA_BASE_URL")
     
+    # Load the default Ollama model into memory at startup so the first request skips the cold start
+    preload_default: bool = False
+    
     # vLLM configuration
     vllm_base_url: Optional[str] = Field(default=None, env="VLLM_BASE_URL")
     
+    # Set once the Ollama tags have been fetched; discovery is deferred until models are looked up
+    _ollama_loaded: bool = False
+    _models_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    # Providers whose default models have been registered; each is built on first lookup
+    _loaded_providers: Set[LLMProvider] = PrivateAttr(default_factory=set)
+    # available_models grouped by provider, kept in step with every write
+    _by_provider: Dict[LLMProvider, Dict[str, LLMModelConfig]] = PrivateAttr(default_factory=lambda: defaultdict(dict))
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
     
     def model_post_init(self, __context: Any) -> None:
         """Initialize available models after settings are loaded"""
-        if not self.available_models:
-            self.available_models = self._get_default_models()
+        if self.available_models:
+            models = self.available_models
+            self.available_models = {}
+            for key, config in models.items():
+                self._add_model(key, config)
+            # Explicitly configured models replace the defaults
+            self._loaded_providers.update(self._default_model_builders())
             
-        # Try to load Ollama models synchronously on initialization
-        if self.is_ollama_available():
-            try:
-                import requests
-                # Use synchronous requests for initialization
-                response = requests.get(f"{self.ollama_base_url}/api/tags", timeout=5)
-                if response.status_code == 200:
-                    data = response.json()
-                    models = [model["name"] for model in data.get("models", [])]
-                    
-                    # Update available models with real Ollama models
-                    for model_name in models:
-                        # Clean model name for key
-                        clean_name = model_name.split(":")[0]  # Remove tag like ":latest"
-                        key = f"ollama-{clean_name}"
-                        
-                        self.available_models[key] = LLMModelConfig(
-                            provider=LLMProvider.OLLAMA,
-                            model_name=model_name,
-                            display_name=f"{clean_name.title()} (Ollama)",
-                            api_base_env_var="OLLAMA_BASE_URL",
-                            max_tokens=4096
-                        )
-                    
-                    model_keys = [f'ollama-{m.split(":")[0]}' for m in models]
-                    print(f"Loaded {len(models)} Ollama models: {model_keys}")
-                    
-            except Exception as e:
-                logging.warning(f"Could not load Ollama models on initialization: {e}")
-    
-    def _get_default_models(self) -> Dict[str, LLMModelConfig]:
-        """Get default model configurations"""
-        models = {}
-        
-        # OpenAI models
-        if self.openai_api_key:
-            models.update({
-                "gpt-4o": LLMModelConfig(
-                    provider=LLMProvider.OPENAI,
-                    model_name="gpt-4o",
-                    display_name="GPT-4o (OpenAI)",
-                    api_key_env_var="OPENAI_API_KEY",
-                    max_tokens=4096,
-                    supports_json_mode=True
-                ),
-                "gpt-4o-mini": LLMModelConfig(
-                    provider=LLMProvider.OPENAI,
-                    model_name="gpt-4o-mini",
-                    display_name="GPT-4o Mini (OpenAI)",
-                    api_key_env_var="OPENAI_API_KEY",
-                    max_tokens=4096,
-                    supports_json_mode=True
-                ),
-                "gpt-3.5-turbo": LLMModelConfig(
-                    provider=LLMProvider.OPENAI,
-                    model_name="gpt-3.5-turbo",
-                    display_name="GPT-3.5 Turbo (OpenAI)",
-                    api_key_env_var="OPENAI_API_KEY",
-                    max_tokens=4096,
-                    supports_json_mode=True
-                )
-            })
+        self._ollama_loaded = False
         
-        # Anthropic models
-        if self.anthropic_api_key:
-            models.update({
-                "claude-3-5-sonnet-20241022": LLMModelConfig(
-                    provider=LLMProvider.ANTHROPIC,
-                    model_name="claude-3-5-sonnet-20241022",
-                    display_name="Claude 3.5 Sonnet (Anthropic)",
-                    api_key_env_var="ANTHROPIC_API_KEY",
-                    max_tokens=4096
-                ),
-                "claude-3-5-haiku-20241022": LLMModelConfig(
-                    provider=LLMProvider.ANTHROPIC,
-                    model_name="claude-3-5-haiku-20241022",
-                    display_name="Claude 3.5 Haiku (Anthropic)",
-                    api_key_env_var="ANTHROPIC_API_KEY",
-                    max_tokens=4096
-                )
-            })
+        if self.preload_default and self.default_provider == LLMProvider.OLLAMA:
+            self.preload_default_ollama()
+    
+    def preload_default_ollama(self) -> None:
+        """Warm the default Ollama model in the background with an empty-prompt generate"""
+        config = self.available_models.get(self.default_model)
+        model_name = config.model_name if config else self.default_model.removeprefix("ollama-")
+        body = orjson.dumps({"model": model_name, "prompt": "", "keep_alive": OLLAMA_KEEP_ALIVE})
         
-        # AWS Bedrock models
-        if self.aws_access_key_id and self.aws_secret_access_key:
-            models.update({
-                "bedrock-claude-3-5-sonnet": LLMModelConfig(
-                    provider=LLMProvider.AWS_BEDROCK,
-                    model_name="anthropic.claude-3-5-sonnet-20241022-v2:0",
-                    display_name="Claude 3.5 Sonnet (AWS Bedrock)",
-                    additional_params={"region": self.aws_region},
-                    max_tokens=4096
-                ),
-                "bedrock-claude-3-haiku": LLMModelConfig(
-                    provider=LLMProvider.AWS_BEDROCK,
-                    model_name="anthropic.claude-3-haiku-20240307-v1:0",
-                    display_name="Claude 3 Haiku (AWS Bedrock)",
-                    additional_params={"region": self.aws_region},
-                    max_tokens=4096
-                )
-            })
+        def preload():
+            try:
+                status, _ = _ollama_request(self.ollama_base_url, "POST", "/api/generate", body, timeout=300)
+                if status != 200:
+                    logging.warning(f"Failed to preload Ollama model {model_name}: HTTP {status}")
+            except Exception as e:
+                logging.warning(f"Could not preload Ollama model {model_name}: {e}")
         
-        # Google models
-        if self.google_api_key:
-            models.update({
-                "gemini-1.5-pro": LLMModelConfig(
-                    provider=LLMProvider.GOOGLE,
-                    model_name="gemini-1.5-pro",
-                    display_name="Gemini 1.5 Pro (Google)",
-                    api_key_env_var="GOOGLE_API_KEY",
-                    max_tokens=4096
-                ),
-                "gemini-1.5-flash": LLMModelConfig(
-                    provider=LLMProvider.GOOGLE,
-                    model_name="gemini-1.5-flash",
-                    display_name="Gemini 1.5 Flash (Google)",
-                    api_key_env_var="GOOGLE_API_KEY",
-                    max_tokens=4096
-                )
-            })
+        threading.Thread(target=preload, daemon=True).start()
+    
+    def _add_model(self, key: str, config: LLMModelConfig) -> None:
+        """Register a model in available_models and its provider group"""
+        self.available_models[key] = config
+        self._by_provider[config.provider][key] = config
+    
+    def _ensure_provider_loaded(self, provider: LLMProvider) -> None:
+        """Register the default models of provider on first lookup"""
+        if provider in self._loaded_providers:
+            return
+        builder = self._default_model_builders().get(provider)
+        self._register_provider_models(provider, builder() if builder is not None else {})
+    
+    def _register_provider_models(self, provider: LLMProvider, models: Dict[str, LLMModelConfig]) -> None:
+        """Register the default models built for provider unless another caller got there first"""
+        with self._models_lock:
+            if provider in self._loaded_providers:
+                return
+            for key, config in models.items():
+                self._add_model(key, config)
+            self._loaded_providers.add(provider)
+    
+    def _ensure_models_loaded(self) -> None:
+        """Register the default models of every provider and discover the Ollama models"""
+        builders = {
+            provider: builder for provider, builder in self._default_model_builders().items()
+            if provider not in self._loaded_providers
+        }
+        if not builders:
+            self._ensure_ollama_loaded()
+            return
         
-        # Cohere models
-        if self.cohere_api_key:
-            models.update({
-                "command-r-plus": LLMModelConfig(
-                    provider=LLMProvider.COHERE,
-                    model_name="command-r-plus",
-                    display_name="Command R+ (Cohere)",
-                    api_key_env_var="COHERE_API_KEY",
-                    max_tokens=4096
-                ),
-                "command-r": LLMModelConfig(
-                    provider=LLMProvider.COHERE,
-                    model_name="command-r",
-                    display_name="Command R (Cohere)",
-                    api_key_env_var="COHERE_API_KEY",
-                    max_tokens=4096
-                )
-            })
+        # Builders may probe provider APIs, so run them side by side with Ollama discovery;
+        # results are registered in builder order to keep available_models ordering stable
+        with ThreadPoolExecutor(max_workers=len(builders) + 1) as executor:
+            ollama = executor.submit(self._ensure_ollama_loaded)
+            futures = {provider: executor.submit(builder) for provider, builder in builders.items()}
+            for provider, future in futures.items():
+                self._register_provider_models(provider, future.result())
+            ollama.result()
+    
+    def _ensure_ollama_loaded(self) -> None:
+        """Load the Ollama models on first lookup
         
-        # Ollama models (local) - Start with empty and will be populated dynamically
-        # models.update({
-        #     "ollama-llama3.1": LLMModelConfig(
-        #         provider=LLMProvider.OLLAMA,
-        #         model_name="llama3.1",
-        #         display_name="Llama 3.1 (Ollama)",
-        #         api_base_env_var="OLLAMA_BASE_URL",
-        #         max_tokens=4096
-        #     ),
-        #     "ollama-llama3.2": LLMModelConfig(
-        #         provider=LLMProvider.OLLAMA,
-        #         model_name="llama3.2",
-        #         display_name="Llama 3.2 (Ollama)",
-        #         api_base_env_var="OLLAMA_BASE_URL",
-        #         max_tokens=4096
-        #     ),
-        #     "ollama-mistral": LLMModelConfig(
-        #         provider=LLMProvider.OLLAMA,
-        #         model_name="mistral",
-        #         display_name="Mistral (Ollama)",
-        #         api_base_env_var="OLLAMA_BASE_URL",
-        #         max_tokens=4096
-        #     ),
-        #     "ollama-codellama": LLMModelConfig(
-        #         provider=LLMProvider.OLLAMA,
-        #         model_name="codellama",
-        #         display_name="Code Llama (Ollama)",
-        #         api_base_env_var="OLLAMA_BASE_URL",
-        #         max_tokens=4096
-        #     )
-        # })
+        Cached tags are served straight from disk and refreshed in the background
+        once stale; only a cold start without a cache waits on Ollama.
+        """
+        if self._ollama_loaded:
+            return
+        self._ollama_loaded = True
         
-        # vLLM models
-        if self.vllm_base_url:
-            models.update({
-                "vllm-custom": LLMModelConfig(
-                    provider=LLMProvider.VLLM,
-                    model_name="custom-model",
-                    display_name="Custom Model (vLLM)",
-                    api_base_env_var="VLLM_BASE_URL",
-                    max_tokens=4096
-                )
-            })
+        data, fresh = _load_cached_tags(OLLAMA_TAGS_CACHE)
+        if data is None:
+            self._refresh_ollama_tags()
+            return
         
-        return models
+        self.set_ollama_models([model["name"] for model in data.get("models", [])])
+        if not fresh:
+            threading.Thread(target=self._refresh_ollama_tags, daemon=True).start()
+    
+    def _refresh_ollama_tags(self) -> None:
+        """Fetch /api/tags from Ollama, then update the models and the disk cache"""
+        try:
+            # The tags response doubles as the availability check
+            status, body = _get_ollama_tags(self.ollama_base_url)
+            if status == 200:
+                data = orjson.loads(body)
+                models = [model["name"] for model in data.get("models", [])]
+                
+                self.set_ollama_models(models)
+                _write_cached_tags(OLLAMA_TAGS_CACHE, data)
+                logging.debug("Loaded %d Ollama models: %s", len(models), models)
+                
+        except Exception as e:
+            logging.warning(f"Could not load Ollama models: {e}")
+    
+    def set_ollama_models(self, models: List[str]) -> None:
+        """Replace the Ollama entries in available_models with models"""
+        with self._models_lock:
+            ollama_models = dict(map(self._make_ollama_model_config, models))
+            available_models = {
+                k: v for k, v in self.available_models.items()
+                if v.provider != LLMProvider.OLLAMA
+            }
+            available_models.update(ollama_models)
+            
+            # Swap in new dicts so concurrent readers never see a partial update
+            self.available_models = available_models
+            self._by_provider[LLMProvider.OLLAMA] = ollama_models
+    
+    @staticmethod
+    def _make_ollama_model_config(model_name: str) -> Tuple[str, LLMModelConfig]:
+        """Build the available_models key and configuration for an Ollama model"""
+        clean_name = model_name.partition(":")[0]  # Remove tag like ":latest"
+        return f"ollama-{clean_name}", LLMModelConfig(
+            provider=LLMProvider.OLLAMA,
+            model_name=model_name,
+            display_name=f"{clean_name.title()} (Ollama)",
+            api_base_env_var=_OLLAMA_ENV,
+            additional_params={"keep_alive": OLLAMA_KEEP_ALIVE},
+            max_tokens=4096
+        )
+    
+    def _default_model_builders(self) -> Dict[LLMProvider, Callable[[], Dict[str, LLMModelConfig]]]:
+        """Get the builder of default model configurations for each provider"""
+        return {
+            LLMProvider.OPENAI: self._openai_models,
+            LLMProvider.ANTHROPIC: self._anthropic_models,
+            LLMProvider.AWS_BEDROCK: self._bedrock_models,
+            LLMProvider.GOOGLE: self._google_models,
+            LLMProvider.COHERE: self._cohere_models,
+            LLMProvider.VLLM: self._vllm_models
+        }
+    
+    def _openai_models(self) -> Dict[str, LLMModelConfig]:
+        """Get OpenAI model configurations"""
+        if not self.openai_api_key:
+            return {}
+        return {
+            "gpt-4o": LLMModelConfig(
+                provider=LLMProvider.OPENAI,
+                model_name="gpt-4o",
+                display_name="GPT-4o (OpenAI)",
+                api_key_env_var=_OPENAI_ENV,
+                max_tokens=4096,
+                supports_json_mode=True
+            ),
+            "gpt-4o-mini": LLMModelConfig(
+                provider=LLMProvider.OPENAI,
+                model_name="gpt-4o-mini",
+                display_name="GPT-4o Mini (OpenAI)",
+                api_key_env_var=_OPENAI_ENV,
+                max_tokens=4096,
+                supports_json_mode=True
+            ),
+            "gpt-3.5-turbo": LLMModelConfig(
+                provider=LLMProvider.OPENAI,
+                model_name="gpt-3.5-turbo",
+                display_name="GPT-3.5 Turbo (OpenAI)",
+                api_key_env_var=_OPENAI_ENV,
+                max_tokens=4096,
+                supports_json_mode=True
+            )
+        }
+    
+    def _anthropic_models(self) -> Dict[str, LLMModelConfig]:
+        """Get Anthropic model configurations"""
+        if not self.anthropic_api_key:
+            return {}
+        return {
+            "claude-3-5-sonnet-20241022": LLMModelConfig(
+                provider=LLMProvider.ANTHROPIC,
+                model_name="claude-3-5-sonnet-20241022",
+                display_name="Claude 3.5 Sonnet (Anthropic)",
+                api_key_env_var=_ANTHROPIC_ENV,
+                max_tokens=4096
+            ),
+            "claude-3-5-haiku-20241022": LLMModelConfig(
+                provider=LLMProvider.ANTHROPIC,
+                model_name="claude-3-5-haiku-20241022",
+                display_name="Claude 3.5 Haiku (Anthropic)",
+                api_key_env_var=_ANTHROPIC_ENV,
+                max_tokens=4096
+            )
+        }
+    
+    def _bedrock_models(self) -> Dict[str, LLMModelConfig]:
+        """Get AWS Bedrock model configurations"""
+        if not (self.aws_access_key_id and self.aws_secret_access_key):
+            return {}
+        return {
+            "bedrock-claude-3-5-sonnet": LLMModelConfig(
+                provider=LLMProvider.AWS_BEDROCK,
+                model_name="anthropic.claude-3-5-sonnet-20241022-v2:0",
+                display_name="Claude 3.5 Sonnet (AWS Bedrock)",
+                additional_params={"region": self.aws_region},
+                max_tokens=4096
+            ),
+            "bedrock-claude-3-haiku": LLMModelConfig(
+                provider=LLMProvider.AWS_BEDROCK,
+                model_name="anthropic.claude-3-haiku-20240307-v1:0",
+                display_name="Claude 3 Haiku (AWS Bedrock)",
+                additional_params={"region": self.aws_region},
+                max_tokens=4096
+            )
+        }
+    
+    def _google_models(self) -> Dict[str, LLMModelConfig]:
+        """Get Google model configurations"""
+        if not self.google_api_key:
+            return {}
+        return {
+            "gemini-1.5-pro": LLMModelConfig(
+                provider=LLMProvider.GOOGLE,
+                model_name="gemini-1.5-pro",
+                display_name="Gemini 1.5 Pro (Google)",
+                api_key_env_var=_GOOGLE_ENV,
+                max_tokens=4096
+            ),
+            "gemini-1.5-flash": LLMModelConfig(
+                provider=LLMProvider.GOOGLE,
+                model_name="gemini-1.5-flash",
+                display_name="Gemini 1.5 Flash (Google)",
+                api_key_env_var=_GOOGLE_ENV,
+                max_tokens=4096
+            )
+        }
+    
+    def _cohere_models(self) -> Dict[str, LLMModelConfig]:
+        """Get Cohere model configurations"""
+        if not self.cohere_api_key:
+            return {}
+        return {
+            "command-r-plus": LLMModelConfig(
+                provider=LLMProvider.COHERE,
+                model_name="command-r-plus",
+                display_name="Command R+ (Cohere)",
+                api_key_env_var=_COHERE_ENV,
+                max_tokens=4096
+            ),
+            "command-r": LLMModelConfig(
+                provider=LLMProvider.COHERE,
+                model_name="command-r",
+                display_name="Command R (Cohere)",
+                api_key_env_var=_COHERE_ENV,
+                max_tokens=4096
+            )
+        }
+    
+    def _vllm_models(self) -> Dict[str, LLMModelConfig]:
+        """Get vLLM model configurations"""
+        if not self.vllm_base_url:
+            return {}
+        return {
+            "vllm-custom": LLMModelConfig(
+                provider=LLMProvider.VLLM,
+                model_name="custom-model",
+                display_name="Custom Model (vLLM)",
+                api_base_env_var=_VLLM_ENV,
+                max_tokens=4096
+            )
+        }
     
     def get_model_config(self, model_key: str) -> Optional[LLMModelConfig]:
         """Get configuration for a specific model"""
+        self._ensure_models_loaded()
         return self.available_models.get(model_key)
     
     def get_available_models(self) -> Dict[str, LLMModelConfig]:
         """Get all available models"""
+        self._ensure_models_loaded()
         return self.available_models
     
     def get_models_by_provider(self, provider: LLMProvider) -> Dict[str, LLMModelConfig]:
         """Get models filtered by provider"""
-        return {
-            key: model for key, model in self.available_models.items()
-            if model.provider == provider
-        }
+        if provider == LLMProvider.OLLAMA:
+            self._ensure_ollama_loaded()
+        else:
+            self._ensure_provider_loaded(provider)
+        return dict(self._by_provider.get(provider, {}))
     
     async def fetch_ollama_models(self) -> List[str]:
         """Fetch available models from local Ollama server"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.ollama_base_url}/api/tags") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        models = data.get("models", [])
-                        return [model["name"] for model in models]
-                    else:
-                        logging.warning(f"Failed to fetch Ollama models: HTTP {response.status}")
-                        return []
+            response = await _get_async_client().get(f"{self.ollama_base_url}/api/tags")
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                models = data.get("models", [])
+                return [model["name"] for model in models]
+            else:
+                logging.warning(f"Failed to fetch Ollama models: HTTP {response.status_code}")
+                return []
         except Exception as e:
             logging.warning(f"Error fetching Ollama models: {str(e)}")
             return []
@@ -295,25 +496,8 @@ class LLMConfig(BaseSettings):
         """Update available Ollama models dynamically"""
         try:
             available_models = await self.fetch_ollama_models()
-            
-            # Remove existing Ollama models
-            self.available_models = {
-                k: v for k, v in self.available_models.items() 
-                if v.provider != LLMProvider.OLLAMA
-            }
-            
-            # Add available Ollama models
-            for model_name in available_models:
-                clean_name = model_name.split(":")[0]  # Remove tag suffix if present
-                model_key = f"ollama-{clean_name.replace('/', '-')}"
-                
-                self.available_models[model_key] = LLMModelConfig(
-                    provider=LLMProvider.OLLAMA,
-                    model_name=model_name,
-                    display_name=f"{clean_name.title()} (Ollama)",
-                    api_base_env_var="OLLAMA_BASE_URL",
-                    max_tokens=4096
-                )
+            self._ollama_loaded = True
+            self.set_ollama_models(available_models)
             
             logging.info(f"Updated Ollama models: {list(available_models)}")
             
@@ -323,43 +507,11 @@ class LLMConfig(BaseSettings):
     def is_ollama_available(self) -> bool:
         """Check if Ollama server is available"""
         try:
-            response = requests.get(f"{self.ollama_base_url}/api/tags", timeout=2)
-            return response.status_code == 200
+            status, _ = _get_ollama_tags(self.ollama_base_url)
+            return status == 200
         except:
             return False
 
-
 # Global configuration instance
 llm_config = LLMConfig()
 
-# Load Ollama models immediately after instance creation
-if llm_config.is_ollama_available():
-    try:
-        import requests
-        response = requests.get(f"{llm_config.ollama_base_url}/api/tags", timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            models = [model["name"] for model in data.get("models", [])]
-            
-            # Clear any existing Ollama models and add real ones
-            llm_config.available_models = {
-                k: v for k, v in llm_config.available_models.items() 
-                if v.provider != LLMProvider.OLLAMA
-            }
-            
-            for model_name in models:
-                clean_name = model_name.split(":")[0]
-                key = f"ollama-{clean_name}"
-                
-                llm_config.available_models[key] = LLMModelConfig(
-                    provider=LLMProvider.OLLAMA,
-                    model_name=model_name,
-                    display_name=f"{clean_name.title()} (Ollama)",
-                    api_base_env_var="OLLAMA_BASE_URL",
-                    max_tokens=4096
-                )
-            
-            model_keys = [f'ollama-{m.split(":")[0]}' for m in models]
-            print(f"Loaded {len(models)} real Ollama models: {model_keys}")
-    except Exception as e:
-        print(f"Could not load Ollama models: {e}") 
\ No newline at end of file
@@ -4,121 +4,97 @@ Centralized logging configuration for the ontology platform
 
 import os
 import sys
-from pathlib import Path
+import threading
 from loguru import logger
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-# Create logs directory if it doesn't exist
-LOGS_DIR = Path("logs")
-LOGS_DIR.mkdir(exist_ok=True)
+from src.config.settings import get_settings
+
+# Created on first use, together with the first service file sink
+LOGS_DIR = "logs"
+
+# Services with their own log file; loggers for other services write to the ontology file
+_SERVICES = (
+    "ontology",
+    "data_source",
+    "catalog",
+    "activity",
+    "ai_suggestions",
+    "lineage",
+    "minio",
+    "ollama",
+    "trino",
+    "unity_catalog",
+)
+_FORMAT = "{{time:YYYY-MM-DD HH:mm:ss.SSS}} | {{level}} | {name} | {{function}}:{{line}} | {{message}} | {{extra}}"
 
 # Service-specific loggers configuration
 LOGGING_CONFIG = {
-    "ontology": {
-        "file": LOGS_DIR / "ontology_service.log",
-        "level": "INFO",
-        "format": "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level} | ONTOLOGY | {function}:{line} | {message} | {extra}",
-        "rotation": "10 MB",
-        "retention": "30 days",
-        "compression": "zip"
-    },
-    "data_source": {
-        "file": LOGS_DIR / "data_source_service.log", 
-        "level": "INFO",
-        "format": "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level} | DATA_SOURCE | {function}:{line} | {message} | {extra}",
-        "rotation": "10 MB",
-        "retention": "30 days",
-        "compression": "zip"
-    },
-    "catalog": {
-        "file": LOGS_DIR / "catalog_service.log",
-        "level": "INFO", 
-        "format": "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level} | CATALOG | {function}:{line} | {message} | {extra}",
-        "rotation": "10 MB",
-        "retention": "30 days",
-        "compression": "zip"
-    },
-    "activity": {
-        "file": LOGS_DIR / "activity_service.log",
-        "level": "INFO",
-        "format": "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level} | ACTIVITY | {function}:{line} | {message} | {extra}",
-        "rotation": "10 MB", 
-        "retention": "30 days",
-        "compression": "zip"
-    },
-    "ai_suggestions": {
-        "file": LOGS_DIR / "ai_suggestions_service.log",
-        "level": "INFO",
-        "format": "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level} | AI_SUGGESTIONS | {function}:{line} | {message} | {extra}",
-        "rotation": "10 MB",
-        "retention": "30 days", 
-        "compression": "zip"
-    },
-    "lineage": {
-        "file": LOGS_DIR / "lineage_service.log",
-        "level": "INFO",
-        "format": "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level} | LINEAGE | {function}:{line} | {message} | {extra}",
-        "rotation": "10 MB",
-        "retention": "30 days",
-        "compression": "zip"
-    },
-    "minio": {
-        "file": LOGS_DIR / "minio_service.log",
+    service: {
+        "file": f"{LOGS_DIR}/{service}_service.log",
         "level": "INFO",
-        "format": "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level} | MINIO | {function}:{line} | {message} | {extra}",
-        "rotation": "10 MB",
-        "retention": "30 days",
-        "compression": "zip"
-    },
-    "ollama": {
-        "file": LOGS_DIR / "ollama_service.log",
-        "level": "INFO",
-        "format": "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level} | OLLAMA | {function}:{line} | {message} | {extra}",
-        "rotation": "10 MB",
-        "retention": "30 days",
-        "compression": "zip"
-    },
-    "trino": {
-        "file": LOGS_DIR / "trino_service.log",
-        "level": "INFO",
-        "format": "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level} | TRINO | {function}:{line} | {message} | {extra}",
-        "rotation": "10 MB",
-        "retention": "30 days",
-        "compression": "zip"
-    },
-    "unity_catalog": {
-        "file": LOGS_DIR / "unity_catalog_service.log",
-        "level": "INFO",
-        "format": "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level} | UNITY_CATALOG | {function}:{line} | {message} | {extra}",
+        "format": _FORMAT.format(name=service.upper()),
         "rotation": "10 MB",
         "retention": "30 days",
         "compression": "zip"
     }
+    for service in _SERVICES
 }
 
+def _sink_service(record) -> Optional[str]:
+    """Name of the LOGGING_CONFIG entry whose file receives record"""
+    service = record["extra"].get("service")
+    if service is None:
+        return None
+    return service if service in LOGGING_CONFIG else "ontology"
+
+def _ensure_logs_dir():
+    """Create logs directory if it doesn't exist"""
+    os.makedirs(LOGS_DIR, exist_ok=True)
+
+# Loguru handler ids of the service file sinks added so far, keyed by LOGGING_CONFIG entry
+_sink_ids: Dict[str, int] = {}
+_sink_lock = threading.Lock()
+
+def _ensure_service_sink(service_name: str):
+    """Add the file sink for service_name the first time one of its loggers is requested"""
+    sink_name = service_name if service_name in LOGGING_CONFIG else "ontology"
+    if sink_name in _sink_ids:
+        return
+    with _sink_lock:
+        if sink_name in _sink_ids:
+            return
+        _ensure_logs_dir()
+        
+        # Full tracebacks with variable values are costly on every error; production opts in via LOG_DIAGNOSE
+        settings = get_settings()
+        diagnose = not settings.is_production or settings.log_diagnose
+        
+        # Records are routed by the service they are bound to. The file write, and
+        # rotation with its zip compression, run on the sink's writer thread
+        # rather than inline in the (often async) caller.
+        config = LOGGING_CONFIG[sink_name]
+        _sink_ids[sink_name] = logger.add(
+            config["file"],
+            filter=lambda record: _sink_service(record) == sink_name,
+            level=config["level"],
+            format=config["format"],
+            rotation=config["rotation"],
+            retention=config["retention"],
+            compression=config["compression"],
+            enqueue=True,
+            backtrace=diagnose,
+            diagnose=diagnose
+        )
+
+_SUCCESS_LEVEL = logger.level("SUCCESS").no
+
 class ServiceLogger:
     """Service-specific logger with enhanced functionality"""
     
     def __init__(self, service_name: str):
         self.service_name = service_name
-        self.config = LOGGING_CONFIG.get(service_name, LOGGING_CONFIG["ontology"])
         self._logger = logger.bind(service=service_name)
-        self._setup_logger()
-    
-    def _setup_logger(self):
-        """Setup service-specific logger with configuration"""
-        # Add file handler for this service
-        self._logger.add(
-            str(self.config["file"]),
-            level=self.config["level"],
-            format=self.config["format"],
-            rotation=self.config["rotation"],
-            retention=self.config["retention"],
-            compression=self.config["compression"],
-            enqueue=True,  # Thread-safe logging
-            backtrace=True,
-            diagnose=True
-        )
     
     def log_function_start(self, function_name: str, **kwargs):
         """Log function start with parameters"""
@@ -129,6 +105,10 @@ class ServiceLogger:
     
     def log_function_success(self, function_name: str, result=None, execution_time=None, **kwargs):
         """Log successful function completion"""
+        # Skip the result introspection when no sink would record a SUCCESS message
+        if self._logger._core.min_level > _SUCCESS_LEVEL:
+            return
+        
         extra_data = {"function": function_name, "status": "SUCCESS"}
         if result is not None:
             extra_data["result_type"] = type(result).__name__
@@ -156,25 +136,25 @@ class ServiceLogger:
                            status="WARNING",
                            **kwargs)
     
-    def info(self, message: str, **kwargs):
-        """Log info message"""
-        self._logger.info(message, **kwargs)
+    def info(self, message: str, *args, **kwargs):
+        """Log info message ("{}" placeholders are formatted lazily from args)"""
+        self._logger.info(message, *args, **kwargs)
     
-    def error(self, message: str, **kwargs):
-        """Log error message"""
-        self._logger.error(message, **kwargs)
+    def error(self, message: str, *args, **kwargs):
+        """Log error message ("{}" placeholders are formatted lazily from args)"""
+        self._logger.error(message, *args, **kwargs)
     
-    def warning(self, message: str, **kwargs):
-        """Log warning message"""
-        self._logger.warning(message, **kwargs)
+    def warning(self, message: str, *args, **kwargs):
+        """Log warning message ("{}" placeholders are formatted lazily from args)"""
+        self._logger.warning(message, *args, **kwargs)
     
-    def debug(self, message: str, **kwargs):
-        """Log debug message"""
-        self._logger.debug(message, **kwargs)
+    def debug(self, message: str, *args, **kwargs):
+        """Log debug message ("{}" placeholders are formatted lazily from args)"""
+        self._logger.debug(message, *args, **kwargs)
     
-    def success(self, message: str, **kwargs):
-        """Log success message"""
-        self._logger.success(message, **kwargs)
+    def success(self, message: str, *args, **kwargs):
+        """Log success message ("{}" placeholders are formatted lazily from args)"""
+        self._logger.success(message, *args, **kwargs)
 
 # Service-specific logger instances
 service_loggers: Dict[str, ServiceLogger] = {}
@@ -182,13 +162,16 @@ service_loggers: Dict[str, ServiceLogger] = {}
 def get_service_logger(service_name: str) -> ServiceLogger:
     """Get or create service-specific logger"""
     if service_name not in service_loggers:
+        _ensure_service_sink(service_name)
         service_loggers[service_name] = ServiceLogger(service_name)
     return service_loggers[service_name]
 
 def setup_logging():
     """Initialize logging configuration"""
     # Remove default logger to avoid duplication
-    logger.remove()
+    with _sink_lock:
+        logger.remove()
+        _sink_ids.clear()
     
     # Add console logger for development
     logger.add(
@@ -198,14 +181,17 @@ def setup_logging():
         colorize=True
     )
     
-    # Create service loggers
-    for service_name in LOGGING_CONFIG.keys():
-        get_service_logger(service_name)
+    # Restore the file sinks of services that already requested a logger
+    for service_name in list(service_loggers):
+        _ensure_service_sink(service_name)
     
     logger.info("Service logging system initialized")
 
 def log_service_health():
     """Log health status of all services"""
-    for service_name in LOGGING_CONFIG.keys():
-        service_logger = get_service_logger(service_name)
-        service_logger.info("Service health check", status="HEALTHY") 
\ No newline at end of file
+    get_service_logger("ontology").info(
+        "Service health check",
+        status="HEALTHY",
+        services=list(LOGGING_CONFIG),
+        count=len(LOGGING_CONFIG)
+    )
@@ -2,8 +2,8 @@
 Application settings using Pydantic Settings
 """
 
-from functools import lru_cache
-from typing import List, Optional
+from functools import cache
+from typing import Optional, Tuple
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -22,6 +22,8 @@ class Settings(BaseSettings):
     app_version: str = "1.0.0"
     app_env: str = "development"
     log_level: str = "INFO"
+    # Record variable values in logged tracebacks; always on outside production
+    log_diagnose: bool = False
     
     # MinIO Settings
     minio_endpoint: str = "localhost:9000"
@@ -71,9 +73,13 @@ class Settings(BaseSettings):
     # Database Settings
     database_url: str = "sqlite:///./ontology.db"
     
+    # Redis Settings (e.g. redis://localhost:6379/0); shares lineage state
+    # between uvicorn workers, kept in process memory when unset
+    redis_url: Optional[str] = None
+    
     # API Settings
     api_v1_prefix: str = "/api/v1"
-    cors_origins: List[str] = ["http://localhost:3000", "http://localhost:8000"]
+    cors_origins: Tuple[str, ...] = ("http://localhost:3000", "http://localhost:8000")
     
     @property
     def is_development(self) -> bool:
@@ -84,7 +90,7 @@ class Settings(BaseSettings):
         return self.app_env.lower() == "production"
 
 
-@lru_cache()
+@cache
 def get_settings() -> Settings:
     """Get cached settings instance"""
     return Settings() 
\ No newline at end of file
@@ -2,15 +2,24 @@
 Main FastAPI application
 """
 
+import sys
+from contextlib import asynccontextmanager
+from typing import Dict
+
 import uvicorn
-from fastapi import FastAPI, Request
+from jinja2 import FileSystemBytecodeCache
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from src.config import get_settings
 from src.config.logging_config import setup_logging, get_service_logger, log_service_health
-from src.api.system import router as system_router
+from src.config.llm_config import close_http_clients
+from src.api.common import OrjsonResponse
+from src.api.system import router as system_router, close_status_clients
 from src.api.lineage import router as lineage_router
 from src.api.ai_suggestions import router as ai_suggestions_router
 from src.api.ontology import router as ontology_router
@@ -19,6 +28,36 @@ from src.api.analysis import router as analysis_router
 from src.api.datasources import router as datasources_router
 from src.api.catalog import router as catalog_router
 from src.services.activity_log_service import activity_log_service
+from src.services.data_source_service import data_source_service
+
+
+_settings = get_settings()
+_APP_NAME = _settings.app_name
+
+# Web pages by URL segment: (template, title); titles are fixed per process, so format them once
+_PAGES = {
+    "index": ("index.html", _APP_NAME),
+    "datasources": ("datasources.html", f"Data Sources - {_APP_NAME}"),
+    "catalog": ("catalog.html", f"Data Catalog - {_APP_NAME}"),
+    "ontology": ("ontology.html", f"Ontology Management - {_APP_NAME}"),
+    "analysis": ("analysis.html", f"SQL Analysis - {_APP_NAME}"),
+    "activity-logs": ("activity_logs.html", f"Activity Logs - {_APP_NAME}"),
+}
+
+# Templates are shared by every page handler; compiled template bytecode is cached
+# on disk so restarted workers skip recompiling, and production skips mtime checks
+_templates = Jinja2Templates(directory="src/web/templates")
+_templates.env.auto_reload = _settings.is_development
+_templates.env.bytecode_cache = FileSystemBytecodeCache()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Close pooled data source connections and shared HTTP clients on shutdown"""
+    yield
+    await data_source_service.close_pools()
+    await close_status_clients()
+    await close_http_clients()
 
 
 def create_app() -> FastAPI:
@@ -42,6 +81,8 @@ def create_app() -> FastAPI:
         description="Python-based open-source ontology platform",
         docs_url="/docs" if settings.is_development else None,
         redoc_url="/redoc" if settings.is_development else None,
+        default_response_class=OrjsonResponse,
+        lifespan=lifespan,
     )
     
     # Configure CORS
@@ -53,77 +94,37 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    # Compress JSON payloads such as ontology domain lists and visualizations
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+    
     # Mount static files
     app.mount("/static", StaticFiles(directory="src/web/static"), name="static")
     
-    # Configure templates
-    templates = Jinja2Templates(directory="src/web/templates")
-    
-    @app.get("/")
-    async def root(request: Request):
-        """Root endpoint with web interface"""
-        # Log page view
-        activity_log_service.log_page_view("index", "anonymous", request.client.host if request.client else None)
-        
-        return templates.TemplateResponse(
-            "index.html", 
-            {"request": request, "title": settings.app_name}
-        )
-    
-    @app.get("/datasources")
-    async def datasources_page(request: Request):
-        """Data sources management page"""
-        # Log page view
-        activity_log_service.log_page_view("datasources", "anonymous", request.client.host if request.client else None)
-        
-        return templates.TemplateResponse(
-            "datasources.html",
-            {"request": request, "title": f"Data Sources - {settings.app_name}"}
-        )
-    
-    @app.get("/catalog")
-    async def catalog_page(request: Request):
-        """Data catalog browser page"""
-        # Log page view
-        activity_log_service.log_page_view("catalog", "anonymous", request.client.host if request.client else None)
-        
-        return templates.TemplateResponse(
-            "catalog.html",
-            {"request": request, "title": f"Data Catalog - {settings.app_name}"}
-        )
-    
-    @app.get("/ontology")
-    async def ontology_page(request: Request):
-        """Ontology management page"""
-        # Log page view
-        activity_log_service.log_page_view("ontology", "anonymous", request.client.host if request.client else None)
-        
-        return templates.TemplateResponse(
-            "ontology.html",
-            {"request": request, "title": f"Ontology Management - {settings.app_name}"}
-        )
-    
-    @app.get("/analysis")
-    async def analysis_page(request: Request):
-        """SQL Analysis page with Trino MPP engine"""
-        # Log page view
-        activity_log_service.log_page_view("analysis", "anonymous", request.client.host if request.client else None)
+    # Pages only depend on their title, so outside development each one is rendered
+    # once and served as cached bytes; static URLs are resolved as root-relative paths
+    page_cache: Dict[str, bytes] = {}
+    
+    def static_url(name: str, **path_params) -> str:
+        return app.url_path_for(name, **path_params)
+    
+    def page_body(page: str) -> bytes:
+        body = page_cache.get(page)
+        if body is None:
+            template_name, title = _PAGES[page]
+            body = _templates.get_template(template_name).render(title=title, url_for=static_url).encode("utf-8")
+            if not settings.is_development:
+                page_cache[page] = body
+        return body
+    
+    if not settings.is_development:
+        for page in _PAGES:
+            page_body(page)
+    
+    def page_response(page: str, request: Request, background_tasks: BackgroundTasks) -> HTMLResponse:
+        # Log page view once the response has been sent
+        background_tasks.add_task(activity_log_service.log_page_view, page, "anonymous", request.client.host if request.client else None)
         
-        return templates.TemplateResponse(
-            "analysis.html",
-            {"request": request, "title": f"SQL Analysis - {settings.app_name}"}
-        )
-    
-    @app.get("/activity-logs")
-    async def activity_logs_page(request: Request):
-        """Activity logs page"""
-        # Log page view
-        activity_log_service.log_page_view("activity-logs", "anonymous", request.client.host if request.client else None)
-        
-        return templates.TemplateResponse(
-            "activity_logs.html",
-            {"request": request, "title": f"Activity Logs - {settings.app_name}"}
-        )
+        return HTMLResponse(page_body(page))
     
     @app.get("/health")
     async def health_check():
@@ -135,6 +136,19 @@ def create_app() -> FastAPI:
             "environment": settings.app_env
         }
     
+    @app.get("/")
+    async def root(request: Request, background_tasks: BackgroundTasks):
+        """Root endpoint with web interface"""
+        return page_response("index", request, background_tasks)
+    
+    # Registered after every other single-segment route, which it would otherwise shadow
+    @app.get("/{page}")
+    async def web_page(page: str, request: Request, background_tasks: BackgroundTasks):
+        """Data sources, catalog, ontology, SQL analysis and activity logs pages"""
+        if page == "index" or page not in _PAGES:
+            raise HTTPException(status_code=404, detail="Not Found")
+        return page_response(page, request, background_tasks)
+    
     # Include API routers
     app.include_router(system_router, prefix=settings.api_v1_prefix)
     app.include_router(lineage_router, prefix=settings.api_v1_prefix)
@@ -175,5 +189,9 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=settings.is_development,
-        log_level=settings.log_level.lower()
+        log_level=settings.log_level.lower(),
+        # uvloop and httptools come with uvicorn[standard]; uvloop is POSIX-only
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        interface="asgi3"
     ) 
\ No newline at end of file
@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 from enum import Enum
 
+import orjson
 from pydantic import BaseModel, Field
 
 
@@ -152,4 +153,14 @@ DEMO_SUGGESTIONS = {
             tags=["customer", "order", "business-logic"]
         )
     ]
-} 
\ No newline at end of file
+}
+
+# Demo responses serialized once per suggestion type; the content never changes
+DEMO_SUGGESTIONS_JSON: Dict[str, bytes] = {
+    suggestion_type.value: orjson.dumps({
+        "suggestion_type": suggestion_type.value,
+        "suggestions": [s.model_dump(mode="json") for s in DEMO_SUGGESTIONS.get(suggestion_type.value, [])],
+        "total": len(DEMO_SUGGESTIONS.get(suggestion_type.value, []))
+    })
+    for suggestion_type in SuggestionType
+}
@@ -18,7 +18,7 @@ class CatalogItemType(str, Enum):
     COLUMN = "column"
 
 
-@dataclass
+@dataclass(slots=True)
 class CatalogColumn:
     """Catalog column model"""
     name: str
@@ -32,7 +32,7 @@ class CatalogColumn:
     statistics: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass 
+@dataclass(slots=True)
 class CatalogTable:
     """Catalog table model"""
     name: str
@@ -59,7 +59,7 @@ class CatalogTable:
         return len(self.columns)
 
 
-@dataclass
+@dataclass(slots=True)
 class CatalogDatabase:
     """Catalog database model"""
     name: str
@@ -87,7 +87,7 @@ class CatalogDatabase:
         return sum(table.column_count for table in self.tables)
 
 
-@dataclass
+@dataclass(slots=True)
 class CatalogDataSource:
     """Catalog data source model"""
     id: str
@@ -116,7 +116,7 @@ class CatalogDataSource:
         return sum(db.total_row_count for db in self.databases)
 
 
-@dataclass
+@dataclass(slots=True)
 class CatalogSearchResult:
     """Catalog search result model"""
     item_type: CatalogItemType
@@ -131,7 +131,7 @@ class CatalogSearchResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class CatalogTree:
     """Catalog tree structure for UI"""
     data_sources: List[CatalogDataSource] = field(default_factory=list)
@@ -139,18 +139,29 @@ class CatalogTree:
     total_databases: int = 0
     total_tables: int = 0
     total_columns: int = 0
+    total_rows: int = 0
     last_updated: Optional[datetime] = None
     
     def update_statistics(self):
-        """Update tree statistics"""
+        """Update tree statistics in a single pass over the tree"""
+        databases = tables = columns = rows = 0
+        for ds in self.data_sources:
+            databases += len(ds.databases)
+            for db in ds.databases:
+                tables += len(db.tables)
+                for table in db.tables:
+                    columns += len(table.columns)
+                    rows += table.row_count or 0
+        
         self.total_data_sources = len(self.data_sources)
-        self.total_databases = sum(ds.database_count for ds in self.data_sources)
-        self.total_tables = sum(ds.table_count for ds in self.data_sources)
-        self.total_columns = sum(db.total_column_count for ds in self.data_sources for db in ds.databases)
+        self.total_databases = databases
+        self.total_tables = tables
+        self.total_columns = columns
+        self.total_rows = rows
         self.last_updated = datetime.utcnow()
 
 
-@dataclass
+@dataclass(slots=True)
 class CatalogStats:
     """Catalog statistics"""
     total_data_sources: int = 0
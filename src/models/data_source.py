@@ -8,7 +8,14 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
 
 
-@dataclass
+def _parse_dt(value: Any) -> Optional[datetime]:
+    """Parse an ISO timestamp, passing datetimes and empty values through"""
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value) if value else None
+
+
+@dataclass(slots=True)
 class DataSource:
     """Data source model"""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -47,8 +54,8 @@ class DataSource:
             type=data.get("type", ""),
             connection_config=data.get("connection_config", {}),
             tags=data.get("tags", []),
-            created_at=datetime.fromisoformat(data.get("created_at", datetime.utcnow().isoformat())),
-            updated_at=datetime.fromisoformat(data.get("updated_at", datetime.utcnow().isoformat())),
-            last_scan_at=datetime.fromisoformat(data["last_scan_at"]) if data.get("last_scan_at") else None,
+            created_at=_parse_dt(data.get("created_at")) or datetime.utcnow(),
+            updated_at=_parse_dt(data.get("updated_at")) or datetime.utcnow(),
+            last_scan_at=_parse_dt(data.get("last_scan_at")),
             status=data.get("status", "active")
         ) 
\ No newline at end of file
@@ -110,6 +110,11 @@ class LineageQueryRequest(BaseModel):
     direction: str = Field(default="both", description="Direction: upstream, downstream, or both")
     depth: int = Field(default=3, description="Maximum depth to traverse")
     include_schema: bool = Field(default=True, description="Include schema information")
+    
+    @property
+    def entity_name(self) -> Optional[str]:
+        """Get the dataset or job name being traced"""
+        return self.dataset_name or self.job_name
 
 
 class LineageQueryResponse(BaseModel):
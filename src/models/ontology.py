@@ -38,6 +38,7 @@ class OntologyEntityType(str, Enum):
 class OntologyRelationType(str, Enum):
     """Ontology relationship types"""
     FOREIGN_KEY = "foreign_key"
+    ONE_TO_ONE = "one_to_one"
     ONE_TO_MANY = "one_to_many"
     MANY_TO_ONE = "many_to_one"
     MANY_TO_MANY = "many_to_many"
@@ -104,6 +105,13 @@ class OntologyDomain(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     last_sync_at: Optional[datetime] = None
+    # Kept in step with entities/relationships by the ontology service
+    entity_count: int = 0
+    relationship_count: int = 0
+    
+    def model_post_init(self, __context: Any) -> None:
+        self.entity_count = len(self.entities)
+        self.relationship_count = len(self.relationships)
 
 
 class OntologyStats(BaseModel):
@@ -5,7 +5,7 @@ Pydantic schemas for API request/response models
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from enum import Enum
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class DataSourceType(str, Enum):
@@ -36,6 +36,8 @@ class DataSourceUpdate(BaseModel):
 
 class DataSourceResponse(BaseModel):
     """Data source response"""
+    model_config = ConfigDict(from_attributes=True)
+    
     id: str
     name: str
     description: Optional[str]
@@ -2,9 +2,12 @@
 Data Catalog Service
 """
 
+import asyncio
+import functools
+import heapq
 import re
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import asdict
 
 from src.config.logging_config import get_service_logger
@@ -15,12 +18,29 @@ from src.models.catalog import (
 from src.services.data_source_service import data_source_service
 
 
+# Word tokens of a search query; punctuation and underscores act as separators
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_search_query(query: str) -> Tuple[str, Tuple[str, ...]]:
+    """Return the lowercased query and its de-duplicated word tokens"""
+    query_lower = query.lower()
+    tokens = tuple(dict.fromkeys(_TOKEN_RE.findall(query_lower)))
+    return query_lower, tokens
+
+
 class CatalogService:
     """Data catalog management service"""
     
+    # Maximum number of data sources introspected at the same time
+    MAX_CONCURRENT_SCANS = 8
+    
     def __init__(self):
         self.logger = get_service_logger("catalog")
         self.catalog_tree = CatalogTree()
+        self.catalog_version = 0  # Bumped on every refresh so callers can key caches on it
+        self.catalog_stats: Optional[CatalogStats] = None  # Derived from catalog_tree at refresh time
         
     async def refresh_catalog(self) -> CatalogTree:
         """Refresh the entire catalog from data sources"""
@@ -30,36 +50,31 @@ class CatalogService:
             # Get all data sources
             data_sources = await data_source_service.get_data_sources()
             
-            catalog_data_sources = []
+            # Introspect data sources concurrently, bounded to avoid stampeding shared servers
+            semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_SCANS)
             
-            for data_source in data_sources:
-                self.logger.info(f"Processing data source: {data_source.name}")
-                
-                # Scan metadata for this data source
-                scan_result = await data_source_service.scan_metadata(data_source.id)
-                
-                if scan_result["success"]:
-                    catalog_ds = await self._convert_to_catalog_data_source(
-                        data_source, scan_result["metadata"]
-                    )
-                    catalog_data_sources.append(catalog_ds)
+            async def introspect(data_source) -> CatalogDataSource:
+                async with semaphore:
+                    return await self._introspect_source(data_source)
+            
+            results = await asyncio.gather(
+                *(introspect(data_source) for data_source in data_sources),
+                return_exceptions=True
+            )
+            
+            catalog_data_sources = []
+            for data_source, result in zip(data_sources, results):
+                if isinstance(result, Exception):
+                    self.logger.error(f"Failed to introspect {data_source.name}: {str(result)}")
+                    catalog_data_sources.append(self._unhealthy_data_source(data_source))
                 else:
-                    self.logger.warning(f"Failed to scan {data_source.name}: {scan_result['message']}")
-                    # Create empty catalog data source
-                    catalog_ds = CatalogDataSource(
-                        id=data_source.id,
-                        name=data_source.name,
-                        type=data_source.type,
-                        description=data_source.description,
-                        connection_status="unhealthy",
-                        last_scanned_at=datetime.utcnow(),
-                        tags=data_source.tags
-                    )
-                    catalog_data_sources.append(catalog_ds)
+                    catalog_data_sources.append(result)
             
             # Update catalog tree
             self.catalog_tree.data_sources = catalog_data_sources
             self.catalog_tree.update_statistics()
+            self.catalog_stats = self._compute_stats(self.catalog_tree)
+            self.catalog_version += 1
             
             self.logger.success(f"Catalog refresh completed. Found {len(catalog_data_sources)} data sources")
             return self.catalog_tree
@@ -68,6 +83,33 @@ class CatalogService:
             self.logger.error(f"Catalog refresh failed: {str(e)}")
             raise
     
+    async def _introspect_source(self, data_source) -> CatalogDataSource:
+        """Scan one data source and convert it to a catalog data source"""
+        self.logger.info(f"Processing data source: {data_source.name}")
+        
+        # Scan metadata for this data source
+        scan_result = await data_source_service.scan_metadata(data_source.id, level="full")
+        
+        if scan_result["success"]:
+            return await self._convert_to_catalog_data_source(
+                data_source, scan_result["metadata"]
+            )
+        
+        self.logger.warning(f"Failed to scan {data_source.name}: {scan_result['message']}")
+        return self._unhealthy_data_source(data_source)
+    
+    def _unhealthy_data_source(self, data_source) -> CatalogDataSource:
+        """Create an empty catalog entry for a data source that could not be scanned"""
+        return CatalogDataSource(
+            id=data_source.id,
+            name=data_source.name,
+            type=data_source.type,
+            description=data_source.description,
+            connection_status="unhealthy",
+            last_scanned_at=datetime.utcnow(),
+            tags=data_source.tags
+        )
+    
     async def _convert_to_catalog_data_source(self, data_source, metadata: Dict[str, Any]) -> CatalogDataSource:
         """Convert data source metadata to catalog data source"""
         try:
@@ -94,7 +136,7 @@ class CatalogService:
                             data_type=col_info["type"],
                             nullable=col_info["null"],
                             primary_key="PRI" in col_info.get("key", ""),
-                            foreign_key="FK" in col_info.get("tags", []),
+                            foreign_key=col_info.get("foreign_key", "FK" in col_info.get("tags", [])),
                             default_value=col_info.get("default"),
                             description=f"Column {col_info['name']} of type {col_info['type']}",
                             tags=self._extract_column_tags(col_info)
@@ -188,22 +230,26 @@ class CatalogService:
         return self.catalog_tree
     
     async def get_catalog_stats(self) -> CatalogStats:
-        """Get catalog statistics"""
+        """Get catalog statistics (computed once per refresh)"""
         catalog_tree = await self.get_catalog_tree()
         
-        stats = CatalogStats(
+        if self.catalog_stats is None:
+            self.catalog_stats = self._compute_stats(catalog_tree)
+        return self.catalog_stats
+    
+    def _compute_stats(self, catalog_tree: CatalogTree) -> CatalogStats:
+        """Aggregate catalog statistics from the tree"""
+        return CatalogStats(
             total_data_sources=catalog_tree.total_data_sources,
             total_databases=catalog_tree.total_databases,
             total_tables=catalog_tree.total_tables,
             total_columns=catalog_tree.total_columns,
-            total_rows=sum(ds.total_row_count for ds in catalog_tree.data_sources),
+            total_rows=catalog_tree.total_rows,
             healthy_sources=sum(1 for ds in catalog_tree.data_sources if ds.connection_status == "healthy"),
             last_scan_time=catalog_tree.last_updated
         )
-        
-        return stats
     
-    async def search_catalog(self, query: str, item_types: Optional[List[str]] = None) -> List[CatalogSearchResult]:
+    async def search_catalog(self, query: str, item_types: Optional[List[str]] = None, limit: int = 50) -> List[CatalogSearchResult]:
         """Search the catalog"""
         try:
             if not query or len(query.strip()) < 2:
@@ -211,11 +257,13 @@ class CatalogService:
             
             catalog_tree = await self.get_catalog_tree()
             results = []
-            query_lower = query.lower()
+            query_lower, tokens = normalize_search_query(query)
+            score = self._calculate_relevance
             
             for data_source in catalog_tree.data_sources:
                 # Search data source
-                if self._matches_query(data_source.name, query_lower):
+                relevance = score(data_source.name, query_lower, tokens)
+                if relevance:
                     results.append(CatalogSearchResult(
                         item_type=CatalogItemType.DATA_SOURCE,
                         name=data_source.name,
@@ -223,13 +271,14 @@ class CatalogService:
                         description=data_source.description,
                         data_source_name=data_source.name,
                         tags=data_source.tags,
-                        relevance_score=self._calculate_relevance(data_source.name, query_lower),
+                        relevance_score=relevance,
                         metadata={"type": data_source.type, "status": data_source.connection_status}
                     ))
                 
                 for database in data_source.databases:
                     # Search database
-                    if self._matches_query(database.name, query_lower):
+                    relevance = score(database.name, query_lower, tokens)
+                    if relevance:
                         results.append(CatalogSearchResult(
                             item_type=CatalogItemType.DATABASE,
                             name=database.name,
@@ -238,13 +287,14 @@ class CatalogService:
                             data_source_name=data_source.name,
                             database_name=database.name,
                             tags=database.tags,
-                            relevance_score=self._calculate_relevance(database.name, query_lower),
+                            relevance_score=relevance,
                             metadata={"table_count": database.table_count}
                         ))
                     
                     for table in database.tables:
                         # Search table
-                        if self._matches_query(table.name, query_lower):
+                        relevance = score(table.name, query_lower, tokens)
+                        if relevance:
                             results.append(CatalogSearchResult(
                                 item_type=CatalogItemType.TABLE,
                                 name=table.name,
@@ -254,7 +304,7 @@ class CatalogService:
                                 database_name=database.name,
                                 table_name=table.name,
                                 tags=table.tags,
-                                relevance_score=self._calculate_relevance(table.name, query_lower),
+                                relevance_score=relevance,
                                 metadata={
                                     "column_count": table.column_count,
                                     "row_count": table.row_count
@@ -263,7 +313,8 @@ class CatalogService:
                         
                         for column in table.columns:
                             # Search column
-                            if self._matches_query(column.name, query_lower):
+                            relevance = score(column.name, query_lower, tokens)
+                            if relevance:
                                 results.append(CatalogSearchResult(
                                     item_type=CatalogItemType.COLUMN,
                                     name=column.name,
@@ -273,7 +324,7 @@ class CatalogService:
                                     database_name=database.name,
                                     table_name=table.name,
                                     tags=column.tags,
-                                    relevance_score=self._calculate_relevance(column.name, query_lower),
+                                    relevance_score=relevance,
                                     metadata={
                                         "data_type": column.data_type,
                                         "nullable": column.nullable
@@ -284,24 +335,15 @@ class CatalogService:
             if item_types:
                 results = [r for r in results if r.item_type in item_types]
             
-            # Sort by relevance score (descending)
-            results.sort(key=lambda x: x.relevance_score, reverse=True)
-            
-            # Limit results
-            return results[:50]
+            # Top results by relevance score (descending) without sorting everything
+            return heapq.nlargest(limit, results, key=lambda x: x.relevance_score)
             
         except Exception as e:
             self.logger.error(f"Catalog search failed: {str(e)}")
             return []
     
-    def _matches_query(self, text: str, query: str) -> bool:
-        """Check if text matches search query"""
-        if not text:
-            return False
-        return query in text.lower()
-    
-    def _calculate_relevance(self, text: str, query: str) -> float:
-        """Calculate relevance score for search results"""
+    def _calculate_relevance(self, text: str, query: str, tokens: Tuple[str, ...]) -> float:
+        """Calculate relevance score for search results (0.0 means no match)"""
         if not text:
             return 0.0
         
@@ -319,10 +361,11 @@ class CatalogService:
         if query in text_lower:
             return 0.6
         
-        # Fuzzy matching (simple)
-        words = query.split()
-        matches = sum(1 for word in words if word in text_lower)
-        return (matches / len(words)) * 0.4 if words else 0.0
+        # Every query word appears somewhere in the text (e.g. "customer id" -> customer_id)
+        if tokens and all(token in text_lower for token in tokens):
+            return 0.4
+        
+        return 0.0
     
     async def get_table_details(self, data_source_id: str, database_name: str, table_name: str) -> Optional[CatalogTable]:
         """Get detailed information about a specific table"""
@@ -4,9 +4,11 @@ Data Source Management Service
 
 import json
 import uuid
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Literal, Tuple
 import pymysql
+import aiomysql
 import asyncio
 from sqlalchemy import create_engine, text
 from sqlalchemy.exc import SQLAlchemyError
@@ -21,6 +23,11 @@ class DataSourceService:
         self.logger = get_service_logger("data_source")
         self.data_sources = {}  # In-memory storage for demo, should use database
         
+        # Warm connection pools for health checks, keyed by data source ID
+        self._pools: Dict[str, aiomysql.Pool] = {}
+        self._pool_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)  # Serialize pool creation per source
+        self._health_check_timeout = 2  # seconds
+        
     async def create_data_source(self, data: Dict[str, Any]) -> DataSource:
         """Create a new data source"""
         try:
@@ -79,6 +86,7 @@ class DataSourceService:
                 data_source.description = data["description"]
             if "connection_config" in data:
                 data_source.connection_config = data["connection_config"]
+                await self._close_pool(data_source_id)
             if "tags" in data:
                 data_source.tags = data["tags"]
             
@@ -99,6 +107,8 @@ class DataSourceService:
             if data_source_id in self.data_sources:
                 data_source = self.data_sources[data_source_id]
                 del self.data_sources[data_source_id]
+                await self._close_pool(data_source_id)
+                self._pool_locks.pop(data_source_id, None)
                 
                 self.logger.info(f"Deleted data source: {data_source.name}", 
                                data_source_id=data_source_id)
@@ -127,6 +137,73 @@ class DataSourceService:
                 "message": f"Connection test failed: {str(e)}"
             }
     
+    async def check_health(self, data_source: DataSource) -> Dict[str, Any]:
+        """Lightweight health check using a pooled connection and SELECT 1"""
+        if data_source.type != "database":
+            return await self.test_connection(data_source.connection_config, data_source.type)
+        
+        try:
+            pool = await asyncio.wait_for(self._get_pool(data_source), timeout=self._health_check_timeout)
+            
+            async def ping():
+                async with pool.acquire() as connection:
+                    async with connection.cursor() as cursor:
+                        await cursor.execute("SELECT 1")
+                        await cursor.fetchone()
+            
+            await asyncio.wait_for(ping(), timeout=self._health_check_timeout)
+            
+            return {
+                "success": True,
+                "message": "Connection healthy"
+            }
+            
+        except Exception as e:
+            # Drop the pool so the next check reconnects from scratch
+            await self._close_pool(data_source.id)
+            self.logger.error(f"Health check failed for {data_source.id}: {str(e)}")
+            return {
+                "success": False,
+                "message": f"Health check failed: {str(e) or type(e).__name__}"
+            }
+    
+    async def _get_pool(self, data_source: DataSource) -> aiomysql.Pool:
+        """Get or create the connection pool for a data source"""
+        pool = self._pools.get(data_source.id)
+        if pool is not None:
+            return pool
+        
+        async with self._pool_locks[data_source.id]:
+            # A concurrent health check may have created the pool while this one waited
+            pool = self._pools.get(data_source.id)
+            if pool is None:
+                config = data_source.connection_config
+                pool = await aiomysql.create_pool(
+                    host=config.get("host", "localhost"),
+                    port=int(config.get("port", 3306)),
+                    user=config.get("username", ""),
+                    password=config.get("password", ""),
+                    db=config.get("database") or None,
+                    charset='utf8mb4',
+                    autocommit=True,
+                    minsize=1,
+                    maxsize=2
+                )
+                self._pools[data_source.id] = pool
+            return pool
+    
+    async def _close_pool(self, data_source_id: str):
+        """Close and forget the connection pool for a data source"""
+        pool = self._pools.pop(data_source_id, None)
+        if pool is not None:
+            pool.close()
+            await pool.wait_closed()
+    
+    async def close_pools(self):
+        """Close all health-check connection pools"""
+        for data_source_id in list(self._pools):
+            await self._close_pool(data_source_id)
+    
     async def _test_mysql_connection(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Test MySQL connection"""
         try:
@@ -209,8 +286,12 @@ class DataSourceService:
                 "message": f"Connection test error: {str(e)}"
             }
     
-    async def scan_metadata(self, data_source_id: str) -> Dict[str, Any]:
-        """Scan metadata from a data source"""
+    async def scan_metadata(self, data_source_id: str, level: Literal["basic", "full"] = "basic") -> Dict[str, Any]:
+        """Scan metadata from a data source
+        
+        The "basic" level reads tables and columns only; "full" also reads
+        foreign keys and exact row counts.
+        """
         try:
             data_source = self.data_sources.get(data_source_id)
             if not data_source:
@@ -220,7 +301,9 @@ class DataSourceService:
                 }
             
             if data_source.type == "database":
-                return await self._scan_mysql_metadata(data_source.connection_config)
+                # pymysql is blocking; scan in a worker thread so scans of
+                # different data sources can overlap
+                return await asyncio.to_thread(self._scan_mysql_metadata, data_source.connection_config, level)
             else:
                 return {
                     "success": False,
@@ -234,7 +317,7 @@ class DataSourceService:
                 "message": f"Metadata scan failed: {str(e)}"
             }
     
-    async def _scan_mysql_metadata(self, config: Dict[str, Any]) -> Dict[str, Any]:
+    def _scan_mysql_metadata(self, config: Dict[str, Any], level: str = "basic") -> Dict[str, Any]:
         """Scan MySQL database metadata"""
         try:
             host = config.get("host", "localhost")
@@ -277,36 +360,31 @@ class DataSourceService:
                         target_databases = [db for db in all_dbs if db not in ['information_schema', 'performance_schema', 'mysql', 'sys']]
                         metadata["databases"] = target_databases
                     
-                    # Get tables for each database
-                    for db in target_databases[:5]:  # Limit to 5 databases
-                        cursor.execute(f"USE `{db}`")
-                        cursor.execute("SHOW TABLES")
-                        tables = [row[0] for row in cursor.fetchall()]
+                    # Read tables and columns for all databases in bulk
+                    scan_databases = target_databases[:5]  # Limit to 5 databases
+                    tables_by_db, columns_by_table = self._batch_read_mysql_catalog(
+                        cursor, scan_databases, with_foreign_keys=level == "full"
+                    )
+                    
+                    for db in scan_databases:
+                        tables = tables_by_db.get(db, [])
                         
                         metadata["total_tables"] += len(tables)
                         
                         # Get table details (limit to 20 tables per database)
                         for table in tables[:20]:
-                            cursor.execute(f"DESCRIBE `{table}`")
-                            columns = []
-                            for col in cursor.fetchall():
-                                columns.append({
-                                    "name": col[0],
-                                    "type": col[1],
-                                    "null": col[2] == "YES",
-                                    "key": col[3],
-                                    "default": col[4],
-                                    "extra": col[5]
-                                })
+                            columns = columns_by_table.get((db, table), [])
                             
                             metadata["total_columns"] += len(columns)
                             
-                            # Get row count
-                            try:
-                                cursor.execute(f"SELECT COUNT(*) FROM `{table}`")
-                                row_count = cursor.fetchone()[0]
-                            except:
-                                row_count = None
+                            # Get row count (full scans only)
+                            row_count = None
+                            if level == "full":
+                                try:
+                                    cursor.execute(f"SELECT COUNT(*) FROM `{db}`.`{table}`")
+                                    row_count = cursor.fetchone()[0]
+                                except:
+                                    row_count = None
                             
                             metadata["tables"].append({
                                 "database": db,
@@ -334,5 +412,59 @@ class DataSourceService:
                 "message": f"MySQL metadata scan failed: {str(e)}"
             }
 
+    def _batch_read_mysql_catalog(
+        self, cursor, databases: List[str], with_foreign_keys: bool = True
+    ) -> Tuple[Dict[str, List[str]], Dict[Tuple[str, str], List[Dict[str, Any]]]]:
+        """Read tables, columns and foreign keys for several databases in one query each"""
+        tables_by_db: Dict[str, List[str]] = defaultdict(list)
+        columns_by_table: Dict[Tuple[str, str], List[Dict[str, Any]]] = defaultdict(list)
+        
+        if not databases:
+            return tables_by_db, columns_by_table
+        
+        placeholders = ", ".join(["%s"] * len(databases))
+        
+        cursor.execute(
+            "SELECT TABLE_SCHEMA, TABLE_NAME FROM information_schema.TABLES "
+            f"WHERE TABLE_SCHEMA IN ({placeholders}) "
+            "ORDER BY TABLE_SCHEMA, TABLE_NAME",
+            databases
+        )
+        for db, table in cursor.fetchall():
+            tables_by_db[db].append(table)
+        
+        cursor.execute(
+            "SELECT TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, "
+            "COLUMN_KEY, COLUMN_DEFAULT, EXTRA FROM information_schema.COLUMNS "
+            f"WHERE TABLE_SCHEMA IN ({placeholders}) "
+            "ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION",
+            databases
+        )
+        for db, table, name, col_type, nullable, key, default, extra in cursor.fetchall():
+            columns_by_table[(db, table)].append({
+                "name": name,
+                "type": col_type,
+                "null": nullable == "YES",
+                "key": key,
+                "default": default,
+                "extra": extra
+            })
+        
+        if not with_foreign_keys:
+            return tables_by_db, columns_by_table
+        
+        cursor.execute(
+            "SELECT DISTINCT TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME "
+            "FROM information_schema.KEY_COLUMN_USAGE "
+            f"WHERE TABLE_SCHEMA IN ({placeholders}) AND REFERENCED_TABLE_NAME IS NOT NULL",
+            databases
+        )
+        foreign_keys = set(cursor.fetchall())
+        for (db, table), columns in columns_by_table.items():
+            for column in columns:
+                column["foreign_key"] = (db, table, column["name"]) in foreign_keys
+        
+        return tables_by_db, columns_by_table
+
 # Global instance
 data_source_service = DataSourceService() 
\ No newline at end of file
@@ -3,14 +3,19 @@ Data Lineage Service
 OpenLineage-based data lineage tracking and visualization
 """
 
+import asyncio
 import json
+import threading
 import time
 import networkx as nx
+import orjson
+import redis
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set, Tuple, Any
-from collections import defaultdict
+from typing import AsyncIterator, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple, Any
+from collections import OrderedDict, defaultdict
 from uuid import uuid4
 
+from src.config import get_settings
 from src.config.logging_config import get_service_logger
 
 from src.models.lineage import (
@@ -19,11 +24,18 @@ from src.models.lineage import (
     LineageEventType, DatasetType, JobType,
     DEMO_DATASETS, DEMO_JOBS
 )
+from src.services.lineage_store import RedisLineageStore
 
 
 class LineageService:
     """Service for managing data lineage"""
     
+    # Maximum number of memoized per-node traversals
+    TRAVERSAL_CACHE_SIZE = 10_000
+    
+    # Events buffered per change subscriber before it is told to resync
+    SUBSCRIBER_QUEUE_SIZE = 1000
+    
     def __init__(self):
         # Initialize service logger
         self.logger = get_service_logger("lineage")
@@ -34,9 +46,136 @@ class LineageService:
         self.runs: List[LineageRun] = []
         self.events: List[LineageEvent] = []
         self.column_lineage: List[ColumnLineage] = []
+        self._graph_version = 0  # Bumped on every mutation so callers can key caches on it
+        self._lock = threading.RLock()  # API handlers call in from worker threads
+        self._traversal_cache: "OrderedDict[Tuple[str, str, int], FrozenSet[str]]" = OrderedDict()
+        self._blobs: Dict[str, bytes] = {}  # JSON-encoded collections, cleared on mutation
+        self._run_fragments: List[bytes] = []  # JSON-encoded runs, in the same order as self.runs
+        self._subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        
+        # Optional Redis store shared with other worker processes
+        self.store: Optional[RedisLineageStore] = None
+        self._store_version = 0  # -1 when local state may be behind the store
+        self._process_epoch = uuid4().hex[:8]  # Unique per process so tags never survive a restart
+        self._epoch = self._process_epoch  # Epoch of the shared store once synced
+        redis_url = get_settings().redis_url
+        store = RedisLineageStore(redis_url) if redis_url else None
+        
+        # Initialize with demo data; with a shared store only the first worker seeds it
+        try:
+            seed = store is None or store.claim_seed(self._epoch)
+        except redis.RedisError as e:
+            self.logger.warning("Lineage store unavailable, keeping lineage in process memory: {}", e)
+            store, seed = None, True
+        
+        if seed:
+            self._init_demo_data()
+            if store is not None:
+                try:
+                    self._store_version = store.save(self.datasets.values(), self.jobs.values(), self.runs)
+                except redis.RedisError as e:
+                    self.logger.warning("Lineage store unavailable, keeping lineage in process memory: {}", e)
+                    store = None
+        else:
+            # Datasets, jobs and runs are loaded from the store on first use
+            self._create_demo_column_lineage()
+        self.store = store
+    
+    @property
+    def graph_version(self) -> int:
+        """Version of the lineage graph, including changes made by other workers"""
+        self._sync_from_store()
+        return self._graph_version
+    
+    def graph_state(self) -> Tuple[str, int]:
+        """Get a tag for the current graph contents and the local graph version
+
+        With a shared store the tag comes from the store's epoch and version, so
+        every worker serving the same graph produces the same tag.
+        """
+        self._sync_from_store()
+        with self._lock:
+            if self.store is not None and self._store_version >= 0:
+                tag = f"{self._epoch}-s{self._store_version}"
+            else:
+                tag = f"{self._process_epoch}-{self._graph_version}"
+            return tag, self._graph_version
+    
+    def _sync_from_store(self):
+        """Reload datasets, jobs and runs if the shared store has changed"""
+        if self.store is None:
+            return
         
-        # Initialize with demo data
-        self._init_demo_data()
+        try:
+            if self.store.version() == (self._epoch, self._store_version):
+                return
+            
+            with self._lock:
+                epoch, version, datasets, jobs, runs = self.store.load()
+                self.datasets, self.jobs, self.runs = datasets, jobs, runs
+                self._run_fragments = []
+                self._build_graph()
+                self._epoch, self._store_version = epoch, version
+                self.invalidate_cache()
+                self._publish("resync", [None])
+        except redis.RedisError as e:
+            self.logger.warning("Lineage store unavailable, serving local state: {}", e)
+    
+    async def subscribe(self, keepalive: float = 15.0) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Yield lineage change events; yields None after keepalive idle seconds"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.SUBSCRIBER_QUEUE_SIZE)
+        subscriber = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.append(subscriber)
+        
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    # Pick up writes made by other workers; a reload publishes a resync
+                    await asyncio.to_thread(self._sync_from_store)
+                    yield None
+        finally:
+            with self._lock:
+                self._subscribers.remove(subscriber)
+    
+    def _publish(self, op: str, items: List[Any]):
+        """Fan out one change event per item to every subscriber"""
+        if not self._subscribers:
+            return
+        
+        events = [
+            {"op": op, "payload": item.model_dump(mode="json") if item is not None else None}
+            for item in items
+        ]
+        # Mutations run in worker threads, so hand events to each subscriber's own loop
+        for loop, queue in list(self._subscribers):
+            loop.call_soon_threadsafe(self._offer, queue, events)
+    
+    @staticmethod
+    def _offer(queue: asyncio.Queue, events: List[Dict[str, Any]]):
+        """Queue events for one subscriber, replacing its backlog with a resync if it falls behind"""
+        for event in events:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait({"op": "resync", "payload": None})
+                return
+    
+    def _persist(self, datasets=(), jobs=(), runs=()):
+        """Write a mutation through to the shared store; call before applying it locally"""
+        if self.store is None:
+            return
+        
+        new_version = self.store.save(datasets, jobs, runs)
+        if new_version == self._store_version + 1:
+            self._store_version = new_version
+        else:
+            # Another worker wrote in between; reload everything on next read
+            self._store_version = -1
     
     def _init_demo_data(self):
         """Initialize service with demo data"""
@@ -187,6 +326,44 @@ class LineageService:
                     timestamp=run.started_at.isoformat()
                 )
     
+    def invalidate_cache(self):
+        """Drop memoized traversals and bump the graph version after a mutation"""
+        with self._lock:
+            self._traversal_cache.clear()
+            self._blobs.clear()
+            self._graph_version += 1
+    
+    def _serialized(self, name: str, build) -> bytes:
+        """Get a JSON-encoded collection, building it on first use after a mutation"""
+        self._sync_from_store()
+        with self._lock:
+            blob = self._blobs.get(name)
+            if blob is None:
+                blob = orjson.dumps(build())
+                self._blobs[name] = blob
+            return blob
+    
+    def datasets_blob(self) -> bytes:
+        """Get all datasets as JSON bytes"""
+        return self._serialized("datasets", lambda: {k: v.model_dump() for k, v in self.datasets.items()})
+    
+    def jobs_blob(self) -> bytes:
+        """Get all jobs as JSON bytes"""
+        return self._serialized("jobs", lambda: {k: v.model_dump() for k, v in self.jobs.items()})
+    
+    def runs_blob(self) -> bytes:
+        """Get all runs as JSON bytes"""
+        self._sync_from_store()
+        with self._lock:
+            blob = self._blobs.get("runs")
+            if blob is None:
+                # Runs are append-only, so only encode the ones added since the last call
+                for run in self.runs[len(self._run_fragments):]:
+                    self._run_fragments.append(orjson.dumps(run.model_dump()))
+                blob = b"[" + b",".join(self._run_fragments) + b"]"
+                self._blobs["runs"] = blob
+            return blob
+    
     def add_dataset(self, dataset: LineageDataset):
         """Add dataset to lineage"""
         start_time = time.time()
@@ -198,7 +375,11 @@ class LineageService:
         )
         
         try:
-            self.datasets[dataset.qualified_name] = dataset
+            with self._lock:
+                self._persist(datasets=[dataset])
+                self.datasets[dataset.qualified_name] = dataset
+                self.invalidate_cache()
+                self._publish("add_dataset", [dataset])
             
             execution_time = (time.time() - start_time) * 1000
             self.logger.log_function_success(
@@ -225,7 +406,11 @@ class LineageService:
         )
         
         try:
-            self.jobs[job.qualified_name] = job
+            with self._lock:
+                self._persist(jobs=[job])
+                self.jobs[job.qualified_name] = job
+                self.invalidate_cache()
+                self._publish("add_job", [job])
             
             execution_time = (time.time() - start_time) * 1000
             self.logger.log_function_success(
@@ -254,8 +439,12 @@ class LineageService:
         )
         
         try:
-            self.runs.append(run)
-            self._build_graph()  # Rebuild graph with new run
+            with self._lock:
+                self._persist(runs=[run])
+                self.runs.append(run)
+                self._build_graph()  # Rebuild graph with new run
+                self.invalidate_cache()
+                self._publish("add_run", [run])
             
             execution_time = (time.time() - start_time) * 1000
             self.logger.log_function_success(
@@ -273,6 +462,86 @@ class LineageService:
             self.logger.log_function_error("add_run", e, run_id=str(run.run_id))
             raise
     
+    def add_datasets(self, datasets: List[LineageDataset]):
+        """Add a batch of datasets to lineage with a single cache invalidation"""
+        start_time = time.time()
+        self.logger.log_function_start("add_datasets", batch_size=len(datasets))
+        
+        try:
+            with self._lock:
+                self._persist(datasets=datasets)
+                for dataset in datasets:
+                    self.datasets[dataset.qualified_name] = dataset
+                self.invalidate_cache()
+                self._publish("add_dataset", datasets)
+            
+            execution_time = (time.time() - start_time) * 1000
+            self.logger.log_function_success(
+                "add_datasets",
+                result=f"Datasets added: {len(datasets)}",
+                execution_time=execution_time,
+                batch_size=len(datasets),
+                total_datasets=len(self.datasets)
+            )
+            
+        except Exception as e:
+            self.logger.log_function_error("add_datasets", e, batch_size=len(datasets))
+            raise
+    
+    def add_jobs(self, jobs: List[LineageJob]):
+        """Add a batch of jobs to lineage with a single cache invalidation"""
+        start_time = time.time()
+        self.logger.log_function_start("add_jobs", batch_size=len(jobs))
+        
+        try:
+            with self._lock:
+                self._persist(jobs=jobs)
+                for job in jobs:
+                    self.jobs[job.qualified_name] = job
+                self.invalidate_cache()
+                self._publish("add_job", jobs)
+            
+            execution_time = (time.time() - start_time) * 1000
+            self.logger.log_function_success(
+                "add_jobs",
+                result=f"Jobs added: {len(jobs)}",
+                execution_time=execution_time,
+                batch_size=len(jobs),
+                total_jobs=len(self.jobs)
+            )
+            
+        except Exception as e:
+            self.logger.log_function_error("add_jobs", e, batch_size=len(jobs))
+            raise
+    
+    def add_runs(self, runs: List[LineageRun]):
+        """Add a batch of runs to lineage, rebuilding the graph once"""
+        start_time = time.time()
+        self.logger.log_function_start("add_runs", batch_size=len(runs))
+        
+        try:
+            with self._lock:
+                self._persist(runs=runs)
+                self.runs.extend(runs)
+                self._build_graph()  # Rebuild graph once for the whole batch
+                self.invalidate_cache()
+                self._publish("add_run", runs)
+            
+            execution_time = (time.time() - start_time) * 1000
+            self.logger.log_function_success(
+                "add_runs",
+                result=f"Runs added: {len(runs)}",
+                execution_time=execution_time,
+                batch_size=len(runs),
+                total_runs=len(self.runs),
+                graph_nodes=self.graph.number_of_nodes(),
+                graph_edges=self.graph.number_of_edges()
+            )
+            
+        except Exception as e:
+            self.logger.log_function_error("add_runs", e, batch_size=len(runs))
+            raise
+    
     def query_lineage(self, request: LineageQueryRequest) -> LineageQueryResponse:
         """Query lineage graph"""
         start_time = time.time()
@@ -285,40 +554,42 @@ class LineageService:
         )
         
         try:
+            self._sync_from_store()
             query_start_time = datetime.now()
             
-            # Determine starting nodes
-            start_nodes = self._get_start_nodes(request)
+            with self._lock:
+                # Determine starting nodes
+                start_nodes = self._get_start_nodes(request)
             
-            if not start_nodes:
-                execution_time = (time.time() - start_time) * 1000
-                self.logger.log_function_warning(
-                    "query_lineage",
-                    "No starting nodes found for query",
-                    entity_name=request.entity_name,
-                    execution_time=execution_time
-                )
-                return LineageQueryResponse(
-                    query=request,
-                    graph=LineageGraph(),
-                    total_datasets=0,
-                    total_jobs=0,
-                    execution_time_ms=int((datetime.now() - query_start_time).total_seconds() * 1000)
-                )
+                if not start_nodes:
+                    execution_time = (time.time() - start_time) * 1000
+                    self.logger.log_function_warning(
+                        "query_lineage",
+                        "No starting nodes found for query",
+                        entity_name=request.entity_name,
+                        execution_time=execution_time
+                    )
+                    return LineageQueryResponse(
+                        query=request,
+                        graph=LineageGraph(),
+                        total_datasets=0,
+                        total_jobs=0,
+                        execution_time_ms=int((datetime.now() - query_start_time).total_seconds() * 1000)
+                    )
             
-            # Find connected nodes based on direction and depth
-            connected_nodes = self._find_connected_nodes(start_nodes, request.direction, request.depth)
+                # Find connected nodes based on direction and depth
+                connected_nodes = self._find_connected_nodes(start_nodes, request.direction, request.depth)
             
-            # Build subgraph
-            subgraph = self._build_subgraph(connected_nodes, request.include_schema)
+                # Build subgraph
+                subgraph = self._build_subgraph(connected_nodes, request.include_schema)
             
-            response = LineageQueryResponse(
-                query=request,
-                graph=subgraph,
-                total_datasets=len([n for n in connected_nodes if n in self.datasets]),
-                total_jobs=len([n for n in connected_nodes if n in self.jobs]),
-                execution_time_ms=int((datetime.now() - query_start_time).total_seconds() * 1000)
-            )
+                response = LineageQueryResponse(
+                    query=request,
+                    graph=subgraph,
+                    total_datasets=len([n for n in connected_nodes if n in self.datasets]),
+                    total_jobs=len([n for n in connected_nodes if n in self.jobs]),
+                    execution_time_ms=int((datetime.now() - query_start_time).total_seconds() * 1000)
+                )
             
             execution_time = (time.time() - start_time) * 1000
             self.logger.log_function_success(
@@ -361,33 +632,51 @@ class LineageService:
         """Find all nodes connected to start nodes"""
         connected = set(start_nodes)
         
-        for start_node in start_nodes:
-            if direction in ["upstream", "both"]:
-                # Find upstream nodes (predecessors)
-                upstream = set()
-                for d in range(depth):
-                    current_level = set()
-                    for node in (upstream if d > 0 else {start_node}):
-                        current_level.update(self.graph.predecessors(node))
-                    if not current_level:
-                        break
-                    upstream.update(current_level)
-                connected.update(upstream)
-            
-            if direction in ["downstream", "both"]:
-                # Find downstream nodes (successors)
-                downstream = set()
-                for d in range(depth):
-                    current_level = set()
-                    for node in (downstream if d > 0 else {start_node}):
-                        current_level.update(self.graph.successors(node))
-                    if not current_level:
-                        break
-                    downstream.update(current_level)
-                connected.update(downstream)
+        if direction in ["upstream", "both"]:
+            connected.update(self._traverse(start_nodes, "upstream", depth))
+        
+        if direction in ["downstream", "both"]:
+            connected.update(self._traverse(start_nodes, "downstream", depth))
         
         return connected
     
+    def _traverse(self, start_nodes: Set[str], direction: str, depth: int) -> Set[str]:
+        """Find nodes within depth hops of any start node in one direction"""
+        found = set()
+        for node in start_nodes:
+            found.update(self._reachable(node, direction, depth))
+        return found
+    
+    def _reachable(self, node: str, direction: str, depth: int) -> FrozenSet[str]:
+        """Find nodes within depth hops of a node, memoized until the graph changes"""
+        key = (node, direction, depth)
+        cached = self._traversal_cache.get(key)
+        if cached is not None:
+            self._traversal_cache.move_to_end(key)
+            return cached
+        
+        found = set()
+        if node in self.graph:
+            neighbors = self.graph.predecessors if direction == "upstream" else self.graph.successors
+            
+            # Breadth-first, expanding only the newest level so shared ancestors
+            # in diamond-shaped graphs are visited once
+            frontier = {node}
+            for _ in range(depth):
+                next_level = set()
+                for current in frontier:
+                    next_level.update(neighbors(current))
+                frontier = next_level - found
+                if not frontier:
+                    break
+                found.update(frontier)
+        
+        result = frozenset(found)
+        self._traversal_cache[key] = result
+        if len(self._traversal_cache) > self.TRAVERSAL_CACHE_SIZE:
+            self._traversal_cache.popitem(last=False)
+        return result
+    
     def _build_subgraph(self, nodes: Set[str], include_schema: bool) -> LineageGraph:
         """Build LineageGraph from selected nodes"""
         subgraph_datasets = {}
@@ -452,6 +741,7 @@ class LineageService:
     
     def get_metrics(self) -> LineageMetrics:
         """Get lineage metrics and statistics"""
+        self._sync_from_store()
         now = datetime.now()
         last_24h = now - timedelta(hours=24)
         
@@ -478,6 +768,7 @@ class LineageService:
     
     def get_dataset_impact_analysis(self, dataset_name: str) -> Dict[str, Any]:
         """Analyze impact of changes to a dataset"""
+        self._sync_from_store()
         if dataset_name not in self.datasets:
             return {"error": "Dataset not found"}
         
@@ -506,36 +797,67 @@ class LineageService:
         """Export lineage graph in various formats"""
         if format == "json":
             return self._export_json()
+        return "".join(self.iter_export(format))
+    
+    def iter_export(self, format: str) -> Iterator[str]:
+        """Export lineage graph as a sequence of text chunks for streaming"""
+        if format == "json":
+            return iter([self._export_json()])
         elif format == "graphml":
-            return self._export_graphml()
+            return (line + "\n" for line in nx.generate_graphml(self._export_graph()))
         elif format == "dot":
-            return self._export_dot()
+            return self._generate_dot(self._export_graph())
         else:
             raise ValueError(f"Unsupported format: {format}")
     
+    def export_lineage_data(self) -> Dict[str, Any]:
+        """Export lineage datasets, jobs, runs and column lineage as plain data"""
+        self._sync_from_store()
+        with self._lock:
+            return {
+                "datasets": {k: v.model_dump() for k, v in self.datasets.items()},
+                "jobs": {k: v.model_dump() for k, v in self.jobs.items()},
+                "runs": [r.model_dump() for r in self.runs],
+                "column_lineage": [c.model_dump() for c in self.column_lineage]
+            }
+    
     def _export_json(self) -> str:
         """Export lineage as JSON"""
-        graph_data = {
-            "datasets": {k: v.model_dump() for k, v in self.datasets.items()},
-            "jobs": {k: v.model_dump() for k, v in self.jobs.items()},
-            "runs": [r.model_dump() for r in self.runs],
-            "column_lineage": [c.model_dump() for c in self.column_lineage]
-        }
-        return json.dumps(graph_data, indent=2, default=str)
-    
-    def _export_graphml(self) -> str:
-        """Export lineage as GraphML"""
-        from io import StringIO
-        output = StringIO()
-        nx.write_graphml(self.graph, output)
-        return output.getvalue()
-    
-    def _export_dot(self) -> str:
-        """Export lineage as DOT format"""
-        from io import StringIO
-        output = StringIO()
-        nx.drawing.nx_agraph.write_dot(self.graph, output)
-        return output.getvalue()
+        return json.dumps(self.export_lineage_data(), indent=2, default=str)
+    
+    def _export_graph(self) -> nx.DiGraph:
+        """Snapshot the graph with attribute values GraphML and DOT can represent"""
+        def export_attrs(data: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                key: json.dumps(value, default=str) if isinstance(value, (dict, list)) else value
+                for key, value in data.items() if value is not None
+            }
+        
+        self._sync_from_store()
+        graph = nx.DiGraph()
+        with self._lock:
+            for node, data in self.graph.nodes(data=True):
+                graph.add_node(node, **export_attrs(data))
+            for source, target, data in self.graph.edges(data=True):
+                graph.add_edge(source, target, **export_attrs(data))
+        return graph
+    
+    def _generate_dot(self, graph: nx.DiGraph) -> Iterator[str]:
+        """Export lineage as DOT format, one statement per chunk"""
+        def quote(value: Any) -> str:
+            return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+        
+        def attrs(data: Dict[str, Any]) -> str:
+            if not data:
+                return ""
+            return " [" + ", ".join(f"{key}={quote(value)}" for key, value in data.items()) + "]"
+        
+        yield "strict digraph {\n"
+        for node, data in graph.nodes(data=True):
+            yield f"{quote(node)}{attrs(data)};\n"
+        for source, target, data in graph.edges(data=True):
+            yield f"{quote(source)} -> {quote(target)}{attrs(data)};\n"
+        yield "}\n"
 
 
 # Global service instance
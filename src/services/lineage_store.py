@@ -0,0 +1,77 @@
+"""
+Lineage Store
+Redis-backed lineage state shared between worker processes
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+import redis
+
+from src.models.lineage import LineageDataset, LineageJob, LineageRun
+
+
+class RedisLineageStore:
+    """Shared storage for lineage datasets, jobs and runs"""
+    
+    DATASETS_KEY = "lineage:datasets"  # hash: qualified name -> dataset JSON
+    JOBS_KEY = "lineage:jobs"          # hash: qualified name -> job JSON
+    RUNS_KEY = "lineage:runs"          # list of run JSON, append-only
+    VERSION_KEY = "lineage:version"    # counter bumped by every write
+    SEEDED_KEY = "lineage:seeded"      # epoch of the stored graph, set once by the seeding worker
+    
+    def __init__(self, url: str):
+        self.client = redis.Redis.from_url(url)
+    
+    def version(self) -> Tuple[str, int]:
+        """Get the shared lineage epoch and version"""
+        epoch, version = self.client.mget(self.SEEDED_KEY, self.VERSION_KEY)
+        return (
+            epoch.decode() if epoch is not None else "",
+            int(version) if version is not None else 0
+        )
+    
+    def claim_seed(self, epoch: str) -> bool:
+        """Claim the one-time demo data seeding under epoch; only the first caller gets True"""
+        return bool(self.client.set(self.SEEDED_KEY, epoch, nx=True))
+    
+    def save(
+        self,
+        datasets: Iterable[LineageDataset] = (),
+        jobs: Iterable[LineageJob] = (),
+        runs: Iterable[LineageRun] = ()
+    ) -> int:
+        """Write datasets, jobs and runs in one transaction and return the new version"""
+        pipe = self.client.pipeline()
+        
+        dataset_map = {d.qualified_name: d.model_dump_json() for d in datasets}
+        if dataset_map:
+            pipe.hset(self.DATASETS_KEY, mapping=dataset_map)
+        
+        job_map = {j.qualified_name: j.model_dump_json() for j in jobs}
+        if job_map:
+            pipe.hset(self.JOBS_KEY, mapping=job_map)
+        
+        run_list = [r.model_dump_json() for r in runs]
+        if run_list:
+            pipe.rpush(self.RUNS_KEY, *run_list)
+        
+        pipe.incr(self.VERSION_KEY)
+        return pipe.execute()[-1]
+    
+    def load(self) -> Tuple[str, int, Dict[str, LineageDataset], Dict[str, LineageJob], List[LineageRun]]:
+        """Read the full lineage state together with its epoch and version"""
+        pipe = self.client.pipeline()
+        pipe.get(self.SEEDED_KEY)
+        pipe.get(self.VERSION_KEY)
+        pipe.hgetall(self.DATASETS_KEY)
+        pipe.hgetall(self.JOBS_KEY)
+        pipe.lrange(self.RUNS_KEY, 0, -1)
+        epoch, version, datasets, jobs, runs = pipe.execute()
+        
+        return (
+            epoch.decode() if epoch is not None else "",
+            int(version) if version is not None else 0,
+            {k.decode(): LineageDataset.model_validate_json(v) for k, v in datasets.items()},
+            {k.decode(): LineageJob.model_validate_json(v) for k, v in jobs.items()},
+            [LineageRun.model_validate_json(r) for r in runs]
+        )
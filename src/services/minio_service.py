@@ -2,6 +2,7 @@
 MinIO Object Storage Service
 """
 
+import asyncio
 import io
 import time
 from typing import Optional, List, Dict, Any
@@ -75,8 +76,8 @@ class MinioService:
         self.logger.log_function_start("health_check")
         
         try:
-            # Try to list buckets as a health check
-            buckets = list(self.client.list_buckets())
+            # Try to list buckets as a health check; the client blocks, so keep it off the event loop
+            buckets = await asyncio.to_thread(self.client.list_buckets)
             
             execution_time = (time.time() - start_time) * 1000
             self.logger.log_function_success(
@@ -4,8 +4,9 @@ Ontology Service - Converts catalog metadata to ontology representation
 
 import uuid
 import math
+from itertools import islice
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Set, Tuple
 from collections import defaultdict
 
 from src.models.ontology import (
@@ -16,19 +17,32 @@ from src.models.ontology import (
 from src.services.catalog_service import catalog_service
 from src.config.logging_config import get_service_logger
 
+# (lowered name, lowered description, entity type or None for relationships, result row)
+SearchEntry = Tuple[str, str, Optional[str], Dict[str, Any]]
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Get the set of 3-character substrings of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
 class OntologyService:
     """Service for managing ontology data from catalog sources"""
     
     def __init__(self):
         self.logger = get_service_logger("ontology")
         self.ontology_domains = {}  # In-memory storage
+        self.ontology_version = 0  # Bumped on every change so callers can key caches on it
+        # domain_id -> (entries, trigram -> positions of entries containing it)
+        self._search_index: Dict[str, Tuple[List[SearchEntry], Dict[str, Set[int]]]] = {}
+        self._search_index_version = -1
         
     async def get_ontology_stats(self) -> OntologyStats:
         """Get ontology statistics"""
         try:
             total_domains = len(self.ontology_domains)
-            total_entities = sum(len(domain.entities) for domain in self.ontology_domains.values())
-            total_relationships = sum(len(domain.relationships) for domain in self.ontology_domains.values())
+            total_entities = sum(domain.entity_count for domain in self.ontology_domains.values())
+            total_relationships = sum(domain.relationship_count for domain in self.ontology_domains.values())
             total_properties = sum(
                 sum(len(entity.properties) for entity in domain.entities)
                 for domain in self.ontology_domains.values()
@@ -69,6 +83,119 @@ class OntologyService:
             self.logger.error(f"Failed to get ontology domain {domain_id}: {str(e)}")
             raise
     
+    async def get_domain_updated_at(self, domain_id: str) -> Optional[datetime]:
+        """Get when a domain last changed, or None if the domain does not exist"""
+        domain = self.ontology_domains.get(domain_id)
+        return domain.updated_at if domain else None
+    
+    async def get_domain_entities(self, domain_id: str) -> Optional[List[OntologyEntity]]:
+        """Get only the entities of a domain, or None if the domain does not exist"""
+        domain = self.ontology_domains.get(domain_id)
+        return domain.entities if domain else None
+    
+    async def get_domain_relationships(self, domain_id: str) -> Optional[List[OntologyRelationship]]:
+        """Get only the relationships of a domain, or None if the domain does not exist"""
+        domain = self.ontology_domains.get(domain_id)
+        return domain.relationships if domain else None
+    
+    async def search(
+        self,
+        query: str,
+        domain_id: Optional[str] = None,
+        entity_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Search entity and relationship names and descriptions
+        
+        entity_type only filters entities; matching relationships are always included.
+        Matching stops as soon as offset + limit results have been found.
+        """
+        index = self._get_search_index()
+        if domain_id:
+            domains = [index[domain_id]] if domain_id in index else []
+        else:
+            domains = index.values()
+        
+        q = query.lower()
+        matches = (
+            result
+            for entries, postings in domains
+            for name, description, result_type, result in self._candidates(q, entries, postings)
+            if (q in name or q in description)
+            and (not entity_type or result_type is None or result_type == entity_type)
+        )
+        return list(islice(matches, offset, offset + limit if limit is not None else None))
+    
+    @staticmethod
+    def _candidates(q: str, entries: List[SearchEntry], postings: Dict[str, Set[int]]) -> Iterable[SearchEntry]:
+        """Narrow entries to those containing every trigram of q, in index order"""
+        if len(q) < 3:
+            return entries
+        
+        matches = []
+        for gram in _trigrams(q):
+            positions = postings.get(gram)
+            if not positions:
+                return []
+            matches.append(positions)
+        
+        matches.sort(key=len)
+        return [entries[i] for i in sorted(set.intersection(*matches))]
+    
+    def _get_search_index(self) -> Dict[str, Tuple[List[SearchEntry], Dict[str, Set[int]]]]:
+        """Get the search index, rebuilding it only after the ontology changed"""
+        if self._search_index_version == self.ontology_version:
+            return self._search_index
+        
+        index = {}
+        for domain in self.ontology_domains.values():
+            entries = []
+            for entity in domain.entities:
+                entries.append((
+                    entity.name.lower(),
+                    (entity.description or "").lower(),
+                    entity.type.value,
+                    {
+                        "type": "entity",
+                        "domain_id": domain.id,
+                        "domain_name": domain.name,
+                        "id": entity.id,
+                        "name": entity.name,
+                        "description": entity.description,
+                        "entity_type": entity.type.value,
+                        "source_table": entity.source_table,
+                        "row_count": entity.row_count
+                    }
+                ))
+            for relationship in domain.relationships:
+                entries.append((
+                    relationship.name.lower(),
+                    (relationship.description or "").lower(),
+                    None,
+                    {
+                        "type": "relationship",
+                        "domain_id": domain.id,
+                        "domain_name": domain.name,
+                        "id": relationship.id,
+                        "name": relationship.name,
+                        "description": relationship.description,
+                        "relationship_type": relationship.type.value,
+                        "cardinality": relationship.cardinality
+                    }
+                ))
+            
+            postings = defaultdict(set)
+            for position, (name, description, _, _) in enumerate(entries):
+                for gram in _trigrams(name) | _trigrams(description):
+                    postings[gram].add(position)
+            
+            index[domain.id] = (entries, dict(postings))
+        
+        self._search_index = index
+        self._search_index_version = self.ontology_version
+        return index
+    
     async def sync_from_catalog(self, data_source_id: Optional[str] = None) -> Dict[str, Any]:
         """Sync ontology from catalog data"""
         try:
@@ -90,10 +217,11 @@ class OntologyService:
                     # Create domain for each database
                     domain = await self._create_domain_from_database(data_source, database)
                     self.ontology_domains[domain.id] = domain
+                    self.ontology_version += 1
                     
                     domains_created += 1
-                    entities_created += len(domain.entities)
-                    relationships_created += len(domain.relationships)
+                    entities_created += domain.entity_count
+                    relationships_created += domain.relationship_count
             
             result = {
                 "success": True,
@@ -313,10 +441,10 @@ class OntologyService:
             if not domain:
                 return None
             
-            # Convert entities to nodes
+            # Convert entities to nodes; domain data is already validated, so skip field validation
             nodes = []
             for entity in domain.entities:
-                node = OntologyVisualizationNode(
+                node = OntologyVisualizationNode.model_construct(
                     id=entity.id,
                     label=entity.name,
                     type=entity.type.value,
@@ -335,7 +463,7 @@ class OntologyService:
             # Convert relationships to edges
             edges = []
             for relationship in domain.relationships:
-                edge = OntologyVisualizationEdge(
+                edge = OntologyVisualizationEdge.model_construct(
                     id=relationship.id,
                     source=relationship.source_entity_id,
                     target=relationship.target_entity_id,
@@ -400,48 +528,21 @@ class OntologyService:
             if existing_entity:
                 return {"success": False, "message": f"Entity '{entity_name}' already exists in domain"}
             
-            # Create entity ID
-            entity_id = f"{domain_id}_{entity_name.lower().replace(' ', '_')}"
-            
-            # Convert properties list to OntologyProperty objects
-            properties = []
-            if entity_properties:
-                for prop_name in entity_properties:
-                    prop = OntologyProperty(
-                        name=prop_name,
-                        data_type="varchar",  # Default type
-                        nullable=True,
-                        primary_key=(prop_name.lower() == "id"),
-                        description=f"AI-suggested property: {prop_name}"
-                    )
-                    properties.append(prop)
-            
-            # Determine entity type
-            try:
-                ontology_entity_type = OntologyEntityType(entity_type.lower())
-            except ValueError:
-                ontology_entity_type = OntologyEntityType.TABLE
-            
-            # Calculate position for new entity
-            position = self._calculate_entity_position(len(domain.entities))
-            
-            # Create new entity
-            new_entity = OntologyEntity(
-                id=entity_id,
-                name=entity_name,
-                type=ontology_entity_type,
-                description=entity_description or f"AI-suggested entity: {entity_name}",
-                properties=properties,
-                source_table=entity_name.lower().replace(' ', '_'),
-                source_database=domain.database_name,
-                source_data_source=domain.data_source_id,
-                tags=["ai-suggested"] if is_ai_suggested else [],
-                position=position
+            new_entity = self._build_entity(
+                domain,
+                len(domain.entities),
+                entity_name,
+                entity_description,
+                entity_properties,
+                entity_type,
+                is_ai_suggested
             )
             
             # Add entity to domain
             domain.entities.append(new_entity)
+            domain.entity_count += 1
             domain.updated_at = datetime.utcnow()
+            self.ontology_version += 1
             
             # Update domain in storage
             self.ontology_domains[domain_id] = domain
@@ -451,10 +552,10 @@ class OntologyService:
             return {
                 "success": True,
                 "message": f"Entity '{entity_name}' added successfully",
-                "entity_id": entity_id,
+                "entity_id": new_entity.id,
                 "stats": {
-                    "entities_count": len(domain.entities),
-                    "relationships_count": len(domain.relationships)
+                    "entities_count": domain.entity_count,
+                    "relationships_count": domain.relationship_count
                 }
             }
             
@@ -462,6 +563,98 @@ class OntologyService:
             self.logger.error(f"Failed to add entity to domain {domain_id}: {str(e)}")
             return {"success": False, "message": f"Failed to add entity: {str(e)}"}
     
+    async def add_entities_to_domain(self, domain_id: str, entities: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Add several entities to a domain at once
+        
+        Each item takes the keyword arguments of add_entity_to_domain other than domain_id.
+        Nothing is added if any item is rejected.
+        """
+        try:
+            self.logger.info("Adding {} entities to domain {}", len(entities), domain_id)
+            
+            domain = self.ontology_domains.get(domain_id)
+            if not domain:
+                return {"success": False, "message": "Domain not found"}
+            
+            taken_names = {e.name.lower() for e in domain.entities}
+            new_entities = []
+            for item in entities:
+                entity_name = item["entity_name"]
+                if entity_name.lower() in taken_names:
+                    return {"success": False, "message": f"Entity '{entity_name}' already exists in domain"}
+                taken_names.add(entity_name.lower())
+                new_entities.append(self._build_entity(domain, len(domain.entities) + len(new_entities), **item))
+            
+            domain.entities.extend(new_entities)
+            domain.entity_count += len(new_entities)
+            domain.updated_at = datetime.utcnow()
+            self.ontology_version += 1
+            
+            self.logger.success("{} entities added successfully to domain {}", len(new_entities), domain_id)
+            
+            return {
+                "success": True,
+                "message": f"{len(new_entities)} entities added successfully",
+                "entity_ids": [e.id for e in new_entities],
+                "stats": {
+                    "entities_count": domain.entity_count,
+                    "relationships_count": domain.relationship_count
+                }
+            }
+            
+        except Exception as e:
+            self.logger.error("Failed to add entities to domain {}: {}", domain_id, e)
+            return {"success": False, "message": f"Failed to add entities: {str(e)}"}
+    
+    def _build_entity(
+        self,
+        domain: OntologyDomain,
+        index: int,
+        entity_name: str,
+        entity_description: Optional[str] = None,
+        entity_properties: Optional[List[str]] = None,
+        entity_type: str = "table",
+        is_ai_suggested: bool = False
+    ) -> OntologyEntity:
+        """Create a user-added entity for domain; index is its position in domain.entities"""
+        # Create entity ID
+        entity_id = f"{domain.id}_{entity_name.lower().replace(' ', '_')}"
+        
+        # Convert properties list to OntologyProperty objects
+        properties = []
+        if entity_properties:
+            for prop_name in entity_properties:
+                prop = OntologyProperty(
+                    name=prop_name,
+                    data_type="varchar",  # Default type
+                    nullable=True,
+                    primary_key=(prop_name.lower() == "id"),
+                    description=f"AI-suggested property: {prop_name}"
+                )
+                properties.append(prop)
+        
+        # Determine entity type
+        try:
+            ontology_entity_type = OntologyEntityType(entity_type.lower())
+        except ValueError:
+            ontology_entity_type = OntologyEntityType.TABLE
+        
+        # Calculate position for new entity
+        position = self._calculate_entity_position(index)
+        
+        return OntologyEntity(
+            id=entity_id,
+            name=entity_name,
+            type=ontology_entity_type,
+            description=entity_description or f"AI-suggested entity: {entity_name}",
+            properties=properties,
+            source_table=entity_name.lower().replace(' ', '_'),
+            source_database=domain.database_name,
+            source_data_source=domain.data_source_id,
+            tags=["ai-suggested"] if is_ai_suggested else [],
+            position=position
+        )
+    
     async def update_entity(
         self, 
         domain_id: str, 
@@ -500,6 +693,7 @@ class OntologyService:
                 entity.properties = new_properties
             
             domain.updated_at = datetime.utcnow()
+            self.ontology_version += 1
             self.ontology_domains[domain_id] = domain
             
             self.logger.success(f"Entity {entity_id} updated successfully")
@@ -508,8 +702,8 @@ class OntologyService:
                 "success": True,
                 "message": "Entity updated successfully",
                 "stats": {
-                    "entities_count": len(domain.entities),
-                    "relationships_count": len(domain.relationships)
+                    "entities_count": domain.entity_count,
+                    "relationships_count": domain.relationship_count
                 }
             }
             
@@ -535,50 +729,31 @@ class OntologyService:
             if not domain:
                 return {"success": False, "message": "Domain not found"}
             
-            # Validate entities exist
-            source_entity = next((e for e in domain.entities if e.id == source_entity_id), None)
-            target_entity = next((e for e in domain.entities if e.id == target_entity_id), None)
-            
-            if not source_entity:
-                return {"success": False, "message": "Source entity not found"}
-            if not target_entity:
-                return {"success": False, "message": "Target entity not found"}
-            
-            # Check for duplicate relationships
-            existing_rel = next((r for r in domain.relationships 
-                               if r.source_entity_id == source_entity_id 
-                               and r.target_entity_id == target_entity_id 
-                               and r.name.lower() == relationship_name.lower()), None)
-            if existing_rel:
-                return {"success": False, "message": f"Relationship '{relationship_name}' already exists between these entities"}
-            
-            # Create relationship ID
-            relationship_id = f"{source_entity_id}_{target_entity_id}_{relationship_name.lower().replace(' ', '_')}"
-            
-            # Determine relationship type from cardinality
-            rel_type_map = {
-                "one-to-one": OntologyRelationType.ONE_TO_ONE,
-                "one-to-many": OntologyRelationType.ONE_TO_MANY,
-                "many-to-one": OntologyRelationType.MANY_TO_ONE,
-                "many-to-many": OntologyRelationType.MANY_TO_MANY
-            }
-            rel_type = rel_type_map.get(cardinality.lower(), OntologyRelationType.ONE_TO_MANY)
-            
-            # Create new relationship
-            new_relationship = OntologyRelationship(
-                id=relationship_id,
-                name=relationship_name,
-                type=rel_type,
-                source_entity_id=source_entity_id,
-                target_entity_id=target_entity_id,
-                description=relationship_description or f"AI-suggested relationship: {relationship_name}",
-                cardinality=cardinality,
-                tags=["ai-suggested"] if is_ai_suggested else []
+            # Validate entities exist and the relationship is new
+            error = self._relationship_error(
+                {e.id for e in domain.entities},
+                {(r.source_entity_id, r.target_entity_id, r.name.lower()) for r in domain.relationships},
+                source_entity_id,
+                target_entity_id,
+                relationship_name
+            )
+            if error:
+                return {"success": False, "message": error}
+            
+            new_relationship = self._build_relationship(
+                relationship_name,
+                relationship_description,
+                source_entity_id,
+                target_entity_id,
+                cardinality,
+                is_ai_suggested
             )
             
             # Add relationship to domain
             domain.relationships.append(new_relationship)
+            domain.relationship_count += 1
             domain.updated_at = datetime.utcnow()
+            self.ontology_version += 1
             
             # Update domain in storage
             self.ontology_domains[domain_id] = domain
@@ -588,10 +763,10 @@ class OntologyService:
             return {
                 "success": True,
                 "message": f"Relationship '{relationship_name}' added successfully",
-                "relationship_id": relationship_id,
+                "relationship_id": new_relationship.id,
                 "stats": {
-                    "entities_count": len(domain.entities),
-                    "relationships_count": len(domain.relationships)
+                    "entities_count": domain.entity_count,
+                    "relationships_count": domain.relationship_count
                 }
             }
             
@@ -599,6 +774,109 @@ class OntologyService:
             self.logger.error(f"Failed to add relationship to domain {domain_id}: {str(e)}")
             return {"success": False, "message": f"Failed to add relationship: {str(e)}"}
     
+    async def add_relationships_to_domain(self, domain_id: str, relationships: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Add several relationships to a domain at once
+        
+        Each item takes the keyword arguments of add_relationship_to_domain other than domain_id.
+        Nothing is added if any item is rejected.
+        """
+        try:
+            self.logger.info("Adding {} relationships to domain {}", len(relationships), domain_id)
+            
+            domain = self.ontology_domains.get(domain_id)
+            if not domain:
+                return {"success": False, "message": "Domain not found"}
+            
+            entity_ids = {e.id for e in domain.entities}
+            existing = {(r.source_entity_id, r.target_entity_id, r.name.lower()) for r in domain.relationships}
+            new_relationships = []
+            for item in relationships:
+                source_entity_id = item.get("source_entity_id")
+                target_entity_id = item.get("target_entity_id")
+                relationship_name = item["relationship_name"]
+                
+                error = self._relationship_error(
+                    entity_ids, existing, source_entity_id, target_entity_id, relationship_name
+                )
+                if error:
+                    return {"success": False, "message": error}
+                
+                existing.add((source_entity_id, target_entity_id, relationship_name.lower()))
+                new_relationships.append(self._build_relationship(**item))
+            
+            domain.relationships.extend(new_relationships)
+            domain.relationship_count += len(new_relationships)
+            domain.updated_at = datetime.utcnow()
+            self.ontology_version += 1
+            
+            self.logger.success("{} relationships added successfully to domain {}", len(new_relationships), domain_id)
+            
+            return {
+                "success": True,
+                "message": f"{len(new_relationships)} relationships added successfully",
+                "relationship_ids": [r.id for r in new_relationships],
+                "stats": {
+                    "entities_count": domain.entity_count,
+                    "relationships_count": domain.relationship_count
+                }
+            }
+            
+        except Exception as e:
+            self.logger.error("Failed to add relationships to domain {}: {}", domain_id, e)
+            return {"success": False, "message": f"Failed to add relationships: {str(e)}"}
+    
+    def _relationship_error(
+        self,
+        entity_ids: Set[str],
+        existing: Set[Tuple[str, str, str]],
+        source_entity_id: str,
+        target_entity_id: str,
+        relationship_name: str
+    ) -> Optional[str]:
+        """Get the reason a relationship cannot be added, or None if it can"""
+        if source_entity_id not in entity_ids:
+            return "Source entity not found"
+        if target_entity_id not in entity_ids:
+            return "Target entity not found"
+        
+        # Check for duplicate relationships
+        if (source_entity_id, target_entity_id, relationship_name.lower()) in existing:
+            return f"Relationship '{relationship_name}' already exists between these entities"
+        return None
+    
+    def _build_relationship(
+        self,
+        relationship_name: str,
+        relationship_description: Optional[str] = None,
+        source_entity_id: str = None,
+        target_entity_id: str = None,
+        cardinality: str = "one-to-many",
+        is_ai_suggested: bool = False
+    ) -> OntologyRelationship:
+        """Create a user-added relationship between two existing entities"""
+        # Create relationship ID
+        relationship_id = f"{source_entity_id}_{target_entity_id}_{relationship_name.lower().replace(' ', '_')}"
+        
+        # Determine relationship type from cardinality
+        rel_type_map = {
+            "one-to-one": OntologyRelationType.ONE_TO_ONE,
+            "one-to-many": OntologyRelationType.ONE_TO_MANY,
+            "many-to-one": OntologyRelationType.MANY_TO_ONE,
+            "many-to-many": OntologyRelationType.MANY_TO_MANY
+        }
+        rel_type = rel_type_map.get(cardinality.lower(), OntologyRelationType.ONE_TO_MANY)
+        
+        return OntologyRelationship(
+            id=relationship_id,
+            name=relationship_name,
+            type=rel_type,
+            source_entity_id=source_entity_id,
+            target_entity_id=target_entity_id,
+            description=relationship_description or f"AI-suggested relationship: {relationship_name}",
+            cardinality=cardinality,
+            tags=["ai-suggested"] if is_ai_suggested else []
+        )
+    
     async def delete_entity(self, domain_id: str, entity_id: str) -> Dict[str, Any]:
         """Delete an entity from a domain"""
         try:
@@ -619,8 +897,11 @@ class OntologyService:
             # Remove all relationships involving this entity
             domain.relationships = [r for r in domain.relationships 
                                  if r.source_entity_id != entity_id and r.target_entity_id != entity_id]
+            domain.entity_count -= 1
+            domain.relationship_count = len(domain.relationships)
             
             domain.updated_at = datetime.utcnow()
+            self.ontology_version += 1
             self.ontology_domains[domain_id] = domain
             
             self.logger.success(f"Entity {entity_id} deleted successfully")
@@ -629,8 +910,8 @@ class OntologyService:
                 "success": True,
                 "message": f"Entity '{removed_entity.name}' deleted successfully",
                 "stats": {
-                    "entities_count": len(domain.entities),
-                    "relationships_count": len(domain.relationships)
+                    "entities_count": domain.entity_count,
+                    "relationships_count": domain.relationship_count
                 }
             }
             
@@ -654,8 +935,10 @@ class OntologyService:
             
             # Remove relationship
             removed_relationship = domain.relationships.pop(rel_index)
+            domain.relationship_count -= 1
             
             domain.updated_at = datetime.utcnow()
+            self.ontology_version += 1
             self.ontology_domains[domain_id] = domain
             
             self.logger.success(f"Relationship {relationship_id} deleted successfully")
@@ -664,8 +947,8 @@ class OntologyService:
                 "success": True,
                 "message": f"Relationship '{removed_relationship.name}' deleted successfully",
                 "stats": {
-                    "entities_count": len(domain.entities),
-                    "relationships_count": len(domain.relationships)
+                    "entities_count": domain.entity_count,
+                    "relationships_count": domain.relationship_count
                 }
             }
             
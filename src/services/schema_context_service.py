@@ -5,7 +5,10 @@ Collects and structures schema information from Trino for LLM processing
 
 from typing import List, Dict, Any, Optional, Tuple
 from pydantic import BaseModel
+import asyncio
 import logging
+import time
+from collections import defaultdict
 
 from src.services.trino_service import trino_service
 from src.config.logging_config import get_service_logger
@@ -32,17 +35,53 @@ class SchemaContext(BaseModel):
     total_tables: int = 0
     total_columns: int = 0
     token_count: int = 0
+    domain_groups: Dict[str, List[Dict[str, Any]]] = {}  # Table summaries grouped by business domain
 
 class SchemaContextService:
     """Service for building comprehensive schema context from Trino for LLM processing"""
     
     def __init__(self):
         self.logger = logger
+        
+        # Schema context cache: max_tables -> (expires_at, schema_version, context)
+        self._context_cache: Dict[int, Tuple[float, int, SchemaContext]] = {}
+        self._context_cache_ttl = 300  # Rebuild at most every 5 minutes (300 seconds)
+        self._schema_version = 0  # Bumped whenever the catalog is refreshed
+        self._context_lock = asyncio.Lock()
+    
+    def invalidate_cache(self):
+        """Drop cached schema contexts (call after the catalog changes)"""
+        self._schema_version += 1
+        self._context_cache.clear()
+    
+    def _get_cached_context(self, max_tables: int) -> Optional[SchemaContext]:
+        """Return a cached context if it is still fresh for the current schema version"""
+        cached = self._context_cache.get(max_tables)
+        if cached is None:
+            return None
+        expires_at, version, context = cached
+        if version != self._schema_version or time.time() >= expires_at:
+            return None
+        return context
     
     async def get_comprehensive_schema_context(self, max_tables: int = 50) -> SchemaContext:
         """
-        Get comprehensive schema context from actual Trino catalogs
+        Get comprehensive schema context from actual Trino catalogs (cached per max_tables)
         """
+        context = self._get_cached_context(max_tables)
+        if context is not None:
+            return context
+        
+        # Serialize rebuilds so concurrent requests share one introspection pass
+        async with self._context_lock:
+            context = self._get_cached_context(max_tables)
+            if context is not None:
+                return context
+            return await self._build_schema_context(max_tables)
+    
+    async def _build_schema_context(self, max_tables: int) -> SchemaContext:
+        """Build schema context from Trino and cache it on success"""
+        schema_version = self._schema_version
         try:
             self.logger.info("Building schema context from Trino catalogs")
             
@@ -157,7 +196,12 @@ class SchemaContextService:
                 summary=summary,
                 total_tables=len(tables),
                 total_columns=total_columns,
-                token_count=token_count
+                token_count=token_count,
+                domain_groups=self._group_tables_by_domain(tables)
+            )
+            
+            self._context_cache[max_tables] = (
+                time.time() + self._context_cache_ttl, schema_version, schema_context
             )
             
             self.logger.success(f"Built schema context: {len(tables)} tables, {total_columns} columns, {len(business_domains)} domains")
@@ -245,9 +289,22 @@ class SchemaContextService:
             summary="Sample music store database with customers, albums, and purchase transactions. Supports customer analysis, album catalog management, and sales analytics.",
             total_tables=3,
             total_columns=16,
-            token_count=1500
+            token_count=1500,
+            domain_groups=self._group_tables_by_domain(fallback_tables)
         )
     
+    def _group_tables_by_domain(self, tables: List[TableInfo]) -> Dict[str, List[Dict[str, Any]]]:
+        """Group table summaries by inferred business domain"""
+        domain_groups = defaultdict(list)
+        for table in tables:
+            domain_groups[table.business_context or "uncategorized"].append({
+                "name": table.name,
+                "full_name": table.full_name,
+                "column_count": len(table.columns),
+                "relationships": table.potential_relationships
+            })
+        return dict(domain_groups)
+    
     def _infer_relationships(self, table_name: str, columns: List[Dict[str, Any]]) -> List[str]:
         """Infer potential foreign key relationships based on column names"""
         relationships = []
@@ -47,6 +47,10 @@ class TrinoService:
         self._last_connection_check = 0  # Timestamp of last connection check
         self._connection_check_interval = 300  # Check every 5 minutes (300 seconds)
         
+        # Full schema context cache: (max_catalogs, max_schemas, max_tables) -> (timestamp, context)
+        self._schema_context_cache: Dict[Tuple[int, int, int], Tuple[float, Dict[str, Any]]] = {}
+        self._schema_context_ttl = 300  # Rebuild every 5 minutes (300 seconds)
+        
         self.logger.info("Trino service initialized with Unity Catalog integration",
                         host=self.settings.trino_host,
                         port=self.settings.trino_port,
@@ -128,6 +132,10 @@ class TrinoService:
         self._last_connection_check = current_time
         return self._trino_available
     
+    async def is_available(self) -> bool:
+        """Check whether Trino is reachable (uses the cached connection check)"""
+        return await self._check_trino_availability()
+    
     async def get_connection(self):
         """Get or create Trino connection"""
         start_time = time.time()
@@ -1033,6 +1041,11 @@ class TrinoService:
         Returns:
             Dictionary with structured schema information
         """
+        cache_key = (max_catalogs, max_schemas_per_catalog, max_tables_per_schema)
+        cached = self._schema_context_cache.get(cache_key)
+        if cached and time.time() - cached[0] < self._schema_context_ttl:
+            return cached[1]
+        
         start_time = time.time()
         self.logger.log_function_start("get_full_schema_context")
         
@@ -1114,6 +1127,10 @@ class TrinoService:
                 "generation_time_ms": execution_time
             })
             
+            # Format once here so cached contexts carry their LLM-ready text
+            schema_context["formatted_for_llm"] = self.format_schema_context_for_llm(schema_context)
+            self._schema_context_cache[cache_key] = (time.time(), schema_context)
+            
             self.logger.log_function_success(
                 "get_full_schema_context",
                 result=f"Generated schema context with {len(schema_context['catalogs'])} catalogs",
@@ -1139,6 +1156,10 @@ class TrinoService:
                 "generation_time_ms": execution_time
             }
 
+    def invalidate_schema_context_cache(self):
+        """Drop cached full schema contexts"""
+        self._schema_context_cache.clear()
+
     def format_schema_context_for_llm(self, schema_context: Dict[str, Any]) -> str:
         """
         Format schema context into a readable string for LLM
@@ -1152,6 +1173,9 @@ class TrinoService:
         if not schema_context or not schema_context.get("catalogs"):
             return "No schema information available."
         
+        if "formatted_for_llm" in schema_context:
+            return schema_context["formatted_for_llm"]
+        
         context_lines = [
             "=== AVAILABLE DATABASE SCHEMA ===",
             f"Total: {schema_context['total_catalogs']} catalogs, {schema_context['total_schemas']} schemas, {schema_context['total_tables']} tables",
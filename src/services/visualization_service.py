@@ -88,7 +88,7 @@ class VisualizationService:
                 'is_categorical': unique_count <= min(10, len(col_data) * 0.5),
                 'is_numeric': col_type in ['integer', 'float'],
                 'is_date': col_type == 'date',
-                'has_nulls': len(col_data) < query_result.row_count
+                'has_nulls': len(col_data) < len(query_result.data)
             }
         
         return analysis
@@ -463,7 +463,9 @@ class VisualizationService:
                                     model_key: str = None) -> 'VisualizationRecommendation':
         """
         Legacy method for visualization recommendation (used by API)
-        Converts data format and calls analyze_data_and_recommend
+        Converts data format and calls analyze_data_and_recommend.
+        Only data_sample is analyzed; callers pass a bounded sample and the
+        full result size via data_summary["row_count"].
         """
         try:
             if not data_sample:
@@ -472,7 +474,7 @@ class VisualizationService:
             # Convert data format to QueryResult format
             columns = list(data_sample[0].keys()) if data_sample else []
             data = [[row.get(col) for col in columns] for row in data_sample]
-            row_count = len(data_sample)
+            row_count = (data_summary or {}).get("row_count", len(data_sample))
             
             # Create a QueryResult-like object
             from types import SimpleNamespace